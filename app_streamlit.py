@@ -20,7 +20,8 @@ def set_page_config():
 
 @st.cache_data
 def load_data():
-    df = import_data(correction=True)
+    # the typed parquet export is much faster to read than the csv, and its categorical columns are lighter in memory
+    df = import_data(correction=True, format="parquet")
     return df
 
 
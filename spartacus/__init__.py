@@ -10,7 +10,14 @@ from .enums import (
     DatasetCSV,
     DataFolder,
 )
-from .quick_load import import_data
+from .quick_load import import_data, import_curve_tensor
+from .src.curve_tensor import CurveTensor
+from .src.corridors import Corridors, compute_corridors
+from .src.bootstrap import bootstrap_corridors
+from .src.group_comparison import GroupComparison, compare_groups
+from .src.functional_pca import FunctionalPCA, fit_functional_pca
+from .src.similarity import CurveIndex
+from .src.curve_store import build_curve_store, CurveRepository
 from .src.checks import (
     check_parent_child_joint,
     check_segment_filled_with_nan,
@@ -20,7 +27,7 @@ from .src.checks import (
 )
 
 from .src.row_data import RowData
-from .src.load import Spartacus
+from .src.load import Spartacus, SpartacusQuery
 from .src.utils import compute_rotation_matrix_from_axes, flip_rotations
 from .src.joint import Joint
 from .src.biomech_system import BiomechCoordinateSystem
@@ -34,4 +41,5 @@ from .src.corrections.euler_basis import (
     rotation_y,
     rotation_z,
     from_jcs_to_parent_frame,
+    from_jcs_to_parent_frame_batch,
 )
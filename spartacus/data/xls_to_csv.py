@@ -3,32 +3,27 @@ This script converts all Excel files in a folder to CSV files.
 Please install xlrd before running this script.
 
 conda install -c conda-forge xlrd
-"""
 
-import pandas as pd
-import os
+python spartacus/data/xls_to_csv.py "spartacus/data/#6_Henninger_et_al/6a_PA"
 
+The conversion is done in parallel by spartacus.src.ingestion.convert_workbooks,
+see spartacus.src.ingestion to also check the files and build the curve store.
+"""
 
-def xls_to_csv(input_file, output_file):
-    # Read the Excel file
-    df = pd.read_excel(input_file)
+import sys
 
-    # Write the data to a CSV file
-    df.to_csv(output_file, index=False)
+from spartacus.src.ingestion import convert_workbooks, workbook_to_csv
 
 
-def convert_folder(input_folder):
-    # Loop through all files in the specified folder
-    for filename in os.listdir(input_folder):
-        # Check if the file is an Excel file with .xls extension
-        if filename.endswith(".xls"):
-            # Construct full file paths
-            input_path = os.path.join(input_folder, filename)
-            output_path = os.path.join(input_folder, filename.split(".")[0] + ".csv")
+def xls_to_csv(input_file, output_file):
+    workbook_to_csv(input_file, output_file)
+
 
-            # Convert the Excel file to CSV
-            xls_to_csv(input_path, output_path)
-            print(f"Converted {input_path} to {output_path}")
+def convert_folder(input_folder, n_jobs: int = -1):
+    # Convert all the Excel files of the specified folder, next to them
+    for output_path in convert_workbooks(input_folder, n_jobs=n_jobs, overwrite=True):
+        print(f"Converted {output_path}")
 
 
-convert_folder("/home/puchaud/Projets_Python/shoulder-kinematic-dataset/spartacus/data/Kolz et al 2020")
+if __name__ == "__main__":
+    convert_folder(sys.argv[1])
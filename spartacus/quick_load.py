@@ -1,24 +1,82 @@
-import os
-import pandas as pd
 from pathlib import Path
+from typing import Literal
+
+import numpy as np
 
 from .enums import DatasetCSV
+from .src.cache import is_export_up_to_date
+from .src.columnar import check_export_format, read_confident_data, filters_to_mask
+from .src.curve_tensor import CurveTensor
 from .src.load import Spartacus as sp
 
 
-def import_data(correction: bool = True):
-    """Import the data from the confident_data.csv file if it exists, otherwise it's computed from the raw data."""
-    file = "corrected_confident_data.csv" if correction else "confident_data.csv"
+def import_data(
+    correction: bool = True,
+    format: Literal["csv", "parquet"] = "csv",
+    columns: list[str] = None,
+    filters: dict = None,
+):
+    """
+    Import the data from the confident_data.csv file if it is up-to-date, otherwise it's computed from the raw data.
+    The exported data are outdated as soon as a dataset csv, a data csv or the correction code changed,
+    then only the rows whose inputs changed are recomputed, the others are read from the cache.
+
+    Parameters
+    ----------
+    correction: bool
+        If True, import the corrected data, otherwise the data as reported in the articles.
+    format: str
+        'csv' (default) or 'parquet', the typed columnar export which is faster to read, it requires pyarrow.
+    columns: list[str]
+        The columns to import, all of them if None.
+    filters: dict
+        Only import the lines whose column values are in the given values, e.g. {"unit": "rad"} or
+        {"humeral_motion": ["frontal plane elevation"]}, with parquet only the matching row groups are read.
+    """
+    check_export_format(format)
+    folder = Path(DatasetCSV.JOINT.value).parent
+    file = f"corrected_confident_data.{format}" if correction else f"confident_data.{format}"
 
-    if "confident_data.csv" in os.listdir(str(Path(DatasetCSV.JOINT.value).parent)):
-        return pd.read_csv(Path(DatasetCSV.JOINT.value).parent / file)
+    if is_export_up_to_date(folder, format=format):
+        return read_confident_data(folder / file, format=format, columns=columns, filters=filters)
     else:
-        try:
-            spartacus_dataset = sp.load()
-            spartacus_dataset.export()
-        except:
-            raise ValueError("The confident_data.csv file does not exist. You must run the correction first.")
+        # the errors of the correction or of the export, e.g. a missing optional dependency, are raised as they are
+        spartacus_dataset = sp.load(cache=True)
+        spartacus_dataset.export(format=format)
 
-        return (
+        df = (
             spartacus_dataset.corrected_confident_data_values if correction else spartacus_dataset.confident_data_values
         )
+        if filters:
+            df = df[filters_to_mask(df, filters)].reset_index(drop=True)
+        return df if columns is None else df[columns]
+
+
+def import_curve_tensor(
+    correction: bool = True,
+    format: Literal["csv", "parquet"] = "csv",
+    filters: dict = None,
+    grid: np.ndarray = None,
+    step: float = 1.0,
+    method: Literal["linear", "pchip", "spline"] = "linear",
+) -> CurveTensor:
+    """
+    Import the data as in import_data, and resample all the curves on a common humerothoracic angle grid.
+
+    Parameters
+    ----------
+    correction: bool
+        If True, import the corrected data, otherwise the data as reported in the articles.
+    format: str
+        'csv' (default) or 'parquet', see import_data.
+    filters: dict
+        Only import the lines whose column values are in the given values, see import_data.
+    grid: np.ndarray
+        The humerothoracic angles to resample on, in degrees, by default every step degrees over all the data.
+    step: float
+        The step of the default grid, in degrees.
+    method: str
+        'linear' (default), 'pchip' or 'spline' (cubic), the last two need scipy.
+    """
+    df = import_data(correction=correction, format=format, filters=filters)
+    return CurveTensor.from_confident_data(df, grid=grid, step=step, method=method)
@@ -39,6 +39,7 @@ class BiomechCoordinateSystem:
         self.origin = AnatomicalLandmark.from_string(origin) if isinstance(origin, str) else origin
         self.segment = segment
         self.frame = frame
+        self._rotation_matrix = None
 
     @classmethod
     def from_biomech_directions(
@@ -159,11 +160,15 @@ class BiomechCoordinateSystem:
 
         """
         # todo: to transfer in Frame ?
-        return compute_rotation_matrix_from_axes(
-            anterior_posterior_axis=self.anterior_posterior_axis.value[1][:, np.newaxis],
-            infero_superior_axis=self.infero_superior_axis.value[1][:, np.newaxis],
-            medio_lateral_axis=self.medio_lateral_axis.value[1][:, np.newaxis],
-        )
+        if self._rotation_matrix is None:
+            self._rotation_matrix = compute_rotation_matrix_from_axes(
+                anterior_posterior_axis=self.anterior_posterior_axis.value[1][:, np.newaxis],
+                infero_superior_axis=self.infero_superior_axis.value[1][:, np.newaxis],
+                medio_lateral_axis=self.medio_lateral_axis.value[1][:, np.newaxis],
+            )
+            # computed once and shared, see frame_registry
+            self._rotation_matrix.flags.writeable = False
+        return self._rotation_matrix
 
     def __print__(self):
         print(f"Segment: {self.segment}")
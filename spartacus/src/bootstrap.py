@@ -0,0 +1,223 @@
+"""
+This module computes bootstrap confidence bands of the mean corridors, per joint, humeral motion and degree of freedom.
+
+The rows of each (joint, humeral_motion, unit) are resampled hierarchically, as the data were collected:
+the articles are drawn with replacement, then the shoulders of each drawn article are drawn with replacement.
+A resample is only a vector of counts per row, so a batch of resamples is a matrix (resample, row),
+and the means of all the resamples of a batch are a single matrix product with the curves of the group.
+
+The groups are independent, they can be bootstrapped in worker processes. Each group draws from its own random
+stream, spawned from the seed, so the bands only depend on the seed, not on the number of processes.
+"""
+
+import numpy as np
+
+from .corridors import CORRIDOR_KEYS, Corridors, compute_corridors, curve_weights, group_rows
+from .curve_tensor import CurveTensor
+from .utils import process_map
+
+BOOTSTRAP_LEVELS = ("article", "shoulder")
+
+
+def resample_counts(
+    rng: np.random.Generator,
+    rows_per_article: np.ndarray,
+    n_resamples: int,
+    levels: tuple[str, ...] = BOOTSTRAP_LEVELS,
+) -> np.ndarray:
+    """
+    Draw hierarchical bootstrap resamples of the rows, the rows being sorted by article
+
+    Parameters
+    ----------
+    rng: np.random.Generator
+        The random generator
+    rows_per_article: np.ndarray
+        The number of rows of each article, shape (A,)
+    n_resamples: int
+        The number of resamples
+    levels: tuple[str, ...]
+        The levels resampled: 'article', the articles are drawn with replacement,
+        and 'shoulder', the rows of each drawn article are drawn with replacement
+
+    Returns
+    -------
+    np.ndarray
+        The number of times each row is drawn in each resample, shape (n_resamples, sum(rows_per_article))
+    """
+    rows_per_article = np.asarray(rows_per_article, dtype=np.int64)
+    n_articles = rows_per_article.shape[0]
+
+    if "article" in levels:
+        drawn = rng.integers(0, n_articles, size=(n_resamples, n_articles))
+        drawn += n_articles * np.arange(n_resamples)[:, np.newaxis]
+        multiplicities = np.bincount(drawn.ravel(), minlength=n_resamples * n_articles)
+        multiplicities = multiplicities.reshape(n_resamples, n_articles)
+    else:
+        multiplicities = np.ones((n_resamples, n_articles), dtype=np.int64)
+
+    if "shoulder" not in levels:
+        return np.repeat(multiplicities, rows_per_article, axis=1)
+
+    # each copy of an article draws as many rows as it has, i.e. a multinomial draw per (resample, article)
+    has_row = np.arange(rows_per_article.max(initial=0)) < rows_per_article[:, np.newaxis]
+    probabilities = has_row / np.maximum(rows_per_article, 1)[:, np.newaxis]
+    counts = rng.multinomial(multiplicities * rows_per_article, probabilities)
+    return counts[:, has_row]
+
+
+def sorted_quantiles(sorted_values: np.ndarray, quantiles: tuple[float, ...]) -> np.ndarray:
+    """
+    Quantiles of each line of an array sorted along its last axis, nan last, as np.nanquantile(method="linear")
+
+    Parameters
+    ----------
+    sorted_values: np.ndarray
+        The values, sorted along the last axis, shape (M, B)
+    quantiles: tuple[float, ...]
+        The quantiles, in [0, 1]
+
+    Returns
+    -------
+    np.ndarray
+        The quantiles, shape (len(quantiles), M), nan where a line has no value
+    """
+    n_values = (~np.isnan(sorted_values)).sum(axis=1)
+    lines = np.flatnonzero(n_values)
+    last = n_values[lines] - 1
+    results = np.full((len(quantiles), sorted_values.shape[0]), np.nan)
+    for i, quantile in enumerate(quantiles):
+        position = quantile * last
+        below = np.floor(position).astype(np.int64)
+        lower = sorted_values[lines, below]
+        upper = sorted_values[lines, np.minimum(below + 1, last)]
+        results[i, lines] = lower + (position - below) * (upper - lower)
+    return results
+
+
+def _bootstrap_group(task: tuple) -> tuple[np.ndarray, np.ndarray]:
+    """The standard error and the confidence band of the mean of one group, see bootstrap_corridors"""
+    values, weights, rows_per_article, seed, n_resamples, levels, confidence, batch_size = task
+    rng = np.random.default_rng(seed)
+    weighted_values = np.where(weights > 0, values, 0.0) * weights
+    with np.errstate(invalid="ignore", divide="ignore"):
+        center = np.nan_to_num(weighted_values.sum(axis=0) / weights.sum(axis=0))
+
+    # one line per angle, so that the replicates of an angle are contiguous when sorted
+    replicates = np.empty((values.shape[1], n_resamples))
+    # the moments of the replicates, centered on the mean of the data for the precision
+    n_replicates, sums, squared_sums = np.zeros((3, values.shape[1]))
+    for start in range(0, n_resamples, batch_size):
+        stop = min(start + batch_size, n_resamples)
+        counts = resample_counts(rng, rows_per_article, stop - start, levels).astype(np.float64)
+        total_weights = counts @ weights
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = (counts @ weighted_values) / total_weights
+        deviations = np.where(total_weights > 0, means - center, 0.0)
+        n_replicates += (total_weights > 0).sum(axis=0)
+        sums += deviations.sum(axis=0)
+        squared_sums += (deviations**2).sum(axis=0)
+        replicates[:, start:stop] = means.T
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        standard_error = np.sqrt(np.maximum(squared_sums - sums**2 / n_replicates, 0) / (n_replicates - 1))
+
+    replicates.sort(axis=1)  # nan last
+    alpha = (1 - confidence) / 2
+    return standard_error, sorted_quantiles(replicates, (alpha, 1 - alpha))
+
+
+def bootstrap_corridors(
+    tensor: CurveTensor,
+    n_resamples: int = 1000,
+    weighting: str = "shoulder",
+    levels: tuple[str, ...] = BOOTSTRAP_LEVELS,
+    confidence: float = 0.95,
+    filters: dict = None,
+    seed: int | np.random.SeedSequence = None,
+    n_jobs: int = None,
+    batch_size: int = 1000,
+) -> Corridors:
+    """
+    Bootstrap the mean corridors, per (joint, humeral_motion, unit) and degree of freedom
+
+    Parameters
+    ----------
+    tensor: CurveTensor
+        The resampled curves, see CurveTensor.from_confident_data or import_curve_tensor
+    n_resamples: int
+        The number of bootstrap resamples
+    weighting: str
+        'shoulder' (default) or 'article', the weights of the curves in the means, see compute_corridors
+    levels: tuple[str, ...]
+        ('article', 'shoulder') by default, the articles then the shoulders of each drawn article are resampled,
+        ('article',) only resamples the articles, ('shoulder',) only resamples the rows of each group
+    confidence: float
+        The confidence level of the percentile bands, e.g. 0.95
+    filters: dict
+        Only use the rows whose metadata match the filters, e.g. {"in_vivo": True}
+    seed: int | np.random.SeedSequence
+        The seed of the random streams, the bands are reproducible for a given seed, whatever n_jobs
+    n_jobs: int
+        The number of processes, the groups are bootstrapped in parallel, -1 for all the cpus, serial by default
+    batch_size: int
+        The number of resamples reduced at once, the memory grows with it
+
+    Returns
+    -------
+    Corridors
+        The statistics 'mean', the mean corridor of the data, 'se', the bootstrap standard error of the mean,
+        and 'ci_lower', 'ci_upper', the percentile confidence band of the mean
+    """
+    if not levels or any(level not in BOOTSTRAP_LEVELS for level in levels):
+        raise ValueError(f"{levels} are not valid bootstrap levels, must be in {BOOTSTRAP_LEVELS}.")
+    if not 0 < confidence < 1:
+        raise ValueError(f"The confidence level must be in ]0, 1[, got {confidence}.")
+    if filters:
+        tensor = tensor.filter(filters)
+
+    corridors = compute_corridors(tensor, weighting=weighting, percentiles=())
+    weights = curve_weights(tensor, weighting)
+    values = tensor.values.reshape(len(tensor), -1)
+    codes, groups = group_rows(tensor)
+    article_codes, _ = group_rows(tensor, CORRIDOR_KEYS + ("article",))
+    if "article" not in levels:
+        # the rows of a group are a single cluster
+        article_codes = codes
+
+    has_values = corridors.n_rows.reshape(groups.shape[0], -1) > 0
+    seeds = np.random.SeedSequence(seed).spawn(groups.shape[0])
+    tasks = []
+    for group in range(groups.shape[0]):
+        # the rows of the group sorted by article, as the counts of resample_counts
+        rows = np.flatnonzero(codes == group)
+        rows = rows[np.argsort(article_codes[rows], kind="stable")]
+        rows_per_article = np.unique(article_codes[rows], return_counts=True)[1]
+        columns = has_values[group]
+        tasks.append(
+            (
+                values[np.ix_(rows, columns)],
+                weights[np.ix_(rows, columns)],
+                rows_per_article,
+                seeds[group],
+                n_resamples,
+                tuple(levels),
+                confidence,
+                batch_size,
+            )
+        )
+
+    standard_error = np.full(has_values.shape, np.nan)
+    bands = np.full((2,) + has_values.shape, np.nan)
+    for group, (group_standard_error, group_bands) in enumerate(process_map(_bootstrap_group, tasks, n_jobs=n_jobs)):
+        standard_error[group, has_values[group]] = group_standard_error
+        bands[:, group, has_values[group]] = group_bands
+
+    shape = corridors.n_rows.shape
+    corridors.statistics = {
+        "mean": corridors["mean"],
+        "se": standard_error.reshape(shape),
+        "ci_lower": bands[0].reshape(shape),
+        "ci_upper": bands[1].reshape(shape),
+    }
+    return corridors
@@ -0,0 +1,248 @@
+"""
+This module caches the imported and corrected data of each row of the confident dataframe on disk.
+
+A row is stored under a key that hashes everything its result depends on:
+    - the fields of the merged row (dataset definition, joint data and compliances),
+    - the content of the csv files it refers to, including the corrections.csv of its folder,
+    - the version of the correction code, i.e. the content of the modules that read and correct a row.
+Thus, editing a dataset only invalidates the rows that use it, and nothing can go stale silently.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..enums import DatasetCSV, DataFolder
+
+CACHE_FOLDER = Path(DatasetCSV.DATASETS.value).parent / ".cache"
+CSV_FIELDS = (
+    "dof_1st_euler",
+    "dof_2nd_euler",
+    "dof_3rd_euler",
+    "dof_translation_x",
+    "dof_translation_y",
+    "dof_translation_z",
+)
+CODE_FOLDER = Path(__file__).parent.parent
+# the modules that read and correct the data of a row, relative to CODE_FOLDER, editing the others keeps the cache
+CORRECTION_CODE = (
+    "enums.py",
+    "src/biomech_constant.py",
+    "src/biomech_system.py",
+    "src/checks.py",
+    "src/compliance.py",
+    "src/constants.py",
+    "src/corrections",
+    "src/curve_store.py",
+    "src/enums_biomech.py",
+    "src/frame_reader.py",
+    "src/frame_registry.py",
+    "src/joint.py",
+    "src/legend_utils.py",
+    "src/load_data.py",
+    "src/row_data.py",
+    "src/thoracohumeral_angle.py",
+    "src/utils.py",
+    "src/utils_setters.py",
+)
+FINGERPRINT_FILE = "confident_data_fingerprint_{format}.txt"
+FILE_HASHES = "file_hashes.json"
+
+
+def hash_file(path: str | Path) -> str:
+    """Returns the sha256 of the content of a file"""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def hash_files(paths: list[Path], cache_folder: Path = None) -> list[str]:
+    """
+    Returns the sha256 of the content of each file, only the files whose size or modification time changed since
+    their last hash are read, the hashes are stored with these stats in the cache folder
+
+    Parameters
+    ----------
+    paths: list[Path]
+        The files to hash
+    cache_folder: Path
+        The folder of the stored hashes, the cache folder by default
+
+    Returns
+    -------
+    list[str]
+        The sha256 of each file, in the order of the paths
+    """
+    hashes_path = Path(cache_folder or CACHE_FOLDER) / FILE_HASHES
+    try:
+        stored = json.loads(hashes_path.read_text())
+    except (OSError, ValueError):
+        stored = {}
+
+    hashes, changed = [], False
+    for path in paths:
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        entry = stored.get(key)
+        if entry is None or entry[:2] != [stat.st_size, stat.st_mtime_ns]:
+            entry = [stat.st_size, stat.st_mtime_ns, hash_file(path)]
+            stored[key] = entry
+            changed = True
+        hashes.append(entry[2])
+
+    if changed:
+        hashes_path.parent.mkdir(parents=True, exist_ok=True)
+        # write then rename, so that concurrent loads never read a truncated file
+        temporary_path = hashes_path.with_suffix(f".{os.getpid()}.tmp")
+        temporary_path.write_text(json.dumps(stored))
+        os.replace(temporary_path, hashes_path)
+    return hashes
+
+
+@lru_cache(maxsize=1)
+def correction_code_version() -> str:
+    """Returns a hash of the modules of CORRECTION_CODE, any change in the correction code changes this version"""
+    sha = hashlib.sha256()
+    for name in CORRECTION_CODE:
+        path = CODE_FOLDER / name
+        for file in sorted(path.rglob("*.py")) if path.is_dir() else [path]:
+            sha.update(file.relative_to(CODE_FOLDER).as_posix().encode())
+            sha.update(hash_file(file).encode())
+    return sha.hexdigest()
+
+
+def row_csv_files(row: pd.Series) -> list[Path]:
+    """Returns the csv files the data of a row depends on, i.e. the dofs csv and the corrections.csv of its folder"""
+    folder_path = Path(DataFolder.from_string(row["folder"]).value)
+    files = [folder_path / row[field] for field in CSV_FIELDS if not pd.isna(row[field])]
+    if (folder_path / "corrections.csv").exists():
+        files.append(folder_path / "corrections.csv")
+    return files
+
+
+def row_cache_key(
+    row: pd.Series, process_rotations: bool = True, process_translations: bool = True, file_hashes: dict = None
+) -> str:
+    """
+    Returns the key of a row in the cache
+
+    Parameters
+    ----------
+    row: pd.Series
+        A row of Spartacus.confident_dataframe
+    process_rotations: bool
+        If the rotations are processed
+    process_translations: bool
+        If the translations are processed
+    file_hashes: dict
+        The sha256 of the csv files of the row, by path, see row_cache_keys, hashed with hash_files by default
+
+    Returns
+    -------
+    str
+        The sha256 of the row fields, the content of its csv files and the version of the correction code
+    """
+    sha = hashlib.sha256()
+    sha.update(correction_code_version().encode())
+    sha.update(f"rotations={process_rotations},translations={process_translations}".encode())
+    for field, value in row.items():
+        # the same key for a typed row and a row of python objects, see dataset_schema.to_python_objects
+        if pd.api.types.is_scalar(value) and pd.isna(value):
+            value = None
+        elif isinstance(value, np.generic):
+            value = value.item()
+        sha.update(f"{field}={value!r};".encode())
+    files = row_csv_files(row)
+    if file_hashes is None:
+        existing_files = [path for path in files if path.exists()]
+        file_hashes = dict(zip(existing_files, hash_files(existing_files)))
+    for path in files:
+        sha.update(path.name.encode())
+        sha.update(file_hashes[path].encode() if path in file_hashes else b"missing")
+    return sha.hexdigest()
+
+
+def row_cache_keys(rows: pd.DataFrame, process_rotations: bool = True, process_translations: bool = True) -> list[str]:
+    """
+    Returns the keys of the rows of Spartacus.confident_dataframe, see row_cache_key.
+    The csv files shared by the rows, e.g. the corrections.csv of a folder, are hashed once,
+    and only the files modified since their last hash are read, see hash_files.
+    """
+    files = {path for _, row in rows.iterrows() for path in row_csv_files(row) if path.exists()}
+    files = sorted(files)
+    file_hashes = dict(zip(files, hash_files(files)))
+    return [
+        row_cache_key(row, process_rotations, process_translations, file_hashes=file_hashes)
+        for _, row in rows.iterrows()
+    ]
+
+
+def is_row_cached(key: str, cache_folder: Path = None) -> bool:
+    """Returns True if a row is stored in the cache"""
+    return (Path(cache_folder or CACHE_FOLDER) / f"{key}.pkl").exists()
+
+
+def load_cached_row(key: str, cache_folder: Path = None) -> tuple[pd.DataFrame, pd.DataFrame] | None:
+    """Returns the cached data of a row without and with corrections, None if the row is not cached"""
+    path = Path(cache_folder or CACHE_FOLDER) / f"{key}.pkl"
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (pickle.UnpicklingError, EOFError):
+        return None
+
+
+def save_cached_row(key: str, result: tuple[pd.DataFrame, pd.DataFrame], cache_folder: Path = None):
+    """Store the data of a row without and with corrections in the cache"""
+    cache_folder = Path(cache_folder or CACHE_FOLDER)
+    cache_folder.mkdir(parents=True, exist_ok=True)
+    # write then rename, so that an interrupted load never leaves a truncated file behind
+    temporary_path = cache_folder / f"{key}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, cache_folder / f"{key}.pkl")
+
+
+def clear_cache(cache_folder: Path = None):
+    """Remove all the cached rows"""
+    for path in Path(cache_folder or CACHE_FOLDER).glob("*.pkl"):
+        path.unlink()
+
+
+def dataset_fingerprint() -> str:
+    """
+    Returns a hash of all the inputs of the exported data: the dataset csv files,
+    the csv files of every data folder and the version of the correction code.
+    Only the files modified since the last call are read, see hash_files.
+    """
+    dataset_files = [Path(dataset_csv.value) for dataset_csv in DatasetCSV]
+    data_files = [path for data_folder in DataFolder for path in sorted(Path(data_folder.value).glob("*.csv"))]
+    hashes = hash_files(dataset_files + data_files)
+
+    sha = hashlib.sha256()
+    sha.update(correction_code_version().encode())
+    for file_hash in hashes[: len(dataset_files)]:
+        sha.update(file_hash.encode())
+    for path, file_hash in zip(data_files, hashes[len(dataset_files) :]):
+        sha.update(path.name.encode())
+        sha.update(file_hash.encode())
+    return sha.hexdigest()
+
+
+def is_export_up_to_date(folder: Path = Path(DatasetCSV.DATASETS.value).parent, format: str = "csv") -> bool:
+    """Returns True if the confident data exported in the folder with this format were computed from current inputs"""
+    fingerprint_path = Path(folder) / FINGERPRINT_FILE.format(format=format)
+    exported_files = (f"confident_data.{format}", f"corrected_confident_data.{format}")
+    if not fingerprint_path.exists() or not all((Path(folder) / file).exists() for file in exported_files):
+        return False
+    return fingerprint_path.read_text().strip() == dataset_fingerprint()
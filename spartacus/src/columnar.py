@@ -0,0 +1,118 @@
+"""
+This module stores the confident data in a typed columnar format (parquet), instead of csv.
+
+The text columns repeated on every line (article, joint, humeral_motion, legend, unit) are stored as categories,
+and the columns are typed once at export, so nothing is re-inferred when reading.
+Reading can be restricted to some columns and to some values of a column, e.g. {"unit": "rad"},
+these filters are pushed down to the parquet reader, and the other row groups are never loaded.
+
+pyarrow is only needed for this format: pip install pyarrow
+"""
+
+from pathlib import Path
+from typing import Literal
+
+import pandas as pd
+
+EXPORT_FORMATS = ("csv", "parquet")
+CATEGORICAL_COLUMNS = ("article", "joint", "humeral_motion", "legend", "unit")
+# object columns mixing True, False and None, e.g. compliances, are stored with the nullable boolean dtype
+BOOLEAN_VALUES = {True, False}
+PARQUET_ROW_GROUP_SIZE = 65_536
+
+
+def check_export_format(format: Literal["csv", "parquet"]) -> str:
+    """Raise an error if the format is not supported, and if pyarrow is missing for parquet"""
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"{format} is not a valid export format, must be one of {EXPORT_FORMATS}.")
+    if format == "parquet":
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("The parquet format requires pyarrow, install it with: pip install pyarrow")
+    return format
+
+
+def to_columnar_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Type the columns of the confident data once and for all
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        The confident data, e.g. Spartacus.corrected_confident_data_values
+
+    Returns
+    -------
+    pd.DataFrame
+        The same data, with categorical, boolean and numeric columns instead of object columns
+    """
+    df = df.copy()
+    for column in df.columns:
+        if column in CATEGORICAL_COLUMNS:
+            df[column] = df[column].astype("category")
+            continue
+        if pd.api.types.is_numeric_dtype(df[column]) or pd.api.types.is_bool_dtype(df[column]):
+            continue
+
+        values = set(df[column].dropna().unique())
+        if values <= BOOLEAN_VALUES:
+            df[column] = df[column].astype("boolean")
+        elif all(isinstance(value, (int, float)) for value in values):
+            df[column] = pd.to_numeric(df[column])
+        else:
+            df[column] = df[column].astype("category")
+
+    return df
+
+
+def filters_to_mask(df: pd.DataFrame, filters: dict) -> pd.Series:
+    """Returns the mask of the lines of the dataframe that match all the filters"""
+    mask = pd.Series(True, index=df.index)
+    for column, values in filters.items():
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        mask &= df[column].isin(values)
+    return mask
+
+
+def read_confident_data(
+    path: str | Path,
+    format: Literal["csv", "parquet"] = "csv",
+    columns: list[str] = None,
+    filters: dict = None,
+) -> pd.DataFrame:
+    """
+    Read the exported confident data
+
+    Parameters
+    ----------
+    path: str | Path
+        The path of the exported file
+    format: str
+        'csv' or 'parquet'
+    columns: list[str]
+        The columns to read, all of them if None
+    filters: dict
+        Only keep the lines whose column values are in the given values, e.g. {"unit": "rad", "joint": ["glenohumeral"]}
+
+    Returns
+    -------
+    pd.DataFrame
+        The confident data
+    """
+    check_export_format(format)
+    filters = {} if filters is None else filters
+
+    if format == "parquet":
+        pushed_down_filters = [
+            (column, "in", list(values) if isinstance(values, (list, tuple, set)) else [values])
+            for column, values in filters.items()
+        ]
+        return pd.read_parquet(path, columns=columns, filters=pushed_down_filters or None)
+
+    # the filtered columns have to be read, even if they are not requested
+    usecols = None if columns is None else list(dict.fromkeys([*columns, *filters.keys()]))
+    df = pd.read_csv(path, usecols=usecols)
+    if filters:
+        df = df[filters_to_mask(df, filters)].reset_index(drop=True)
+    return df if columns is None else df[columns]
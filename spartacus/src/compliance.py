@@ -1,3 +1,5 @@
+from functools import cached_property
+
 from .biomech_system import BiomechCoordinateSystem
 from .enums_biomech import CartesianAxis
 from .joint import Joint
@@ -161,9 +163,9 @@ class SegmentCompliance(Compliance):
             The biomechanical coordinate system to check for compliance.
         """
         super().__init__()
-        self.bsys = bsys
+        self.bsys = bsys  # the flags are evaluated once, bsys must not be modified afterward
 
-    @property
+    @cached_property
     def is_c1(self) -> bool:
         """
         Check if the biomechanical coordinate system is oriented according to the ISB recommendations.
@@ -175,7 +177,7 @@ class SegmentCompliance(Compliance):
         """
         return self.is_isb_oriented(self.bsys)
 
-    @property
+    @cached_property
     def is_c2(self) -> bool:
         """
         Check if the biomechanical coordinate system is built with ISB landmarks.
@@ -187,7 +189,7 @@ class SegmentCompliance(Compliance):
         """
         return self.are_axes_built_with_isb_landmarks(self.bsys)
 
-    @property
+    @cached_property
     def is_c3(self) -> bool:
         """
         Check if the origin of the biomechanical coordinate system is built with ISB landmarks.
@@ -1,9 +1,9 @@
-import biorbd
 import numpy as np
 
 from ..biomech_system import BiomechCoordinateSystem
 from ..enums_biomech import EulerSequence
 from ..utils import mat_2_rotation, flip_rotations
+from .euler_sequences import euler_angles_to_rotation_matrices, rotation_matrices_to_euler_angles
 
 
 def get_angle_conversion_callback_from_tuple(tuple_factors: tuple[int, int, int]) -> callable:
@@ -19,8 +19,8 @@ def get_angle_conversion_callback_from_tuple(tuple_factors: tuple[int, int, int]
 
 def convert_euler_angles(previous_sequence_str: str, new_sequence_str: str, rot1, rot2, rot3) -> np.ndarray:
     """Convert Euler angles from one sequence to another"""
-    r = biorbd.Rotation.fromEulerAngles(np.array([rot1, rot2, rot3]), seq=previous_sequence_str)
-    return biorbd.Rotation.toEulerAngles(r, seq=new_sequence_str).to_array()
+    r = euler_angles_to_rotation_matrices(np.array([rot1, rot2, rot3]), previous_sequence_str)
+    return rotation_matrices_to_euler_angles(r, new_sequence_str)
 
 
 def get_angle_conversion_callback_from_sequence(
@@ -41,9 +41,7 @@ def from_euler_angles_to_rotation_matrix(
     rot2,
     rot3,
 ):
-    rotation_matrix_object = biorbd.Rotation.fromEulerAngles(np.array([rot1, rot2, rot3]), seq=previous_sequence_str)
-    rotation_matrix = rotation_matrix_object.to_array()
-    return rotation_matrix
+    return euler_angles_to_rotation_matrices(np.array([rot1, rot2, rot3]), previous_sequence_str)
 
 
 def isb_framed_rotation_matrix_from_euler_angles(
@@ -82,10 +80,13 @@ def to_left_handed_frame(
     But, the identified euler angles of the left side (left shoulder) would have the same signs
     as for the right-handed frame of the right side (right shoulder).
     """
+    # imported here, correction_plan imports this module
+    from .correction_plan import LEFT_HANDED_MATRIX
+
     return set_corrections_on_rotation_matrix(
-        child_matrix_correction=np.diag([1, 1, -1]),
+        child_matrix_correction=LEFT_HANDED_MATRIX,
         matrix=matrix,
-        parent_matrix_correction=np.diag([1, 1, -1]),
+        parent_matrix_correction=LEFT_HANDED_MATRIX,
     )
 
 
@@ -129,19 +130,19 @@ def quick_fix_x_rot_in_yxy_from_matrix(angles: np.ndarray, matrix: np.ndarray) -
 
     Parameters:
     angles (np.ndarray): Array of Euler angles [α, β, γ] in radians,
-                             where β is the rotation around the x-axis.
-    matrix (np.ndarray): 3x3 rotation matrix corresponding to the YXY sequence.
+                             where β is the rotation around the x-axis, shape (3,) or (N, 3).
+    matrix (np.ndarray): 3x3 rotation matrix corresponding to the YXY sequence, shape (3, 3) or (N, 3, 3).
 
     4. Our Solution:
        We introduce a check based on sin(β):
        If matrix[1, 0] < 0 or matrix[1, 2] > 0, we infer β < 0 and adjust accordingly.
+       The samples are checked all at once, only the ones matching the condition are flipped.
 
        NOTE: It may induce some sort of gimbal lock when γ < np.pi/2
     """
-    if matrix[1, 0] < 0 or matrix[1, 2] > 0:
-        return quick_fix_x_rot_in_yxy(angles)
-    else:
-        return angles
+    matrix = np.asarray(matrix)
+    to_flip = (matrix[..., 1, 0] < 0) | (matrix[..., 1, 2] > 0)
+    return np.where(to_flip[..., np.newaxis], quick_fix_x_rot_in_yxy(angles), angles)
 
 
 def quick_fix_x_rot_in_yxy_if_x_positive(angles: np.ndarray) -> np.ndarray:
@@ -149,19 +150,17 @@ def quick_fix_x_rot_in_yxy_if_x_positive(angles: np.ndarray) -> np.ndarray:
 
     Parameters:
     angles (np.ndarray): Array of Euler angles [α, β, γ] in radians,
-                             where β is the rotation around the x-axis.
-    matrix (np.ndarray): 3x3 rotation matrix corresponding to the YXY sequence.
+                             where β is the rotation around the x-axis, shape (3,), (N, 3) or any stack (..., 3).
 
     4. Our Solution:
-       We introduce a check based on sin(β):
-       If matrix[1, 0] < 0 or matrix[1, 2] > 0, we infer β < 0 and adjust accordingly.
+       The samples with a positive β are flipped to their equivalent angles with a negative β,
+       all at once, the other samples are kept as they are.
 
        NOTE: It may induce some sort of gimbal lock when γ < np.pi/2
     """
-    if angles[1] > 0:
-        return quick_fix_x_rot_in_yxy(angles)
-    else:
-        return angles
+    angles = np.asarray(angles, dtype=np.float64)
+    to_flip = angles[..., 1] > 0
+    return np.where(to_flip[..., np.newaxis], quick_fix_x_rot_in_yxy(angles), angles)
 
 
 def quick_fix_x_rot_in_yxy(angles: np.ndarray) -> np.ndarray:
@@ -188,10 +187,10 @@ def quick_fix_x_rot_in_yxy(angles: np.ndarray) -> np.ndarray:
 
     Parameters:
     angles (np.ndarray): Array of Euler angles [α, β, γ] in radians,
-                             where β is the rotation around the x-axis.
+                             where β is the rotation around the x-axis, shape (3,), (N, 3) or any stack (..., 3).
 
     Returns:
-    np.ndarray: Corrected Euler angles with the proper sign for the x rotation (β).
+    np.ndarray: Corrected Euler angles with the proper sign for the x rotation (β), the input is left untouched.
 
     Note:
     This function resolves the β sign ambiguity by checking matrix[1, 0] (sin(β)sin(γ))
@@ -218,10 +217,7 @@ def rotation_matrix_2_euler_angles(
     rotation_matrix: np.ndarray,
     euler_sequence: EulerSequence,
 ) -> np.ndarray:
-    rotation_matrix_object = mat_2_rotation(rotation_matrix)
-    new_angles = biorbd.Rotation.toEulerAngles(rotation_matrix_object, seq=euler_sequence.value.lower()).to_array()
-
-    return new_angles
+    return rotation_matrices_to_euler_angles(rotation_matrix, euler_sequence)
 
 
 def get_angle_conversion_callback_to_isb_with_sequence(
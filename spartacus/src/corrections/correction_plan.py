@@ -0,0 +1,274 @@
+"""
+This module describes the corrections of a row as plain data, instead of nested closures.
+
+A CorrectionPlan holds everything needed to correct the Euler angles of a row:
+    - the Euler sequence of the data and the ISB Euler sequence,
+    - the constant matrices applied on the left and on the right of the joint rotation matrices,
+      i.e. the parent and child frames to ISB, the left-hand flip and the Kolz corrections, precomposed,
+    - the names of the fixes applied on the identified angles, e.g. the negative elevation in yxy.
+A TranslationCorrectionPlan does the same for the translations.
+
+The plans only hold strings, tuples and numpy arrays, so they can be pickled, sent to worker processes,
+cached on disk, compared and inspected. Their apply method corrects a whole series of samples at once.
+"""
+
+import numpy as np
+
+from ..biomech_system import BiomechCoordinateSystem
+from ..enums_biomech import EulerSequence
+from .angle_conversion_callbacks import quick_fix_x_rot_in_yxy_if_x_positive
+from .euler_basis import from_jcs_to_parent_frame_batch
+from .euler_sequences import (
+    AXIS_INDEX,
+    elementary_rotation_matrices,
+    euler_angles_to_rotation_matrices,
+    get_euler_backend,
+    rotation_matrices_to_euler_angles,
+)
+
+# multiplies the z-axis by -1 on both sides of a rotation matrix, to express it in a left-handed frame
+LEFT_HANDED_MATRIX = np.diag([1.0, 1.0, -1.0])
+
+POST_FIXES = {
+    # the yxy angles (N, 3) with a negative elevation, all the samples at once
+    "negative_elevation_in_yxy": quick_fix_x_rot_in_yxy_if_x_positive,
+}
+
+
+def _sequence_str(sequence: EulerSequence | str | None) -> str | None:
+    return sequence.value if isinstance(sequence, EulerSequence) else sequence
+
+
+def elementary_rotation_terms(axis: str) -> np.ndarray:
+    """
+    Returns the terms (3, 3, 3) of a rotation around a cartesian axis, R(angle) = T0 + cos(angle) T1 + sin(angle) T2
+    """
+    i = AXIS_INDEX[axis]
+    j, k = (i + 1) % 3, (i + 2) % 3
+    terms = np.zeros((3, 3, 3))
+    terms[0, i, i] = 1.0
+    terms[1, j, j] = terms[1, k, k] = 1.0
+    terms[2, k, j] = 1.0
+    terms[2, j, k] = -1.0
+    return terms
+
+
+def folded_rotation_matrices(angles: np.ndarray, terms: np.ndarray) -> np.ndarray:
+    """
+    Returns the matrices (N, 3, 3) T0 + cos(angle) T1 + sin(angle) T2 of the angles (N,), in a single product,
+    e.g. the terms of an elementary rotation already multiplied by a constant matrix
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    trigonometry = np.stack([np.ones_like(angles), np.cos(angles), np.sin(angles)], axis=-1)
+    return (trigonometry @ terms.reshape(3, 9)).reshape(angles.shape + (3, 3))
+
+
+class CorrectionPlan:
+    """
+    The corrections of the Euler angles of a row, R_corrected = left_matrix @ R(angles) @ right_matrix
+
+    Attributes
+    ----------
+    source_sequence : str
+        The Euler sequence of the angles of the row, e.g. 'xyz'
+    target_sequence : str
+        The ISB Euler sequence of the joint, e.g. 'yxy'
+    left_matrix : np.ndarray
+        The constant matrix (3, 3) applied on the left of the joint rotation matrices, parent side
+    right_matrix : np.ndarray
+        The constant matrix (3, 3) applied on the right of the joint rotation matrices, child side
+    post_fixes : tuple[str, ...]
+        The names of the fixes applied on the identified angles, in order, see POST_FIXES
+    """
+
+    def __init__(
+        self,
+        source_sequence: EulerSequence | str,
+        target_sequence: EulerSequence | str,
+        left_matrix: np.ndarray,
+        right_matrix: np.ndarray,
+        post_fixes: tuple[str, ...] = (),
+    ):
+        unknown_fixes = [fix for fix in post_fixes if fix not in POST_FIXES]
+        if unknown_fixes:
+            raise ValueError(f"{unknown_fixes} are not valid post fixes, must be in {tuple(POST_FIXES)}.")
+
+        self.source_sequence = _sequence_str(source_sequence)
+        self.target_sequence = _sequence_str(target_sequence)
+        self.left_matrix = np.asarray(left_matrix, dtype=float)
+        self.right_matrix = np.asarray(right_matrix, dtype=float)
+        self.post_fixes = tuple(post_fixes)
+
+        # constant per row, so computed once, L @ R_first(rot1) and R_third(rot3) @ R are linear in cos and sin
+        self._left_terms = self.left_matrix @ elementary_rotation_terms(self.source_sequence[0])
+        self._right_terms = elementary_rotation_terms(self.source_sequence[2]) @ self.right_matrix
+
+    @classmethod
+    def from_segments(
+        cls,
+        source_sequence: EulerSequence | str,
+        target_sequence: EulerSequence | str,
+        bsys_parent: BiomechCoordinateSystem,
+        bsys_child: BiomechCoordinateSystem,
+        left_side: bool = False,
+        parent_matrix_correction: np.ndarray = None,
+        child_matrix_correction: np.ndarray = None,
+        post_fixes: tuple[str, ...] = (),
+    ):
+        """
+        Precompose the corrections of a row: the parent and child frames to ISB, the left-hand flip
+        and the extra corrections, e.g. Kolz, in this order
+
+        Parameters
+        ----------
+        source_sequence: EulerSequence | str
+            The Euler sequence of the angles of the row
+        target_sequence: EulerSequence | str
+            The ISB Euler sequence of the joint
+        bsys_parent: BiomechCoordinateSystem
+            The parent coordinate system
+        bsys_child: BiomechCoordinateSystem
+            The child coordinate system
+        left_side: bool
+            If True, the rotation matrices are converted to a left-handed frame
+        parent_matrix_correction: np.ndarray
+            The extra correction of the parent segment, e.g. Kolz, identity by default
+        child_matrix_correction: np.ndarray
+            The extra correction of the child segment, e.g. Kolz, identity by default
+        post_fixes: tuple[str, ...]
+            The names of the fixes applied on the identified angles, see POST_FIXES
+        """
+        flip = LEFT_HANDED_MATRIX if left_side else np.eye(3)
+        parent_matrix_correction = np.eye(3) if parent_matrix_correction is None else parent_matrix_correction
+        child_matrix_correction = np.eye(3) if child_matrix_correction is None else child_matrix_correction
+
+        return cls(
+            source_sequence=source_sequence,
+            target_sequence=target_sequence,
+            left_matrix=parent_matrix_correction @ flip @ bsys_parent.get_rotation_matrix(),
+            right_matrix=bsys_child.get_rotation_matrix().T @ flip @ child_matrix_correction.T,
+            post_fixes=post_fixes,
+        )
+
+    def rotation_matrices(self, angles: np.ndarray) -> np.ndarray:
+        """
+        Returns the corrected joint rotation matrices (N, 3, 3) of the Euler angles (N, 3) in radians
+
+        The left matrix is folded in the first elementary rotation and the right matrix in the last one,
+        L @ R_first(rot1) @ R_second(rot2) @ R_third(rot3) @ R, so only two products remain per sample.
+        """
+        angles = np.asarray(angles, dtype=np.float64)
+        if get_euler_backend() == "biorbd":
+            matrices = euler_angles_to_rotation_matrices(angles, self.source_sequence)
+            return np.einsum("ij,njk,kl->nil", self.left_matrix, matrices, self.right_matrix)
+
+        first = folded_rotation_matrices(angles[..., 0], self._left_terms)
+        second = elementary_rotation_matrices(angles[..., 1], self.source_sequence[1])
+        third = folded_rotation_matrices(angles[..., 2], self._right_terms)
+        return first @ second @ third
+
+    def apply(self, angles: np.ndarray) -> np.ndarray:
+        """
+        Correct a series of Euler angles
+
+        Parameters
+        ----------
+        angles: np.ndarray
+            The Euler angles of the source sequence in radians, shape (N, 3)
+
+        Returns
+        -------
+        np.ndarray
+            The Euler angles of the target sequence in radians, shape (N, 3)
+        """
+        corrected_angles = rotation_matrices_to_euler_angles(self.rotation_matrices(angles), self.target_sequence)
+        for fix in self.post_fixes:
+            corrected_angles = POST_FIXES[fix](corrected_angles)
+        return corrected_angles
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CorrectionPlan):
+            return NotImplemented
+        return (
+            self.source_sequence == other.source_sequence
+            and self.target_sequence == other.target_sequence
+            and np.array_equal(self.left_matrix, other.left_matrix)
+            and np.array_equal(self.right_matrix, other.right_matrix)
+            and self.post_fixes == other.post_fixes
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"CorrectionPlan({self.source_sequence} -> {self.target_sequence}, "
+            f"left_matrix={self.left_matrix.round(3).tolist()}, right_matrix={self.right_matrix.round(3).tolist()}, "
+            f"post_fixes={self.post_fixes})"
+        )
+
+
+class TranslationCorrectionPlan:
+    """
+    The corrections of the translations of a row, t_corrected = matrix @ t, t expressed in the parent frame
+
+    Attributes
+    ----------
+    matrix : np.ndarray
+        The constant matrix (3, 3) applied on the translations, i.e. the parent frame to ISB and the left-hand flip
+    jcs_sequence : str | None
+        The Euler sequence of the joint coordinate system the translations are expressed in,
+        None if they are already expressed in the parent frame
+    """
+
+    def __init__(self, matrix: np.ndarray, jcs_sequence: EulerSequence | str | None = None):
+        self.matrix = np.asarray(matrix, dtype=float)
+        self.jcs_sequence = _sequence_str(jcs_sequence)
+
+    @classmethod
+    def from_segment(
+        cls,
+        bsys_parent: BiomechCoordinateSystem,
+        left_side: bool = False,
+        jcs_sequence: EulerSequence | str | None = None,
+    ):
+        """
+        Precompose the corrections of the translations of a row
+
+        Parameters
+        ----------
+        bsys_parent: BiomechCoordinateSystem
+            The parent coordinate system
+        left_side: bool
+            If True, the translations are expressed in a left-handed frame, z is flipped
+        jcs_sequence: EulerSequence | str | None
+            The Euler sequence of the joint coordinate system, if the translations are expressed in it
+        """
+        flip = LEFT_HANDED_MATRIX if left_side else np.eye(3)
+        return cls(matrix=flip @ bsys_parent.get_rotation_matrix(), jcs_sequence=jcs_sequence)
+
+    def apply(self, translations: np.ndarray, rotations: np.ndarray) -> np.ndarray:
+        """
+        Correct a series of translations
+
+        Parameters
+        ----------
+        translations: np.ndarray
+            The translations, shape (N, 3)
+        rotations: np.ndarray
+            The Euler angles of the joint in radians, shape (N, 3), only used for the joint coordinate system
+
+        Returns
+        -------
+        np.ndarray
+            The translations in the ISB parent frame, shape (N, 3)
+        """
+        if self.jcs_sequence is not None:
+            translations = from_jcs_to_parent_frame_batch(translations, rotations, self.jcs_sequence)
+        # translations of shape (N, 3) are rotated at once, i.e. (R @ t.T).T
+        return translations @ self.matrix.T
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TranslationCorrectionPlan):
+            return NotImplemented
+        return self.jcs_sequence == other.jcs_sequence and np.array_equal(self.matrix, other.matrix)
+
+    def __repr__(self) -> str:
+        return f"TranslationCorrectionPlan(jcs_sequence={self.jcs_sequence}, matrix={self.matrix.round(3).tolist()})"
@@ -1,12 +1,17 @@
 from numpy import ndarray
 import numpy as np
-from biorbd import Rotation
 
 from ..enums_biomech import CartesianAxis, EulerSequence
 from .angle_conversion_callbacks import from_euler_angles_to_rotation_matrix
+from .euler_sequences import (
+    AXIS_INDEX,
+    elementary_rotation_matrices,
+    euler_angles_to_rotation_matrices,
+    rotation_matrices_to_euler_angles,
+)
 
 
-def rotation_matrix_from_numpy_to_biorbd(R: np.ndarray) -> Rotation:
+def rotation_matrix_from_numpy_to_biorbd(R: np.ndarray) -> "biorbd.Rotation":
     """
     This function returns the rotation matrix in biorbd formalism
 
@@ -20,6 +25,7 @@ def rotation_matrix_from_numpy_to_biorbd(R: np.ndarray) -> Rotation:
     biorbd.Rotation
         The rotation matrix object
     """
+    from biorbd import Rotation
 
     return Rotation(
         R[0, 0],
@@ -46,12 +52,10 @@ def rotation_matrix_to_euler_angles(rotation_matrix: np.ndarray, seq: str = "xyz
         order of the coordinates in the returned vector
     Returns
     ---------
-    Rotation.toEulerAngles(rotation_matrix_biorbd, seq).to_array()
+    np.ndarray
         The Euler vector in radian as an array
     """
-
-    rotation_matrix_biorbd = rotation_matrix_from_numpy_to_biorbd(rotation_matrix)
-    return Rotation.toEulerAngles(rotation_matrix_biorbd, seq).to_array()
+    return rotation_matrices_to_euler_angles(rotation_matrix, seq)
 
 
 def rotation_x(angle: float) -> ndarray:
@@ -267,6 +271,67 @@ def euler_angles_from_rotation_matrix(
     return euler_angles
 
 
+def euler_basis_from_euler_angles(euler_angles: np.ndarray, sequence: EulerSequence | str) -> np.ndarray:
+    """
+    This function returns the Euler axes of a series of joint angles in the parent frame, in closed form.
+    It matches euler_axes_from_rotation_matrices with R_0_parent = I and axes_source_frame="mixed",
+    where the axes are e1 = v1, e2 = R1 @ v2, e3 = R1 @ R2 @ v3, with R1, R2 the first two elementary rotations.
+
+    Parameters
+    ----------
+    euler_angles: np.ndarray
+        The Euler angles in radians, shape (N, 3)
+    sequence: EulerSequence | str
+        The sequence of rotations
+
+    Returns
+    -------
+    np.ndarray
+        The Euler axes stacked as rows, i.e. R_euler_proximal, shape (N, 3, 3)
+    """
+    sequence = sequence.value if isinstance(sequence, EulerSequence) else sequence
+    # the angles are identified again in the ranges of the sequence, as done when the axes are built from matrices
+    angles = rotation_matrices_to_euler_angles(euler_angles_to_rotation_matrices(euler_angles, sequence), sequence)
+
+    first_rotation = elementary_rotation_matrices(angles[:, 0], sequence[0])
+    first_two_rotations = first_rotation @ elementary_rotation_matrices(angles[:, 1], sequence[1])
+
+    euler_basis = np.empty(angles.shape[:-1] + (3, 3))
+    euler_basis[:, 0, :] = vector_from_axis(sequence[0])
+    euler_basis[:, 1, :] = first_rotation[:, :, AXIS_INDEX[sequence[1]]]
+    euler_basis[:, 2, :] = first_two_rotations[:, :, AXIS_INDEX[sequence[2]]]
+
+    return euler_basis
+
+
+def from_jcs_to_parent_frame_batch(
+    vectors: np.ndarray,
+    euler_angles: np.ndarray,
+    sequence: EulerSequence,
+) -> np.ndarray:
+    """
+    This function expresses a series of translations in the parent frame instead of the Euler basis frame,
+    i.e. it solves R_euler_proximal @ translation_parent = translation_jcs for each sample.
+
+    Parameters
+    ----------
+    vectors: np.ndarray
+        The translations, shape (N, 3)
+    euler_angles: np.ndarray
+        The rotations, Euler angles in radians, shape (N, 3)
+    sequence: EulerSequence
+        The sequence of rotations
+
+    Returns
+    -------
+    np.ndarray
+        The translations in the parent frame, shape (N, 3), nan for the samples with nan angles
+    """
+    vectors = np.asarray(vectors, dtype=np.float64)
+    euler_basis = euler_basis_from_euler_angles(np.asarray(euler_angles, dtype=np.float64), sequence)
+    return np.linalg.solve(euler_basis, vectors[..., np.newaxis])[..., 0]
+
+
 def from_jcs_to_parent_frame(
     vector: np.ndarray,
     euler_angles: np.ndarray,
@@ -290,13 +355,6 @@ def from_jcs_to_parent_frame(
     np.ndarray
         The vector in the parent frame instead of the Euler basis frame
     """
-    R_0_parent = np.eye(3)
-    R_0_child = from_euler_angles_to_rotation_matrix(sequence.value, euler_angles[0], euler_angles[1], euler_angles[2])
-    euler_axes = euler_axes_from_rotation_matrices(
-        R_0_parent=R_0_parent,
-        R_0_child=R_0_child,
-        sequence=sequence,
-        axes_source_frame="mixed",
-    )
-    R_euler_proximal = np.vstack(euler_axes)
-    return np.linalg.inv(R_euler_proximal) @ vector
+    return from_jcs_to_parent_frame_batch(
+        np.asarray(vector)[np.newaxis], np.asarray(euler_angles)[np.newaxis], sequence
+    )[0]
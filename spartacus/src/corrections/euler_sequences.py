@@ -0,0 +1,201 @@
+"""
+This module composes and decomposes Euler angles with numpy, for whole series of angles at once.
+
+The rotation matrices are built with mobile axes, i.e. R = R_first(rot1) @ R_second(rot2) @ R_third(rot3),
+and the angles are identified in the same ranges as biorbd:
+    - Tait-Bryan sequences (e.g. xyz): rot1, rot3 in [-pi, pi], rot2 in [-pi/2, pi/2]
+    - Proper Euler sequences (e.g. yxy): rot1, rot3 in [-pi, pi], rot2 in [0, pi]
+
+All the twelve sequences of EulerSequence are supported. biorbd is not needed, but it can still be used
+as a backend to cross-check the results, see set_euler_backend.
+"""
+
+from typing import Literal
+
+import numpy as np
+
+from ..enums_biomech import EulerSequence
+from ..utils import mat_2_rotation
+
+AXIS_INDEX = {"x": 0, "y": 1, "z": 2}
+EULER_BACKENDS = ("numpy", "biorbd")
+
+_euler_backend = "numpy"
+
+
+def set_euler_backend(backend: Literal["numpy", "biorbd"]) -> None:
+    """
+    Choose the library used to compose and decompose Euler angles in the whole package.
+
+    Parameters
+    ----------
+    backend: str
+        'numpy' (default) for the vectorized implementation of this module,
+        'biorbd' to fall back to biorbd, one sample at a time, e.g. to cross-check the results.
+    """
+    global _euler_backend
+    if backend not in EULER_BACKENDS:
+        raise ValueError(f"{backend} is not a valid backend, must be one of {EULER_BACKENDS}.")
+    if backend == "biorbd":
+        import biorbd  # raises early if biorbd is not installed
+    _euler_backend = backend
+
+
+def get_euler_backend() -> str:
+    """Returns the library used to compose and decompose Euler angles, 'numpy' or 'biorbd'."""
+    return _euler_backend
+
+
+def _check_backend(backend: str | None) -> str:
+    backend = _euler_backend if backend is None else backend
+    if backend not in EULER_BACKENDS:
+        raise ValueError(f"{backend} is not a valid backend, must be one of {EULER_BACKENDS}.")
+    return backend
+
+
+def _sequence_to_str(sequence: EulerSequence | str) -> str:
+    sequence_str = sequence.value if isinstance(sequence, EulerSequence) else sequence.lower()
+    if len(sequence_str) != 3 or any(axis not in AXIS_INDEX for axis in sequence_str):
+        raise ValueError(f"{sequence} is not a valid euler sequence.")
+    if sequence_str[0] == sequence_str[1] or sequence_str[1] == sequence_str[2]:
+        raise ValueError(f"{sequence} is not a valid euler sequence, two successive axes are the same.")
+    return sequence_str
+
+
+def elementary_rotation_matrices(angles: np.ndarray, axis: str) -> np.ndarray:
+    """
+    This function returns the rotation matrices around a cartesian axis for a series of angles in radians.
+
+    Parameters
+    ----------
+    angles: np.ndarray
+        The angles, shape (N,)
+    axis: str
+        The axis of rotation, 'x', 'y' or 'z'
+
+    Returns
+    -------
+    np.ndarray
+        The rotation matrices, shape (N, 3, 3)
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    cos_angle = np.cos(angles)
+    sin_angle = np.sin(angles)
+
+    matrices = np.zeros(angles.shape + (3, 3))
+    i = AXIS_INDEX.get(axis)
+    if i is None:
+        raise ValueError("The axis must be 'x', 'y' or 'z'.")
+    j, k = (i + 1) % 3, (i + 2) % 3
+
+    matrices[..., i, i] = 1.0
+    matrices[..., j, j] = cos_angle
+    matrices[..., j, k] = -sin_angle
+    matrices[..., k, j] = sin_angle
+    matrices[..., k, k] = cos_angle
+
+    return matrices
+
+
+def euler_angles_to_rotation_matrices(
+    angles: np.ndarray, sequence: EulerSequence | str, backend: Literal["numpy", "biorbd"] = None
+) -> np.ndarray:
+    """
+    This function builds the rotation matrices of a series of Euler angles
+
+    Parameters
+    ----------
+    angles: np.ndarray
+        The Euler angles in radians, shape (N, 3) or (3,)
+    sequence: EulerSequence | str
+        The sequence of rotations, e.g. 'xyz'
+    backend: str
+        'numpy' or 'biorbd', the backend set with set_euler_backend by default
+
+    Returns
+    -------
+    np.ndarray
+        The rotation matrices R = R_first(rot1) @ R_second(rot2) @ R_third(rot3), shape (N, 3, 3) or (3, 3)
+    """
+    sequence_str = _sequence_to_str(sequence)
+    angles = np.asarray(angles, dtype=np.float64)
+    if angles.shape[-1] != 3:
+        raise ValueError(f"The last dimension of angles must be 3, got {angles.shape}")
+
+    if _check_backend(backend) == "biorbd":
+        return _biorbd_euler_angles_to_rotation_matrices(angles, sequence_str)
+
+    matrices = elementary_rotation_matrices(angles[..., 0], sequence_str[0])
+    matrices = matrices @ elementary_rotation_matrices(angles[..., 1], sequence_str[1])
+    matrices = matrices @ elementary_rotation_matrices(angles[..., 2], sequence_str[2])
+
+    return matrices
+
+
+def rotation_matrices_to_euler_angles(
+    matrices: np.ndarray, sequence: EulerSequence | str, backend: Literal["numpy", "biorbd"] = None
+) -> np.ndarray:
+    """
+    This function identifies the Euler angles of a series of rotation matrices
+
+    Parameters
+    ----------
+    matrices: np.ndarray
+        The rotation matrices, shape (N, 3, 3) or (3, 3)
+    sequence: EulerSequence | str
+        The sequence of rotations, e.g. 'xyz'
+    backend: str
+        'numpy' or 'biorbd', the backend set with set_euler_backend by default
+
+    Returns
+    -------
+    np.ndarray
+        The Euler angles in radians, shape (N, 3) or (3,)
+    """
+    sequence_str = _sequence_to_str(sequence)
+    matrices = np.asarray(matrices, dtype=np.float64)
+    if matrices.shape[-2:] != (3, 3):
+        raise ValueError(f"The last two dimensions of matrices must be (3, 3), got {matrices.shape}")
+
+    if _check_backend(backend) == "biorbd":
+        return _biorbd_rotation_matrices_to_euler_angles(matrices, sequence_str)
+
+    i, j = AXIS_INDEX[sequence_str[0]], AXIS_INDEX[sequence_str[1]]
+    is_proper_euler = sequence_str[0] == sequence_str[2]
+    k = 3 - i - j if is_proper_euler else AXIS_INDEX[sequence_str[2]]
+    # +1 for circular permutations of the axes (xyz, yzx, zxy), -1 otherwise
+    sign = 1.0 if (j - i) % 3 == 1 else -1.0
+
+    angles = np.empty(matrices.shape[:-2] + (3,))
+    if is_proper_euler:
+        angles[..., 0] = np.arctan2(matrices[..., j, i], -sign * matrices[..., k, i])
+        angles[..., 1] = np.arccos(np.clip(matrices[..., i, i], -1.0, 1.0))
+        angles[..., 2] = np.arctan2(matrices[..., i, j], sign * matrices[..., i, k])
+    else:
+        angles[..., 0] = np.arctan2(-sign * matrices[..., j, k], matrices[..., k, k])
+        angles[..., 1] = np.arcsin(np.clip(sign * matrices[..., i, k], -1.0, 1.0))
+        angles[..., 2] = np.arctan2(-sign * matrices[..., i, j], matrices[..., i, i])
+
+    return angles
+
+
+def _biorbd_euler_angles_to_rotation_matrices(angles: np.ndarray, sequence_str: str) -> np.ndarray:
+    """Same as euler_angles_to_rotation_matrices, one sample at a time with biorbd"""
+    import biorbd
+
+    flat_angles = angles.reshape(-1, 3)
+    matrices = np.array(
+        [biorbd.Rotation.fromEulerAngles(rot=sample, seq=sequence_str).to_array() for sample in flat_angles]
+    )
+    return matrices.reshape(angles.shape[:-1] + (3, 3))
+
+
+def _biorbd_rotation_matrices_to_euler_angles(matrices: np.ndarray, sequence_str: str) -> np.ndarray:
+    """Same as rotation_matrices_to_euler_angles, one sample at a time with biorbd"""
+    import biorbd
+
+    flat_matrices = matrices.reshape(-1, 3, 3)
+    angles = np.array(
+        [biorbd.Rotation.toEulerAngles(mat_2_rotation(matrix), seq=sequence_str).to_array() for matrix in flat_matrices]
+    )
+    return angles.reshape(matrices.shape[:-2] + (3,))
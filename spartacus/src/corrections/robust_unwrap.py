@@ -1,8 +1,9 @@
 import numpy as np
-import biorbd
 from scipy import optimize
 from typing import Literal
 
+from .euler_sequences import euler_angles_to_rotation_matrices
+
 
 def helicoidal_angle(rotation_matrix: np.ndarray) -> np.ndarray:
     """
@@ -14,7 +15,15 @@ def helicoidal_angle(rotation_matrix: np.ndarray) -> np.ndarray:
     Returns:
     np.ndarray: The helicoidal angle in radians.
     """
-    return np.arccos((np.trace(rotation_matrix) - 1) / 2)
+    # same as arccos((trace - 1) / 2), but still accurate for small angles where arccos flattens out
+    skew_vector = np.array(
+        [
+            rotation_matrix[2, 1] - rotation_matrix[1, 2],
+            rotation_matrix[0, 2] - rotation_matrix[2, 0],
+            rotation_matrix[1, 0] - rotation_matrix[0, 1],
+        ]
+    )
+    return np.arctan2(np.linalg.norm(skew_vector) / 2, (np.trace(rotation_matrix) - 1) / 2)
 
 
 def unwrap_rotation_matrix_from_euler_angles(angles, seq: str, angles_init: np.ndarray):
@@ -29,7 +38,7 @@ def unwrap_rotation_matrix_from_euler_angles(angles, seq: str, angles_init: np.n
     Returns:
     np.ndarray: The unwrapped Euler angles.
     """
-    R = biorbd.Rotation.fromEulerAngles(rot=angles, seq=seq).to_array()
+    R = euler_angles_to_rotation_matrices(angles, seq)
     return unwrap_rotation_matrix_from_matrix(R, seq, angles_init)
 
 
@@ -46,20 +55,42 @@ def unwrap_rotation_matrix_from_matrix(rotation_matrix: np.ndarray, seq: str, an
     np.ndarray: The unwrapped Euler angles.
     """
     objective_function = (
-        lambda x: helicoidal_angle(biorbd.Rotation.fromEulerAngles(rot=x, seq=seq).to_array().T @ rotation_matrix)
-        * 180
-        / np.pi
+        lambda x: helicoidal_angle(euler_angles_to_rotation_matrices(x, seq).T @ rotation_matrix) * 180 / np.pi
     )
     sol = optimize.least_squares(fun=objective_function, x0=angles_init, verbose=0, method="trf")
 
     return sol.x
 
 
+def wrap_to_pi(angles: np.ndarray) -> np.ndarray:
+    """Wrap angles in radians to [-pi, pi["""
+    return np.mod(angles + np.pi, 2 * np.pi) - np.pi
+
+
+def equivalent_euler_angles(angles_series: np.ndarray, seq: str) -> np.ndarray:
+    """
+    Returns the two Euler angle triplets leading to the same rotation matrix, up to 2*pi shifts of each angle.
+
+    Parameters:
+    angles_series (np.ndarray): The Euler angles, shape (n, 3).
+    seq (str): The sequence of rotations (e.g., 'xyz', 'zyx').
+
+    Returns:
+    np.ndarray: The candidates, shape (n, 2, 3), the angles themselves then their flipped solution:
+        - Proper Euler sequences (e.g. yxy): (rot1 + pi, -rot2, rot3 + pi)
+        - Tait-Bryan sequences (e.g. xyz): (rot1 + pi, pi - rot2, rot3 + pi)
+    """
+    flipped = angles_series + np.array([np.pi, 0, np.pi])
+    flipped[:, 1] = -angles_series[:, 1] if seq[0] == seq[2] else np.pi - angles_series[:, 1]
+    return np.stack((angles_series, flipped), axis=1)
+
+
 def unwrap_angles_from_euler_angles(
     angles_series: np.ndarray,
     seq: Literal["xyz", "xzy", "yxz", "yzx", "zxy", "zyx", "xyx", "xzx", "yxy", "yzy", "zxz", "zyz"],
     angles_init: np.ndarray = None,
     init_strategy: Literal["fixed", "previous"] = "previous",
+    method: Literal["candidates", "optimizer"] = "candidates",
 ) -> np.ndarray:
     """
     Unwrap a series of Euler angles to ensure continuity.
@@ -67,6 +98,12 @@ def unwrap_angles_from_euler_angles(
     This function processes a series of Euler angles and attempts to remove discontinuities
     by unwrapping the angles based on an initial guess and a specified sequence.
 
+    The equivalent triplets of a sample are finite: the angles or their flipped solution, each angle shifted by 2*pi.
+    The 'candidates' method enumerates them for all the samples at once, and picks the branch (angles or flipped)
+    of each sample that minimizes the total distance between successive samples, by dynamic programming,
+    the 2*pi shifts are then removed with np.unwrap.
+    The 'optimizer' method searches the closest triplet of each sample with scipy, one sample at a time.
+
     Parameters:
     -----------
     angles_series : np.ndarray
@@ -75,16 +112,19 @@ def unwrap_angles_from_euler_angles(
         The sequence of rotations (e.g., 'xyz', 'zyx', 'yxy'). Must be one of the 12 valid
         Euler angle sequences.
     angles_init : np.ndarray, optional
-        Initial guess for the first set of unwrapped angles, shape (3,). The first element of angles_series by default
+        Initial guess for the first set of unwrapped angles, shape (3,). The first valid sample of angles_series by
+        default
     init_strategy : {'fixed', 'previous'}, optional
         Strategy for choosing the initial guess for each iteration:
-        - 'fixed': Always use angles_init (default)
-        - 'previous': Use the result of the previous iteration
+        - 'fixed': Always use angles_init
+        - 'previous': Use the result of the previous iteration (default)
+    method : {'candidates', 'optimizer'}, optional
+        'candidates' (default) for the vectorized enumeration, 'optimizer' for the scipy optimization
 
     Returns:
     --------
     np.ndarray
-        The unwrapped series of Euler angles, shape (n, 3).
+        The unwrapped series of Euler angles, shape (n, 3). The samples with nan stay nan.
 
     Raises:
     -------
@@ -94,16 +134,57 @@ def unwrap_angles_from_euler_angles(
     if angles_series.ndim != 2 or angles_series.shape[1] != 3:
         raise ValueError("angles_series must be a 2D array with 3 columns")
     if angles_init is None:
-        angles_init = angles_series[0, :]
+        # the first valid sample, a missing first sample would spread nan to the whole series
+        valid_samples = angles_series[~np.isnan(angles_series).any(axis=1)]
+        angles_init = valid_samples[0] if valid_samples.shape[0] else angles_series[0, :]
     if angles_init.shape != (3,):
         raise ValueError("angles_init must be a 1D array with 3 elements")
     if not init_strategy in ("fixed", "previous"):
-        raise ValueError("Invalid init_strategy. Must be 'fixed', 'previous', or 'original'.")
-
-    new_angles = np.empty_like(angles_series)
-
-    for i, angles in enumerate(angles_series):
-        new_angles[i, :] = unwrap_rotation_matrix_from_euler_angles(angles, seq, initial_guess)
-        initial_guess = new_angles[i, :] if init_strategy == "previous" else angles_init
+        raise ValueError("Invalid init_strategy. Must be 'fixed' or 'previous'.")
+    if not method in ("candidates", "optimizer"):
+        raise ValueError("Invalid method. Must be 'candidates' or 'optimizer'.")
+
+    if method == "optimizer":
+        new_angles = np.empty_like(angles_series)
+        initial_guess = angles_init
+        for i, angles in enumerate(angles_series):
+            new_angles[i, :] = unwrap_rotation_matrix_from_euler_angles(angles, seq, initial_guess)
+            initial_guess = new_angles[i, :] if init_strategy == "previous" else angles_init
+        return new_angles
+
+    new_angles = np.full(angles_series.shape, np.nan)
+    is_valid = ~np.isnan(angles_series).any(axis=1)
+    if not is_valid.any():
+        return new_angles
+
+    candidates = equivalent_euler_angles(angles_series[is_valid], seq)
+    # distance between each candidate and the initial guess, up to 2*pi shifts, shape (n, 2)
+    init_distance = np.linalg.norm(wrap_to_pi(candidates - angles_init), axis=-1)
+
+    if init_strategy == "fixed":
+        branches = np.argmin(init_distance, axis=1)
+        chosen = candidates[np.arange(candidates.shape[0]), branches]
+        new_angles[is_valid] = chosen + 2 * np.pi * np.round((angles_init - chosen) / (2 * np.pi))
+        return new_angles
+
+    # distance between the candidates of each sample and those of the previous one, shape (n - 1, 2 current, 2 previous)
+    transition_distance = np.linalg.norm(
+        wrap_to_pi(candidates[1:, :, np.newaxis, :] - candidates[:-1, np.newaxis, :, :]), axis=-1
+    )
+    cost = init_distance[0]
+    previous_branches = np.empty(transition_distance.shape[:2], dtype=int)
+    for i, distance in enumerate(transition_distance):
+        total_cost = distance + cost[np.newaxis, :]
+        previous_branches[i] = np.argmin(total_cost, axis=1)
+        cost = np.min(total_cost, axis=1)
+
+    branches = np.empty(candidates.shape[0], dtype=int)
+    branches[-1] = np.argmin(cost)
+    for i in range(candidates.shape[0] - 2, -1, -1):
+        branches[i] = previous_branches[i, branches[i + 1]]
+
+    chosen = candidates[np.arange(candidates.shape[0]), branches]
+    # the 2*pi shifts closest to the initial guess, then to the previous sample
+    new_angles[is_valid] = np.unwrap(np.vstack((angles_init, chosen)), axis=0)[1:]
 
     return new_angles
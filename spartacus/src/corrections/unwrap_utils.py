@@ -7,85 +7,106 @@ def unwrap_for_yxy_glenohumeral_joint(three_dof_series: np.ndarray) -> np.ndarra
     Unwrap the angles in a series of 3-DOF angles to ensure continuity,
     particularly handling the glenohumeral joint's potential rotations for glenohumeral yxy sequence
 
+    The segment of the series where the sign of x changes is searched with masks on all the curves at once,
+    the angles before its end are unwrapped backward from it, the angles after it are unwrapped forward from its start.
+
     Parameters:
-    three_dof_series (np.ndarray): A 2D numpy array with each row representing a 3-DOF angle (y, x, y).
+    three_dof_series (np.ndarray): A numpy array with each row representing a 3-DOF angle (y, x, y) in degrees,
+        shape (N, 3) for a curve, or (..., N, 3) for a stack of curves of the same length.
 
     Returns:
-    np.ndarray: A 2D numpy array with the unwrapped angles ensuring continuity.
+    np.ndarray: The unwrapped angles ensuring continuity, same shape as three_dof_series.
     """
+    three_dof_series = np.asarray(three_dof_series, dtype=np.float64)
+    n_samples = three_dof_series.shape[-2]
+    if n_samples < 2:
+        return three_dof_series.copy()
 
-    x = three_dof_series[:, 1]
-    xdot = np.diff(x)
-    positive_indices = np.where(xdot > 0)[0]
-    negative_indices = np.where(xdot < 0)[0]
+    xdot = np.diff(three_dof_series[..., 1], axis=-1)
+    positive, negative = xdot > 0, xdot < 0
+    has_positive, has_negative = positive.any(axis=-1), negative.any(axis=-1)
 
-    if len(negative_indices) == 0:
-        return three_dof_series
+    first_positive, first_negative = positive.argmax(axis=-1), negative.argmax(axis=-1)
+    last_positive = n_samples - 2 - positive[..., ::-1].argmax(axis=-1)
+    last_negative = n_samples - 2 - negative[..., ::-1].argmax(axis=-1)
 
-    # first_idx, last_idx = negative_indices[0], negative_indices[-1]
-    is_positive_segment_first = positive_indices[0] < negative_indices[0]
-    is_negative_segment_first = positive_indices[0] > negative_indices[0]
     # assuming only one sign change
-    if is_negative_segment_first:
-        first_idx, last_idx = negative_indices[0], positive_indices[0] - 1
-    if is_positive_segment_first:
-        first_idx = positive_indices[-1] + 1
-        end_first_negative_segment = np.where(np.diff(negative_indices) != 1)[0]
-        last_idx = negative_indices[-1] if end_first_negative_segment.shape[0] == 0 else end_first_negative_segment[-1]
+    is_negative_segment_first = ~has_positive | (first_negative < first_positive)
+    first_idx = np.where(is_negative_segment_first, first_negative, last_positive + 1)
+    last_idx = np.where(is_negative_segment_first & has_positive, first_positive - 1, last_negative)
+    # the anchors first_idx + 1 and last_idx + 1 must be samples of the series
+    first_idx, last_idx = np.clip(first_idx, 0, n_samples - 2), np.clip(last_idx, 0, n_samples - 2)
 
     unwrapped_series = three_dof_series.copy()
     for col in [0, 2]:
-        unwrapped_series[:, col] = unwrap_segment(three_dof_series[:, col], first_idx + 1, last_idx + 1)
+        unwrapped_series[..., col] = unwrap_segment(three_dof_series[..., col], first_idx + 1, last_idx + 1)
+    unwrapped_series[..., 1] = sign_change_segment(three_dof_series[..., 1], first_idx + 1, last_idx + 1)
+
+    # the curves without decreasing x are kept as they are
+    return np.where(has_negative[..., np.newaxis, np.newaxis], unwrapped_series, three_dof_series)
+
+
+def _is_before(column: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """Returns the mask (..., N) of the samples up to idx included, idx of shape (...)"""
+    return np.arange(column.shape[-1]) <= np.asarray(idx)[..., np.newaxis]
 
-    # assuming only one sign change
-    unwrapped_series[:, 1] = sign_change_segment(three_dof_series[:, 1], first_idx + 1, last_idx + 1)
 
-    return unwrapped_series
+def _take(column: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """Returns the values (..., 1) of column (..., N) at idx of shape (...)"""
+    return np.take_along_axis(column, np.asarray(idx)[..., np.newaxis], axis=-1)
 
 
-def unwrap_segment(column: np.ndarray, first_idx: int, last_idx: int) -> np.ndarray:
+def unwrap_segment(column: np.ndarray, first_idx: int | np.ndarray, last_idx: int | np.ndarray) -> np.ndarray:
     """
     Unwrap a segment of the angle series based on indices where the derivative is negative.
+    The samples up to last_idx are unwrapped backward from last_idx, the following ones forward from first_idx.
+    column is of shape (N,) or (..., N) with first_idx and last_idx of shape (...).
+
+    The unwrapping only depends on the difference between successive samples, so the series is unwrapped once
+    and shifted to match the original value at each anchor.
     """
-    flipped_cropped = np.flip(column[: last_idx + 1])
-    unwrapped_flipped = np.unwrap(flipped_cropped, period=180)
-    unflipped = np.flip(unwrapped_flipped)
-    unwrapped_end = np.unwrap(column[first_idx:], period=180)
-    return np.concatenate((unflipped, unwrapped_end[last_idx - first_idx + 1 :]))
+    column = np.asarray(column, dtype=np.float64)
+    unwrapped = np.unwrap(column, period=180, axis=-1)
+    backward = unwrapped - (_take(unwrapped, last_idx) - _take(column, last_idx))
+    forward = unwrapped - (_take(unwrapped, first_idx) - _take(column, first_idx))
+    return np.where(_is_before(column, last_idx), backward, forward)
 
 
-def sign_change_segment(column: np.ndarray, first_idx: int, last_idx: int) -> np.ndarray:
+def sign_change_segment(column: np.ndarray, first_idx: int | np.ndarray, last_idx: int | np.ndarray) -> np.ndarray:
     """
     Adjust the signs in a segment of the angle series to ensure continuity.
 
     Parameters:
-    column (np.ndarray): A 1D numpy array representing a single angle component.
-    first_idx (int): The starting index of the segment to adjust.
-    last_idx (int): The ending index of the segment to adjust.
+    column (np.ndarray): A numpy array representing a single angle component, shape (N,) or (..., N).
+    first_idx (int | np.ndarray): The starting index of the segment to adjust, shape (...).
+    last_idx (int | np.ndarray): The ending index of the segment to adjust, shape (...).
 
     Returns:
-    np.ndarray: The sign-adjusted segment of the angle series.
+    np.ndarray: The sign-adjusted angle series, the samples up to last_idx have the sign of the sample at last_idx,
+        the following ones the sign of the sample at first_idx once adjusted, i.e. also the one at last_idx
+        when first_idx <= last_idx.
     """
-    flipped_cropped = np.flip(column[: last_idx + 1])
-    constant_sign_flipped_cropped = sign_change_array(flipped_cropped)
-    unflipped = np.flip(constant_sign_flipped_cropped)
-    unsigned_end = sign_change_array(column[first_idx:])
-    return np.concatenate((unflipped, unsigned_end[last_idx - first_idx + 1 :]))
+    column = np.asarray(column, dtype=np.float64)
+    backward = sign_change_array(column, _take(column, last_idx))
+    forward = sign_change_array(column, _take(backward, first_idx))
+    return np.where(_is_before(column, last_idx), backward, forward)
 
 
-def sign_change_array(array: np.ndarray) -> np.ndarray:
+def sign_change_array(array: np.ndarray, reference: float | np.ndarray = None) -> np.ndarray:
     """
-    Change the signs in an array to ensure all elements have the same sign as the first element.
+    Change the signs in an array to ensure all elements have the same sign as the reference.
 
     Parameters:
-    array (np.ndarray): A 1D numpy array.
+    array (np.ndarray): A numpy array, shape (N,) or (..., N).
+    reference (float | np.ndarray): The value giving the sign, the first element of the array by default,
+        shape (..., 1) for a stack of arrays.
 
     Returns:
-    np.ndarray: The sign-adjusted array.
+    np.ndarray: The sign-adjusted array, the input is left untouched.
     """
-    first_sign = np.sign(array[0])
-    array[np.sign(array) != first_sign] *= -1
-    return array
+    array = np.asarray(array, dtype=np.float64)
+    first_sign = np.sign(array[..., :1] if reference is None else reference)
+    return np.where(np.sign(array) != first_sign, -array, array)
 
 
 def unwrap_segment_rotation_matrix(three_column: np.ndarray, first_idx: int, last_idx: int, seq: str) -> np.ndarray:
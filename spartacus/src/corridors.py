@@ -0,0 +1,288 @@
+"""
+This module computes the corridors of the dataset, i.e. the mean, SD, median and percentile bands of the curves
+across articles and shoulders, per joint, humeral motion and degree of freedom, on a common humerothoracic angle grid.
+
+The curves are first resampled in a CurveTensor, whose rows are grouped by (joint, humeral_motion, unit).
+The statistics of all the groups are computed at once, without any loop over the groups:
+    - the weighted sums are products with the one-hot matrix (group, row) of the groups,
+    - the percentiles come from a single sort of the rows, by group then by value, at each angle.
+
+Each curve can be weighted:
+    - by shoulder, every row has the same weight,
+    - by article, the rows of an article share a weight of one at each angle, so that an article reporting many
+      shoulders does not outweigh an article reporting a mean curve.
+The percentiles are weighted too, with the midpoint (hazen) definition, which is np.nanpercentile(method="hazen")
+when all the weights are equal.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .curve_tensor import CurveTensor, DOFS
+
+CORRIDOR_KEYS = ("joint", "humeral_motion", "unit")
+WEIGHTINGS = ("shoulder", "article")
+DEFAULT_PERCENTILES = (5, 25, 75, 95)
+
+
+def one_hot(codes: np.ndarray, n_codes: int) -> np.ndarray:
+    """Returns the matrix (n_codes, N) whose product with an array (N, ...) sums its lines by code"""
+    return (np.arange(n_codes)[:, np.newaxis] == codes).astype(np.float64)
+
+
+def weighted_mean_and_sd(values: np.ndarray, weights: np.ndarray, groups: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Weighted mean and SD of the lines of each group, ignoring the nan values
+
+    Parameters
+    ----------
+    values: np.ndarray
+        The samples, shape (N, M), nan if missing
+    weights: np.ndarray
+        The weights of the samples, shape (N, M), zero where the samples are missing
+    groups: np.ndarray
+        The one-hot matrix of the groups, shape (G, N), see one_hot, or any matrix of sample counts, e.g. resamples
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The mean and the SD, unbiased for reliability weights, i.e. ddof=1 when all the weights are equal,
+        shape (G, M)
+    """
+    # the values are centered at each angle, so that sum w x^2 - mean^2 sum w does not lose the small variances
+    with np.errstate(invalid="ignore", divide="ignore"):
+        center = np.nan_to_num((weights * np.nan_to_num(values)).sum(axis=0) / weights.sum(axis=0))
+    values = np.where(weights > 0, values - center, 0.0)
+
+    total_weights = groups @ weights
+    with np.errstate(invalid="ignore", divide="ignore"):
+        centered_mean = (groups @ (weights * values)) / total_weights
+        squared_deviations = groups @ (weights * values**2) - centered_mean**2 * total_weights
+        unbiased_total = total_weights - (groups @ weights**2) / total_weights
+        sd = np.sqrt(np.maximum(squared_deviations, 0) / unbiased_total)
+    return centered_mean + center, sd
+
+
+def weighted_percentiles(
+    values: np.ndarray,
+    weights: np.ndarray,
+    percentiles: tuple[float, ...],
+    codes: np.ndarray = None,
+    n_groups: int = 1,
+) -> np.ndarray:
+    """
+    Weighted percentiles of the lines of each group, ignoring the nan values
+
+    The sorted samples are placed at the middle of their cumulated weights, (cumsum(w) - w / 2) / sum(w),
+    and the percentiles are interpolated linearly between them, clipped to the first and last samples.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        The samples, shape (N, M), nan if missing
+    weights: np.ndarray
+        The positive weights of the samples, shape (N, M)
+    percentiles: tuple[float, ...]
+        The percentiles, in [0, 100]
+    codes: np.ndarray
+        The group of each line, in [0, n_groups), shape (N,), all the lines are in the same group by default
+    n_groups: int
+        The number of groups
+
+    Returns
+    -------
+    np.ndarray
+        The percentiles, shape (len(percentiles), n_groups, M), nan where a group has no sample
+    """
+    codes = np.zeros(values.shape[0], dtype=np.int64) if codes is None else np.asarray(codes, dtype=np.int64)
+    missing = np.isnan(values)
+
+    # the group is the leading key of the sort, and the missing values are the last ones of their group
+    offset = 0.0 if missing.all() else np.nanmin(values)
+    span = (0.0 if missing.all() else np.nanmax(values) - offset) + 2.0
+    keys = np.where(missing, span - 1.0, values - offset) + span * codes[:, np.newaxis]
+    order = np.argsort(keys, axis=0)
+    values = np.take_along_axis(values, order, axis=0)
+    weights = np.take_along_axis(np.where(missing, 0.0, weights), order, axis=0)
+
+    # once sorted, the lines of a group have the same indices at every angle
+    sizes = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    sorted_codes = np.repeat(np.arange(n_groups), sizes)
+    sorted_groups = one_hot(sorted_codes, n_groups)
+    n_samples = sorted_groups @ ~np.isnan(values)
+
+    cumulated_weights = np.concatenate((np.zeros((1, values.shape[1])), np.cumsum(weights, axis=0)))
+    weights_before = cumulated_weights[starts][sorted_codes]
+    totals = (cumulated_weights[starts + sizes] - cumulated_weights[starts])[sorted_codes]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        positions = (cumulated_weights[1:] - weights_before - weights / 2) / totals
+    positions[(np.arange(values.shape[0]) - starts[sorted_codes])[:, np.newaxis] >= n_samples[sorted_codes]] = np.inf
+
+    # all the percentiles at once, the samples k - 1 and k of a group surround the quantile
+    quantiles = np.asarray(percentiles, dtype=np.float64) / 100
+    above = np.stack([sorted_groups @ (positions < quantile) for quantile in quantiles])
+    above = np.minimum(above, np.maximum(n_samples - 1, 0)).astype(np.int64) + starts[:, np.newaxis]
+    below = np.maximum(above - 1, starts[:, np.newaxis])
+
+    def take(array: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        return np.take_along_axis(array, indices.reshape(-1, array.shape[1]), axis=0).reshape(indices.shape)
+
+    lower_position, upper_position = take(positions, below), take(positions, above)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraction = np.clip(
+            (quantiles[:, np.newaxis, np.newaxis] - lower_position) / (upper_position - lower_position), 0, 1
+        )
+    fraction = np.where(np.isfinite(fraction), fraction, 0.0)
+    lower_value, upper_value = take(values, below), take(values, above)
+    results = lower_value + fraction * (upper_value - lower_value)
+
+    results[:, n_samples == 0] = np.nan
+    return results
+
+
+def group_rows(tensor: CurveTensor, keys: tuple[str, ...] = CORRIDOR_KEYS) -> tuple[np.ndarray, pd.DataFrame]:
+    """Returns the group of each row of the tensor, in [0, n_groups), and the keys of the groups, sorted"""
+    codes = tensor.rows.groupby(list(keys), dropna=False, sort=True, observed=True).ngroup().to_numpy()
+    _, first_rows = np.unique(codes, return_index=True)
+    return codes, tensor.rows.iloc[first_rows][list(keys)].reset_index(drop=True)
+
+
+def curve_weights(tensor: CurveTensor, weighting: str = "shoulder") -> np.ndarray:
+    """
+    Returns the weight of each curve at each angle, shape (row, dof * grid), zero where the curve is missing.
+    With the 'article' weighting, the rows of an article in a (joint, humeral_motion, unit) share a weight of one.
+    """
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"{weighting} is not a valid weighting, must be one of {WEIGHTINGS}.")
+    mask = (~np.isnan(tensor.values.reshape(len(tensor), -1))).astype(np.float64)
+    if weighting == "shoulder":
+        return mask
+
+    article_codes, article_groups = group_rows(tensor, CORRIDOR_KEYS + ("article",))
+    rows_per_article = one_hot(article_codes, article_groups.shape[0]) @ mask
+    with np.errstate(divide="ignore"):
+        return np.where(mask > 0, 1 / rows_per_article[article_codes], 0.0)
+
+
+class Corridors:
+    """
+    The corridors of the curves, per (joint, humeral_motion, unit) and degree of freedom, on a common grid
+
+    Attributes
+    ----------
+    groups : pd.DataFrame
+        The joint, humeral_motion and unit of each corridor, in the order of the first axis
+    grid : np.ndarray
+        The humerothoracic angles of the last axis
+    statistics : dict[str, np.ndarray]
+        The statistics, shape (group, dof, grid): 'mean', 'sd', 'median' and the percentiles, e.g. 'p5', 'p95'
+    n_rows : np.ndarray
+        The number of curves, i.e. shoulders or means of shoulders, at each angle, shape (group, dof, grid)
+    n_articles : np.ndarray
+        The number of articles at each angle, shape (group, dof, grid)
+    legends : np.ndarray
+        The legend of each dof, as reported by the first row of the group, shape (group, dof)
+    weighting : str
+        'shoulder' or 'article'
+    """
+
+    def __init__(
+        self,
+        groups: pd.DataFrame,
+        grid: np.ndarray,
+        statistics: dict[str, np.ndarray],
+        n_rows: np.ndarray,
+        n_articles: np.ndarray,
+        legends: np.ndarray,
+        weighting: str,
+    ):
+        self.groups = groups.reset_index(drop=True)
+        self.grid = grid
+        self.statistics = statistics
+        self.n_rows = n_rows
+        self.n_articles = n_articles
+        self.legends = legends
+        self.weighting = weighting
+
+    def __getitem__(self, statistic: str) -> np.ndarray:
+        return self.statistics[statistic]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns the corridors in a long format, one line per group, dof and angle where there is at least a curve"""
+        group, dof, point = np.nonzero(self.n_rows > 0)
+        df = self.groups.iloc[group].reset_index(drop=True)
+        df["degree_of_freedom"] = np.asarray(DOFS)[dof]
+        df["legend"] = self.legends[group, dof]
+        df["humerothoracic_angle"] = self.grid[point]
+        df["n_rows"] = self.n_rows[group, dof, point]
+        df["n_articles"] = self.n_articles[group, dof, point]
+        for name, statistic in self.statistics.items():
+            df[name] = statistic[group, dof, point]
+        return df
+
+    def __repr__(self) -> str:
+        return (
+            f"Corridors({self.groups.shape[0]} groups, {self.grid.shape[0]} angles, weighting={self.weighting}, "
+            f"statistics={list(self.statistics)})"
+        )
+
+
+def compute_corridors(
+    tensor: CurveTensor,
+    weighting: str = "shoulder",
+    percentiles: tuple[float, ...] = DEFAULT_PERCENTILES,
+    filters: dict = None,
+) -> Corridors:
+    """
+    Compute the corridors of the curves, per (joint, humeral_motion, unit) and degree of freedom
+
+    Parameters
+    ----------
+    tensor: CurveTensor
+        The resampled curves, see CurveTensor.from_confident_data or import_curve_tensor
+    weighting: str
+        'shoulder' (default), every curve has the same weight,
+        or 'article', every article has the same weight at each angle, shared by its curves
+    percentiles: tuple[float, ...]
+        The percentiles of the bands, in [0, 100], the median is always computed
+    filters: dict
+        Only use the rows whose metadata match the filters, e.g. {"in_vivo": True, "posture": "standing"}
+
+    Returns
+    -------
+    Corridors
+        The mean, SD (weighted and unbiased), median and percentiles
+    """
+    if filters:
+        tensor = tensor.filter(filters)
+
+    weights = curve_weights(tensor, weighting)
+    mask = (weights > 0).astype(np.float64)
+    values = tensor.values.reshape(len(tensor), -1)
+    codes, groups = group_rows(tensor)
+    n_groups = groups.shape[0]
+    group_matrix = one_hot(codes, n_groups)
+
+    mean, sd = weighted_mean_and_sd(values, weights, group_matrix)
+    bands = weighted_percentiles(values, weights, (50,) + tuple(percentiles), codes=codes, n_groups=n_groups)
+    statistics = {"mean": mean, "sd": sd, "median": bands[0]}
+    statistics.update({f"p{percentile:g}": band for percentile, band in zip(percentiles, bands[1:])})
+
+    # an article is counted at an angle if one of its rows has a value
+    article_codes, article_groups = group_rows(tensor, CORRIDOR_KEYS + ("article",))
+    has_article = (one_hot(article_codes, article_groups.shape[0]) @ mask > 0).astype(np.float64)
+    group_of_article = np.zeros(article_groups.shape[0], dtype=np.int64)
+    group_of_article[article_codes] = codes
+
+    shape = (n_groups,) + tensor.values.shape[1:]
+    _, first_rows = np.unique(codes, return_index=True)
+    return Corridors(
+        groups=groups,
+        grid=tensor.grid,
+        statistics={name: statistic.reshape(shape) for name, statistic in statistics.items()},
+        n_rows=(group_matrix @ mask).astype(np.int64).reshape(shape),
+        n_articles=(one_hot(group_of_article, n_groups) @ has_article).astype(np.int64).reshape(shape),
+        legends=tensor.legends[first_rows],
+        weighting=weighting,
+    )
@@ -0,0 +1,321 @@
+"""
+This module packs all the raw curves of spartacus/data into a single binary store, spartacus/data/curve_store.npz.
+
+Each csv file of a DataFolder holds one curve, two columns without header: the humerothoracic angle and the dof value.
+Instead of opening and parsing thousands of small files on every load, the curves are stored end to end in one array,
+and indexed by the path of their csv file relative to spartacus/data. The coefficients of the corrections.csv files
+are stored too.
+
+The csv tree remains the source of truth, the store is only a build artifact:
+    - build it with spartacus.build_curve_store(), again whenever the csv files changed,
+    - a curve whose csv file changed since the build, or that is not in the store, is read from its csv file.
+
+The store is memory-mapped, CurveRepository gives read-only views of the curves, without parsing nor copying them.
+"""
+
+import os
+import struct
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+from ..enums import DatasetCSV, DataFolder
+from .dataset_schema import read_dataset_csv
+
+DATA_FOLDER = Path(DataFolder.BEGON_2014.value).parent
+CURVE_STORE = DATA_FOLDER / "curve_store.npz"
+CORRECTION_CSV = "corrections.csv"
+CURVE_DOFS = (
+    "dof_1st_euler",
+    "dof_2nd_euler",
+    "dof_3rd_euler",
+    "dof_translation_x",
+    "dof_translation_y",
+    "dof_translation_z",
+)
+
+
+def curve_key(csv_path: str | Path) -> str:
+    """Returns the key of a curve in the store, i.e. the path of its csv file relative to spartacus/data"""
+    return Path(os.path.relpath(csv_path, DATA_FOLDER)).as_posix()
+
+
+def _file_signature(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _correction_signature(folder_path: Path) -> tuple[int, int]:
+    correction_path = folder_path / CORRECTION_CSV
+    return _file_signature(correction_path) if correction_path.exists() else (-1, -1)
+
+
+def build_curve_store(path: str | Path = None) -> Path:
+    """
+    Pack all the curves of the DataFolders and their manual correction coefficients into a single npz file.
+    The file is not compressed, so that the arrays can be memory-mapped.
+
+    Parameters
+    ----------
+    path: str | Path
+        The path of the store, spartacus/data/curve_store.npz by default
+
+    Returns
+    -------
+    Path
+        The path of the store
+    """
+    path = Path(path or CURVE_STORE)
+
+    keys, curves, integer_abscissa, signatures = [], [], [], []
+    correction_keys, correction_coefficients = [], []
+    folders, correction_signatures = [], []
+
+    for data_folder in DataFolder:
+        folder_path = Path(data_folder.value)
+        folders.append(curve_key(folder_path))
+        correction_signatures.append(_correction_signature(folder_path))
+
+        for csv_path in sorted(folder_path.glob("*.csv")):
+            if csv_path.name == CORRECTION_CSV:
+                correction_df = pd.read_csv(csv_path, sep=",", header=None)
+                # as in RowData.get_manual_corrections, a csv listed several times is not corrected
+                correction_df = correction_df[~correction_df[0].duplicated(keep=False)]
+                for csv, coefficient in zip(correction_df[0], correction_df[1]):
+                    correction_keys.append(curve_key(folder_path / csv))
+                    correction_coefficients.append(coefficient)
+                continue
+
+            # parsed as in load_csv, so that the values are exactly the same
+            df = pd.read_csv(csv_path, sep=",", header=None)
+            keys.append(curve_key(csv_path))
+            curves.append(df.to_numpy(dtype=np.float64))
+            integer_abscissa.append(pd.api.types.is_integer_dtype(df[0]))
+            signatures.append(_file_signature(csv_path))
+
+    lengths = np.array([curve.shape[0] for curve in curves], dtype=np.int64)
+    np.savez(
+        path,
+        keys=np.array(keys),
+        offsets=np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64),
+        lengths=lengths,
+        curves=np.concatenate(curves, axis=0) if curves else np.empty((0, 2)),
+        integer_abscissa=np.array(integer_abscissa, dtype=bool),
+        signatures=np.array(signatures, dtype=np.int64).reshape(-1, 2),
+        correction_keys=np.array(correction_keys, dtype=str),
+        correction_coefficients=np.array(correction_coefficients, dtype=np.float64),
+        folders=np.array(folders),
+        correction_signatures=np.array(correction_signatures, dtype=np.int64).reshape(-1, 2),
+    )
+    get_curve_store.cache_clear()
+    return path
+
+
+def memmap_npz_member(path: str | Path, name: str) -> np.memmap:
+    """
+    Memory-map, read-only, an array stored without compression in a npz file.
+    np.load ignores mmap_mode for npz files, so the .npy member is located in the zip archive and mapped directly.
+
+    Parameters
+    ----------
+    path: str | Path
+        The path of the npz file
+    name: str
+        The name of the array in the npz file
+
+    Returns
+    -------
+    np.memmap
+        The read-only array
+    """
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(f"{name}.npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"{name} is compressed in {path}, it cannot be memory-mapped.")
+
+    with open(path, "rb") as f:
+        # the local header of a zip member is 30 bytes long, followed by the file name and an extra field
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape, order="F" if fortran_order else "C")
+
+
+class CurveStore:
+    """
+    The curves of the store, indexed by the path of their csv file relative to spartacus/data
+
+    Attributes
+    ----------
+    index: dict[str, int]
+        The position of each curve in the store
+    offsets: np.ndarray
+        The first line of each curve in curves
+    lengths: np.ndarray
+        The number of lines of each curve
+    curves: np.ndarray
+        All the curves end to end, (humerothoracic angle, value), shape (N, 2)
+    integer_abscissa: np.ndarray
+        If the humerothoracic angles of the csv file were parsed as integers
+    corrections: dict[str, float]
+        The manual correction coefficient of the curves listed in a corrections.csv
+    stale: set[str]
+        The curves whose csv file changed or disappeared since the build
+    folders_with_valid_corrections: set[str]
+        The folders whose corrections.csv did not change since the build
+    """
+
+    def __init__(self, path: str | Path = None, mmap_mode: Literal["r"] | None = None):
+        """
+        Parameters
+        ----------
+        path: str | Path
+            The path of the store, spartacus/data/curve_store.npz by default
+        mmap_mode: str
+            If 'r', the curves are memory-mapped read-only instead of being read in memory,
+            get_curve then returns views of the file that the processes share through the page cache.
+        """
+        path = Path(path or CURVE_STORE)
+        with np.load(path) as npz:
+            keys = npz["keys"].tolist()
+            self.offsets = npz["offsets"]
+            self.lengths = npz["lengths"]
+            self.curves = memmap_npz_member(path, "curves") if mmap_mode == "r" else npz["curves"]
+            self.integer_abscissa = npz["integer_abscissa"]
+            signatures = npz["signatures"]
+            self.corrections = dict(zip(npz["correction_keys"].tolist(), npz["correction_coefficients"].tolist()))
+            folders = npz["folders"].tolist()
+            correction_signatures = npz["correction_signatures"]
+
+        self.index = {key: i for i, key in enumerate(keys)}
+        self.stale = set()
+        for key, signature in zip(keys, signatures):
+            csv_path = DATA_FOLDER / key
+            if not csv_path.exists() or _file_signature(csv_path) != tuple(signature):
+                self.stale.add(key)
+        self.folders_with_valid_corrections = {
+            folder
+            for folder, signature in zip(folders, correction_signatures)
+            if _correction_signature(DATA_FOLDER / folder) == tuple(signature)
+        }
+
+    def __contains__(self, csv_path: str | Path) -> bool:
+        key = curve_key(csv_path)
+        return key in self.index and key not in self.stale
+
+    def get_curve(self, csv_path: str | Path) -> np.ndarray:
+        """Returns the curve of a csv file, (humerothoracic angle, value), shape (N, 2), a view without copy"""
+        i = self.index[curve_key(csv_path)]
+        return self.curves[self.offsets[i] : self.offsets[i] + self.lengths[i]]
+
+    def get_dataframe(self, csv_path: str | Path, columns: list[str]) -> pd.DataFrame:
+        """Returns the curve of a csv file as load_csv would read it"""
+        i = self.index[curve_key(csv_path)]
+        df = pd.DataFrame(self.get_curve(csv_path).copy(), columns=columns)
+        if self.integer_abscissa[i]:
+            df[columns[0]] = df[columns[0]].astype(np.int64)
+        return df
+
+    def has_corrections(self, folder_path: str | Path) -> bool:
+        """Returns True if the corrections.csv of the folder did not change since the build"""
+        return curve_key(folder_path) in self.folders_with_valid_corrections
+
+    def get_correction(self, csv_path: str | Path) -> float | None:
+        """Returns the manual correction coefficient of a csv file, None if it has none"""
+        return self.corrections.get(curve_key(csv_path))
+
+
+@lru_cache(maxsize=1)
+def get_curve_store() -> CurveStore | None:
+    """Returns the memory-mapped curve store of spartacus/data, None if it has not been built"""
+    if not CURVE_STORE.exists():
+        return None
+    return CurveStore(CURVE_STORE, mmap_mode="r")
+
+
+class CurveRepository:
+    """
+    Read-only access to the raw curves, addressed by the same keys as dataset_clean_of_joint_data.csv:
+    (dataset_authors, joint, humeral_motion, shoulder_id, dof), where dof is one of the dof columns, e.g. dof_1st_euler.
+
+    The curves are memory-mapped views of the curve store, so repeated passes over the curves cost no parsing
+    and no copy, and several processes reading the same store share the page cache.
+
+    Examples
+    --------
+    >>> repository = CurveRepository()
+    >>> curve = repository["Begon et al.", "glenohumeral", "frontal plane elevation", 1, "dof_1st_euler"]
+    >>> humerothoracic_angle, value = curve[:, 0], curve[:, 1]
+    """
+
+    def __init__(self, curve_store: CurveStore = None, joint_data: pd.DataFrame = None):
+        """
+        Parameters
+        ----------
+        curve_store: CurveStore
+            The store to read the curves from, the memory-mapped store of spartacus/data by default
+        joint_data: pd.DataFrame
+            The joint data giving the csv file of each curve, dataset_clean_of_joint_data.csv by default
+        """
+        if curve_store is None:
+            curve_store = get_curve_store()
+        if curve_store is None:
+            raise FileNotFoundError("The curve store has not been built yet, run spartacus.build_curve_store().")
+        self.curve_store = curve_store
+
+        joint_data = read_dataset_csv(DatasetCSV.JOINT) if joint_data is None else joint_data
+        self._csv_paths = {}
+        for row in joint_data.itertuples(index=False):
+            folder_path = DataFolder.from_string(row.folder).value
+            for dof in CURVE_DOFS:
+                csv = getattr(row, dof)
+                if not isinstance(csv, str):
+                    continue
+                key = self._key(row.dataset_authors, row.joint, row.humeral_motion, row.shoulder_id, dof)
+                self._csv_paths.setdefault(key, []).append(os.path.join(folder_path, csv))
+
+    @staticmethod
+    def _key(dataset_authors: str, joint: str, humeral_motion: str, shoulder_id: int | None, dof: str) -> tuple:
+        # some shoulders have no id, NaN never equals itself, so it cannot be part of a key
+        shoulder_id = None if shoulder_id is None or shoulder_id != shoulder_id else shoulder_id
+        return dataset_authors, joint, humeral_motion, shoulder_id, dof
+
+    def keys(self) -> list[tuple]:
+        """Returns all the keys (dataset_authors, joint, humeral_motion, shoulder_id, dof)"""
+        return list(self._csv_paths.keys())
+
+    def __len__(self) -> int:
+        return len(self._csv_paths)
+
+    def __contains__(self, key: tuple) -> bool:
+        return self._key(*key) in self._csv_paths
+
+    def get_all(self, key: tuple) -> list[np.ndarray]:
+        """Returns the views of all the curves of a key, some datasets have several curves for the same key"""
+        return [self._get_curve(csv_path) for csv_path in self._csv_paths[self._key(*key)]]
+
+    def __getitem__(self, key: tuple) -> np.ndarray:
+        """Returns the read-only view of the curve, (humerothoracic angle, value), shape (N, 2)"""
+        csv_paths = self._csv_paths[self._key(*key)]
+        if len(csv_paths) > 1:
+            raise KeyError(f"{key} refers to {len(csv_paths)} curves, use get_all() to get all of them.")
+        return self._get_curve(csv_paths[0])
+
+    def _get_curve(self, csv_path: str) -> np.ndarray:
+        if csv_path in self.curve_store:
+            return self.curve_store.get_curve(csv_path)
+        # the csv file changed since the store was built, it remains the source of truth
+        return pd.read_csv(csv_path, sep=",", header=None).to_numpy(dtype=np.float64)
@@ -0,0 +1,254 @@
+"""
+This module resamples the corrected curves on a common humerothoracic angle grid.
+
+Each row of the dataset, i.e. an article, a joint, a humeral motion, a shoulder and a unit, has three curves,
+one per degree of freedom, each reported on its own humerothoracic angles.
+They are all interpolated on the same grid, and stacked in a dense tensor of shape (row, dof, grid),
+with nan values outside the humerothoracic angles reported for each curve, so that the statistics across rows
+are array reductions, e.g. np.nanmean(tensor.values, axis=0), instead of groupby loops over the articles.
+
+The linear interpolation of all the curves is a single np.interp call.
+The 'pchip' and 'spline' interpolations of scipy are computed curve by curve.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import CubicSpline, PchipInterpolator
+
+from .columnar import filters_to_mask
+
+ROW_KEYS = ("article", "joint", "humeral_motion", "shoulder_id", "unit")
+# the columns that vary along a curve, the other columns are constant per row
+CURVE_COLUMNS = ("humerothoracic_angle", "value", "legend", "degree_of_freedom")
+DOFS = (1, 2, 3)
+INTERPOLATION_METHODS = ("linear", "pchip", "spline")
+
+
+def default_grid(humerothoracic_angles: np.ndarray, step: float = 1.0) -> np.ndarray:
+    """Returns the grid covering all the humerothoracic angles, every step degrees, on multiples of step"""
+    humerothoracic_angles = np.asarray(humerothoracic_angles, dtype=np.float64)
+    start = np.floor(np.nanmin(humerothoracic_angles) / step) * step
+    stop = np.ceil(np.nanmax(humerothoracic_angles) / step) * step
+    return start + step * np.arange(int(round((stop - start) / step)) + 1)
+
+
+def resample_curves(
+    curve_index: np.ndarray,
+    abscissas: np.ndarray,
+    values: np.ndarray,
+    n_curves: int,
+    grid: np.ndarray,
+    method: str = "linear",
+) -> np.ndarray:
+    """
+    Interpolate a batch of curves of different lengths on the same grid
+
+    Parameters
+    ----------
+    curve_index: np.ndarray
+        The curve of each sample, in [0, n_curves), shape (N,)
+    abscissas: np.ndarray
+        The humerothoracic angle of each sample, shape (N,), the samples of a curve do not need to be sorted
+    values: np.ndarray
+        The value of each sample, shape (N,)
+    n_curves: int
+        The number of curves
+    grid: np.ndarray
+        The humerothoracic angles to interpolate on, sorted, shape (G,)
+    method: str
+        'linear' (default), 'pchip' or 'spline' (cubic), the last two are computed with scipy
+
+    Returns
+    -------
+    np.ndarray
+        The curves on the grid, shape (n_curves, G), nan outside the humerothoracic angles of each curve
+    """
+    if method not in INTERPOLATION_METHODS:
+        raise ValueError(f"{method} is not a valid interpolation method, must be one of {INTERPOLATION_METHODS}.")
+
+    curve_index = np.asarray(curve_index, dtype=np.int64)
+    abscissas = np.asarray(abscissas, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    grid = np.asarray(grid, dtype=np.float64)
+
+    complete = ~(np.isnan(abscissas) | np.isnan(values))
+    curve_index, abscissas, values = curve_index[complete], abscissas[complete], values[complete]
+
+    # sorted by curve then by angle, a repeated angle of a curve keeps its first value
+    order = np.lexsort((abscissas, curve_index))
+    curve_index, abscissas, values = curve_index[order], abscissas[order], values[order]
+    kept = np.ones(curve_index.shape[0], dtype=bool)
+    kept[1:] = (np.diff(curve_index) != 0) | (np.diff(abscissas) != 0)
+    curve_index, abscissas, values = curve_index[kept], abscissas[kept], values[kept]
+
+    resampled = np.full((n_curves, grid.shape[0]), np.nan)
+    if curve_index.shape[0] == 0 or grid.shape[0] == 0:
+        return resampled
+
+    curves = np.arange(n_curves)
+    starts = np.searchsorted(curve_index, curves, side="left")
+    stops = np.searchsorted(curve_index, curves, side="right")
+    has_samples = stops > starts
+    lower = np.where(has_samples, abscissas[np.minimum(starts, abscissas.shape[0] - 1)], np.inf)
+    upper = np.where(has_samples, abscissas[np.maximum(stops - 1, 0)], -np.inf)
+    inside = (grid >= lower[:, np.newaxis]) & (grid <= upper[:, np.newaxis])
+
+    # each curve is shifted by more than the span of the angles, so all the curves are interpolated in one call
+    span = max(abscissas.max(), grid.max()) - min(abscissas.min(), grid.min()) + 1.0
+    shifted_grid = grid + span * curves[:, np.newaxis]
+    interpolated = np.interp(shifted_grid.ravel(), abscissas + span * curve_index, values)
+    resampled[inside] = interpolated.reshape(resampled.shape)[inside]
+
+    if method != "linear":
+        interpolator = PchipInterpolator if method == "pchip" else CubicSpline
+        # a curve of a single point stays as it is
+        for curve in np.flatnonzero(stops - starts >= 2):
+            samples = slice(starts[curve], stops[curve])
+            resampled[curve, inside[curve]] = interpolator(abscissas[samples], values[samples])(grid[inside[curve]])
+
+    return resampled
+
+
+class CurveTensor:
+    """
+    The curves of the dataset resampled on a common humerothoracic angle grid
+
+    Attributes
+    ----------
+    values : np.ndarray
+        The curves, shape (row, dof, grid), nan outside the humerothoracic angles reported for each curve
+    rows : pd.DataFrame
+        The metadata of each row, in the order of the first axis, the columns of the confident data
+        that are constant along a curve, e.g. article, joint, humeral_motion, shoulder_id, unit, in_vivo, ...
+    grid : np.ndarray
+        The humerothoracic angles of the last axis, shape (grid,)
+    legends : np.ndarray
+        The legend of each curve, shape (row, dof), None if the row does not report the dof
+    method : str
+        The interpolation method used, 'linear', 'pchip' or 'spline'
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        rows: pd.DataFrame,
+        grid: np.ndarray,
+        legends: np.ndarray = None,
+        method: str = "linear",
+    ):
+        self.values = np.asarray(values, dtype=np.float64)
+        self.rows = rows.reset_index(drop=True)
+        self.grid = np.asarray(grid, dtype=np.float64)
+        self.legends = np.full(self.values.shape[:2], None, dtype=object) if legends is None else legends
+        self.method = method
+
+        if self.values.shape != (self.rows.shape[0], len(DOFS), self.grid.shape[0]):
+            raise ValueError(
+                f"The values have shape {self.values.shape}, expected (row, dof, grid) = "
+                f"{(self.rows.shape[0], len(DOFS), self.grid.shape[0])}."
+            )
+
+    @classmethod
+    def from_confident_data(
+        cls,
+        df: pd.DataFrame,
+        grid: np.ndarray = None,
+        step: float = 1.0,
+        method: str = "linear",
+    ) -> "CurveTensor":
+        """
+        Resample the confident data, one dof per line, on a common grid
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            The confident data, e.g. Spartacus.corrected_confident_data_values or import_data()
+        grid: np.ndarray
+            The humerothoracic angles to resample on, in degrees, by default every step degrees over all the data
+        step: float
+            The step of the default grid, in degrees
+        method: str
+            'linear' (default), 'pchip' or 'spline' (cubic), the last two are computed with scipy
+
+        Returns
+        -------
+        CurveTensor
+            The resampled curves, one row per (article, joint, humeral_motion, shoulder_id, unit)
+        """
+        missing_columns = [column for column in ROW_KEYS + CURVE_COLUMNS if column not in df.columns]
+        if missing_columns:
+            raise ValueError(f"The dataframe misses the columns {missing_columns}.")
+
+        grid = default_grid(df["humerothoracic_angle"], step) if grid is None else np.asarray(grid, dtype=np.float64)
+        if np.any(np.diff(grid) <= 0):
+            raise ValueError("The grid must be strictly increasing.")
+
+        # the shoulder_id is nan for some articles, they are still rows
+        row_index = df.groupby(list(ROW_KEYS), dropna=False, sort=False, observed=True).ngroup().to_numpy()
+        dof_index = df["degree_of_freedom"].to_numpy().astype(np.int64) - DOFS[0]
+        n_rows = int(row_index.max()) + 1 if row_index.shape[0] else 0
+
+        curves = resample_curves(
+            curve_index=row_index * len(DOFS) + dof_index,
+            abscissas=df["humerothoracic_angle"].to_numpy(dtype=np.float64),
+            values=df["value"].to_numpy(dtype=np.float64),
+            n_curves=n_rows * len(DOFS),
+            grid=grid,
+            method=method,
+        )
+
+        # ngroup numbers the rows in the order of their first line
+        _, first_lines = np.unique(row_index, return_index=True)
+        metadata_columns = [column for column in df.columns if column not in CURVE_COLUMNS]
+        rows = df.iloc[first_lines][metadata_columns]
+
+        legends = np.full((n_rows, len(DOFS)), None, dtype=object)
+        curve_lines = pd.Series(row_index * len(DOFS) + dof_index).drop_duplicates()
+        legends.reshape(-1)[curve_lines.to_numpy()] = df["legend"].to_numpy(dtype=object)[curve_lines.index]
+
+        return cls(curves.reshape(n_rows, len(DOFS), grid.shape[0]), rows, grid, legends=legends, method=method)
+
+    @property
+    def mask(self) -> np.ndarray:
+        """True where a curve has a value, shape (row, dof, grid)"""
+        return ~np.isnan(self.values)
+
+    @property
+    def index(self) -> pd.MultiIndex:
+        """The keys of the rows, article, joint, humeral_motion, shoulder_id, unit"""
+        return pd.MultiIndex.from_frame(self.rows[list(ROW_KEYS)])
+
+    def select(self, mask: np.ndarray | pd.Series) -> "CurveTensor":
+        """Returns the rows where the mask is True, the mask is indexed as the rows"""
+        mask = np.asarray(mask, dtype=bool)
+        return CurveTensor(
+            self.values[mask], self.rows[mask], self.grid, legends=self.legends[mask], method=self.method
+        )
+
+    def filter(self, filters: dict) -> "CurveTensor":
+        """
+        Returns the rows whose metadata match all the filters, e.g. {"in_vivo": True, "joint": ["glenohumeral"]},
+        as in import_data
+        """
+        return self.select(filters_to_mask(self.rows, filters))
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns the resampled curves in the long format of the confident data, without the missing values"""
+        row, dof, point = np.nonzero(self.mask)
+        df = self.rows.iloc[row].reset_index(drop=True)
+        df["humerothoracic_angle"] = self.grid[point]
+        df["value"] = self.values[row, dof, point]
+        df["legend"] = self.legends[row, dof]
+        df["degree_of_freedom"] = np.asarray(DOFS)[dof]
+        return df
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __repr__(self) -> str:
+        return (
+            f"CurveTensor({self.values.shape[0]} rows, {len(DOFS)} dofs, {self.grid.shape[0]} angles "
+            f"in [{self.grid[0]:g}, {self.grid[-1]:g}], method={self.method})"
+            if self.grid.shape[0]
+            else f"CurveTensor({self.values.shape[0]} rows, empty grid)"
+        )
@@ -0,0 +1,132 @@
+"""
+This module declares the columns of the dataset csv files and their types, so they are read in one pass.
+
+The csv files are read with these dtypes instead of letting pandas infer them, a column that is added, removed or
+renamed in a csv file without updating its schema raises an error instead of silently changing the types.
+The datasets and the joint data are filtered with these types, then converted once with to_python_objects when
+Spartacus is built: the text columns are stored as objects with None for missing cells, as expected by the rest of
+the package (e.g. axis is None checks), the numeric columns keep their dtype and their missing values stay NaN.
+"""
+
+import pandas as pd
+
+from ..enums import DatasetCSV
+
+TEXT = "string"
+CATEGORY = "category"
+BOOLEAN = "bool"
+NULLABLE_BOOLEAN = "boolean"
+INTEGER = "int64"
+FLOAT = "float64"
+
+# the axes are free text, the other segment columns only take a few values
+SEGMENT_COLUMNS_SCHEMA = {
+    f"{segment}_{column}": TEXT if column in ("x_direction", "y_direction", "z_direction") else CATEGORY
+    for segment in ("thorax", "humerus", "clavicle", "scapula")
+    for column in ("correction_method", "origin", "x_direction", "y_direction", "z_direction")
+}
+
+DATASETS_SCHEMA = {
+    "dataset_id": TEXT,
+    "dataset_authors": TEXT,
+    "dataset_year": INTEGER,
+    "dataset_doi": TEXT,
+    "in_vivo": BOOLEAN,
+    "experimental_mean": CATEGORY,
+    "number_of_shoulders": INTEGER,
+    "type_of_movement": CATEGORY,
+    "active": BOOLEAN,
+    "posture": CATEGORY,
+    "thorax_is_global": BOOLEAN,
+    **SEGMENT_COLUMNS_SCHEMA,
+    "side_as_right": BOOLEAN,
+}
+
+JOINT_SCHEMA = {
+    "dataset_id": TEXT,
+    "dataset_authors": TEXT,
+    "humeral_motion": CATEGORY,
+    "thoracohumeral_sequence": CATEGORY,
+    "thoracohumeral_angle": CATEGORY,
+    "joint": CATEGORY,
+    "parent": CATEGORY,
+    "child": CATEGORY,
+    "euler_sequence": CATEGORY,
+    "rotation_absolute": BOOLEAN,
+    "origin_displacement": CATEGORY,
+    "displacement_cs": CATEGORY,
+    "displacement_absolute": NULLABLE_BOOLEAN,
+    "is_data_mean": BOOLEAN,
+    "shoulder_id": FLOAT,
+    "side": CATEGORY,
+    "source_extraction": CATEGORY,
+    "folder": CATEGORY,
+    "dof_1st_euler": TEXT,
+    "dof_2nd_euler": TEXT,
+    "dof_3rd_euler": TEXT,
+    "dof_translation_x": TEXT,
+    "dof_translation_y": TEXT,
+    "dof_translation_z": TEXT,
+}
+
+BIOMECH_DIRECTIONS_SCHEMA = {
+    "dataset_id": TEXT,
+    "dataset_authors": TEXT,
+    **{
+        f"{segment}_{column}": (NULLABLE_BOOLEAN if column == "is_isb" else CATEGORY)
+        for segment in ("thorax", "humerus", "clavicle", "scapula")
+        for column in ("is_isb", "x_sense", "y_sense", "z_sense")
+    },
+}
+
+SCHEMAS = {
+    DatasetCSV.DATASETS: DATASETS_SCHEMA,
+    DatasetCSV.JOINT: JOINT_SCHEMA,
+    DatasetCSV.BIOMECH_DIRECTIONS: BIOMECH_DIRECTIONS_SCHEMA,
+}
+
+
+def read_dataset_csv(dataset_csv: DatasetCSV) -> pd.DataFrame:
+    """
+    Read a dataset csv file with the dtypes of its schema
+
+    Parameters
+    ----------
+    dataset_csv: DatasetCSV
+        The csv file to read
+
+    Returns
+    -------
+    pd.DataFrame
+        The csv file with typed columns, text columns are nullable strings or categories
+    """
+    schema = SCHEMAS[dataset_csv]
+    # the dtypes of the columns missing from the file are ignored by read_csv, the columns are checked after one read
+    df = pd.read_csv(dataset_csv.value, dtype=schema)
+    columns = df.columns.tolist()
+    if columns != list(schema):
+        missing = [column for column in schema if column not in columns]
+        unexpected = [column for column in columns if column not in schema]
+        raise ValueError(
+            f"The columns of {dataset_csv.value} do not match its schema, "
+            f"missing: {missing}, unexpected: {unexpected}, or the order changed. Update dataset_schema.py."
+        )
+
+    return df
+
+
+def to_python_objects(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the dataframe with its text, categorical and nullable boolean columns as objects, None for missing cells.
+    Numeric and boolean columns are kept as they are, their missing values stay NaN.
+    It is done in one pass, without copying the columns that are kept.
+    """
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        if pd.api.types.is_numeric_dtype(values) and not isinstance(values.dtype, pd.BooleanDtype):
+            columns[column] = values
+            continue
+        # an explicit object dtype, pandas would infer the str dtype again from the python strings
+        columns[column] = pd.Series(values.to_numpy(dtype=object, na_value=None), index=df.index, dtype=object)
+    return pd.DataFrame(columns, index=df.index, copy=False)
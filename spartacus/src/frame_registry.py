@@ -0,0 +1,105 @@
+"""
+This module compiles the frames of the datasets once per process.
+
+Parsing an axis definition such as vec(T10>PX)^vec((T10+PX)/2>(IJ+T1)/2), computing its landmark vectors,
+identifying its biomechanical axes and its compliance is always the same work for the same definition.
+There are only a few distinct definitions in the datasets, so each one is compiled once, on first use,
+and the compiled frame is shared by all the rows, joints and compliance reports that use it.
+The compiled frames must thus be considered as read-only.
+"""
+
+from functools import lru_cache
+
+from .biomech_system import BiomechCoordinateSystem
+from .compliance import SegmentCompliance
+from .enums_biomech import Segment
+from .frame_reader import Frame
+
+
+class CompiledFrame:
+    """
+    A frame parsed once, with its biomechanical coordinate system, its compliance and its rotation matrix
+
+    Attributes
+    ----------
+    biomech_sys : BiomechCoordinateSystem
+        The biomechanical coordinate system of the frame
+    compliance : SegmentCompliance
+        The compliance of the frame with the ISB recommendations, c1, c2 and c3 are evaluated once
+    """
+
+    def __init__(self, biomech_sys: BiomechCoordinateSystem):
+        self.biomech_sys = biomech_sys
+        self.compliance = SegmentCompliance(bsys=biomech_sys)
+
+    @property
+    def frame(self) -> Frame:
+        return self.biomech_sys.frame
+
+    @property
+    def rotation_matrix(self):
+        """The rotation matrix to the ISB frame, None if the frame only defines an origin"""
+        if self.biomech_sys.anterior_posterior_axis is None:
+            return None
+        return self.biomech_sys.get_rotation_matrix()
+
+
+@lru_cache(maxsize=None)
+def compile_frame(
+    segment: Segment,
+    x_axis: str,
+    y_axis: str,
+    z_axis: str,
+    origin: str,
+    side: str,
+    thorax_is_global: bool = False,
+    allow_only_translation: bool = False,
+) -> CompiledFrame:
+    """
+    Returns the compiled frame of a definition, it is only parsed the first time it is requested
+
+    Parameters
+    ----------
+    segment: Segment
+        The segment of the frame
+    x_axis: str
+        The definition of the x axis, e.g. vec(T10>PX)^vec((T10+PX)/2>(IJ+T1)/2)
+    y_axis: str
+        The definition of the y axis
+    z_axis: str
+        The definition of the z axis
+    origin: str
+        The origin of the frame
+    side: str
+        The side of the arm, 'right' or 'left'
+    thorax_is_global: bool
+        If True, the axes are read as global axes, as done for the thorax of some datasets
+    allow_only_translation: bool
+        If True, a frame that only defines an origin, e.g. Nishinaka, gets a coordinate system without axes
+
+    Returns
+    -------
+    CompiledFrame
+        The compiled frame, shared by all the callers with the same definition
+    """
+    method = Frame.from_global_thorax_strings if thorax_is_global else Frame.from_xyz_string
+    frame = method(x_axis=x_axis, y_axis=y_axis, z_axis=z_axis, origin=origin, segment=segment, side=side)
+
+    if allow_only_translation and frame.only_translation:
+        biomech_sys = BiomechCoordinateSystem(
+            antero_posterior_axis=None,
+            infero_superior_axis=None,
+            medio_lateral_axis=None,
+            origin=frame.origin,
+            segment=segment,
+            frame=frame,
+        )
+    else:
+        biomech_sys = BiomechCoordinateSystem.from_frame(frame)
+
+    return CompiledFrame(biomech_sys)
+
+
+def clear_frame_registry():
+    """Forget all the compiled frames, e.g. after editing the landmarks of biomech_constant"""
+    compile_frame.cache_clear()
@@ -0,0 +1,318 @@
+"""
+This module decomposes the resampled curves of each (joint, humeral_motion, unit) on a few principal components,
+i.e. a functional PCA of the three degrees of freedom on the common humerothoracic angle grid.
+
+A curve is then its scores, a handful of numbers, and the basis of its group: the mean curve and the components.
+The scores summarize the database, e.g. to compare the shoulders, and the curves are reconstructed from them,
+a new curve is projected on the basis with a dot product.
+
+The curves do not cover the same angles. Each group only keeps the angles covered by enough of its curves,
+and the missing values of these angles are imputed iteratively by the low-rank reconstruction (EM-PCA).
+The groups are padded with empty rows to a single array, so that each iteration is one batched eigendecomposition of
+the small (row, row) Gram matrices of all the groups, and a single batched SVD gives the final components.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .corridors import CORRIDOR_KEYS, group_rows
+from .curve_tensor import CurveTensor
+
+
+def _svd_flip(u: np.ndarray, vt: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Flip the signs of the components so that their largest loading is positive, the decomposition is deterministic"""
+    largest = np.take_along_axis(vt, np.abs(vt).argmax(axis=2)[:, :, np.newaxis], axis=2)
+    signs = np.where(largest < 0, -1.0, 1.0)
+    return u * np.swapaxes(signs, 1, 2), vt * signs
+
+
+def _low_rank(values: np.ndarray, in_rank: np.ndarray) -> np.ndarray:
+    """
+    The best approximation of each matrix of the batch by the given number of components, from the eigenvectors of
+    the small (row, row) Gram matrices, cheaper than the SVD of the (row, column) matrices at each imputation iteration
+
+    Parameters
+    ----------
+    values: np.ndarray
+        The matrices, shape (batch, row, column)
+    in_rank: np.ndarray
+        True for the components kept by each matrix, shape (batch, component)
+
+    Returns
+    -------
+    np.ndarray
+        The low-rank matrices, shape (batch, row, column)
+    """
+    n_components = min(in_rank.shape[1], values.shape[1])
+    _, eigenvectors = np.linalg.eigh(values @ np.swapaxes(values, 1, 2))
+    # the eigenvalues are ascending, the projection on the leading eigenvectors is the truncated SVD
+    u = eigenvectors[:, :, ::-1][:, :, :n_components] * in_rank[:, np.newaxis, :n_components]
+    return u @ (np.swapaxes(u, 1, 2) @ values)
+
+
+class FunctionalPCA:
+    """
+    The principal components of the curves, per (joint, humeral_motion, unit), on a common grid
+
+    Attributes
+    ----------
+    groups : pd.DataFrame
+        The joint, humeral_motion and unit of each decomposition, in the order of the first axis
+    grid : np.ndarray
+        The humerothoracic angles of the last axis
+    means : np.ndarray
+        The mean curve of each group, nan at the angles not kept, shape (group, dof, grid)
+    components : np.ndarray
+        The orthonormal components of each group, nan at the angles not kept and for the components the group does not
+        have, shape (group, component, dof, grid)
+    explained_variance : np.ndarray
+        The variance of the scores of each component, shape (group, component)
+    explained_variance_ratio : np.ndarray
+        The fraction of the variance of the group explained by each component, shape (group, component)
+    rows : pd.DataFrame
+        The metadata of the curves, as in the CurveTensor
+    codes : np.ndarray
+        The group of each curve, shape (row,)
+    scores : np.ndarray
+        The scores of each curve on the components of its group, shape (row, component)
+    coverage : np.ndarray
+        The fraction of the kept angles of its group where each curve has values, the other are imputed, shape (row,)
+    """
+
+    def __init__(
+        self,
+        groups: pd.DataFrame,
+        grid: np.ndarray,
+        means: np.ndarray,
+        components: np.ndarray,
+        explained_variance: np.ndarray,
+        explained_variance_ratio: np.ndarray,
+        rows: pd.DataFrame,
+        codes: np.ndarray,
+        scores: np.ndarray,
+        coverage: np.ndarray,
+    ):
+        self.groups = groups.reset_index(drop=True)
+        self.grid = grid
+        self.means = means
+        self.components = components
+        self.explained_variance = explained_variance
+        self.explained_variance_ratio = explained_variance_ratio
+        self.rows = rows.reset_index(drop=True)
+        self.codes = codes
+        self.scores = scores
+        self.coverage = coverage
+
+    @property
+    def n_components(self) -> int:
+        return self.components.shape[1]
+
+    def group_index(self, joint: str, humeral_motion: str, unit: str = "rad") -> int:
+        """Returns the index of the group of the first axis of the basis"""
+        matches = np.flatnonzero(
+            (self.groups["joint"] == joint)
+            & (self.groups["humeral_motion"] == humeral_motion)
+            & (self.groups["unit"] == unit)
+        )
+        if not matches.size:
+            raise ValueError(f"There is no decomposition of the {joint} in {humeral_motion} in {unit}.")
+        return int(matches[0])
+
+    def reconstruct(self, n_components: int = None) -> np.ndarray:
+        """
+        Reconstruct the curves from their scores
+
+        Parameters
+        ----------
+        n_components: int
+            The number of components used, all by default
+
+        Returns
+        -------
+        np.ndarray
+            The low-rank curves, nan at the angles not kept by their group, shape (row, dof, grid)
+        """
+        n_components = self.n_components if n_components is None else n_components
+        components = np.nan_to_num(self.components[self.codes, :n_components])
+        scores = np.nan_to_num(self.scores[:, :n_components])
+        return self.means[self.codes] + np.einsum("rk,rkdg->rdg", scores, components)
+
+    def project(self, values: np.ndarray, group: int) -> np.ndarray:
+        """
+        Compute the scores of new curves on the components of a group
+
+        Parameters
+        ----------
+        values: np.ndarray
+            The curves, resampled on the grid, e.g. with resample_curves, shape (dof, grid) or (curve, dof, grid).
+            A dot product with the components if the curves have values at all the kept angles,
+            a least squares fit on the angles they have otherwise.
+        group: int
+            The group of the basis, see group_index
+
+        Returns
+        -------
+        np.ndarray
+            The scores, nan for the components the group does not have, shape (component,) or (curve, component)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        single = values.ndim == 2
+        values = values.reshape(1 if single else values.shape[0], -1)
+
+        mean = self.means[group].ravel()
+        kept = ~np.isnan(mean)
+        has_component = ~np.isnan(self.components[group]).all(axis=(1, 2))
+        basis = self.components[group][has_component].reshape(int(has_component.sum()), -1)[:, kept]
+        deviations = values[:, kept] - mean[kept]
+
+        scores = np.full((values.shape[0], self.n_components), np.nan)
+        complete = ~np.isnan(deviations).any(axis=1)
+        scores[np.ix_(complete, has_component)] = deviations[complete] @ basis.T
+        for curve in np.flatnonzero(~complete):
+            observed = ~np.isnan(deviations[curve])
+            if observed.any():
+                scores[curve, has_component] = np.linalg.lstsq(
+                    basis[:, observed].T, deviations[curve, observed], rcond=None
+                )[0]
+        return scores[0] if single else scores
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns the scores of the curves, one line per curve with its metadata, its coverage and pc1, pc2, ..."""
+        df = self.rows.copy()
+        df["coverage"] = self.coverage
+        for component in range(self.n_components):
+            df[f"pc{component + 1}"] = self.scores[:, component]
+        return df
+
+    def __len__(self) -> int:
+        return self.rows.shape[0]
+
+    def __repr__(self) -> str:
+        return (
+            f"FunctionalPCA({self.groups.shape[0]} groups, {len(self)} curves, {self.n_components} components, "
+            f"{self.grid.shape[0]} angles)"
+        )
+
+
+def fit_functional_pca(
+    tensor: CurveTensor,
+    n_components: int = 5,
+    min_coverage: float = 0.5,
+    max_iterations: int = 100,
+    tolerance: float = 1e-3,
+    filters: dict = None,
+) -> FunctionalPCA:
+    """
+    Fit the principal components of the curves, per (joint, humeral_motion, unit), the three dofs together
+
+    Parameters
+    ----------
+    tensor: CurveTensor
+        The resampled curves, see CurveTensor.from_confident_data or import_curve_tensor
+    n_components: int
+        The number of components, a group has at most as many components as curves minus one
+    min_coverage: float
+        The angles of a group where less than this fraction of its curves have values are not kept
+    max_iterations: int
+        The maximum number of iterations of the imputation of the missing values
+    tolerance: float
+        The imputation stops when the imputed values change less than this fraction of the norm of the data
+    filters: dict
+        Only use the rows whose metadata match the filters, e.g. {"in_vivo": True}
+
+    Returns
+    -------
+    FunctionalPCA
+        The basis of each group and the scores of each curve
+    """
+    if not 0 < min_coverage <= 1:
+        raise ValueError(f"The minimum coverage must be in ]0, 1], got {min_coverage}.")
+    if filters:
+        tensor = tensor.filter(filters)
+
+    codes, groups = group_rows(tensor, CORRIDOR_KEYS)
+    n_groups, n_rows = groups.shape[0], len(tensor)
+    values = tensor.values.reshape(n_rows, -1)
+
+    # the rows padded to a (group, position, column) array, the padding rows are empty
+    rows_per_group = np.bincount(codes, minlength=n_groups)
+    order = np.argsort(codes, kind="stable")
+    positions = np.empty(n_rows, dtype=np.int64)
+    positions[order] = np.arange(n_rows) - np.repeat(np.cumsum(rows_per_group) - rows_per_group, rows_per_group)
+    padded = np.full((n_groups, rows_per_group.max(initial=0), values.shape[1]), np.nan)
+    padded[codes, positions] = values
+    observed = ~np.isnan(padded)
+    is_row = np.arange(padded.shape[1]) < rows_per_group[:, np.newaxis]
+
+    n_observed = observed.sum(axis=1)
+    kept = (n_observed >= np.maximum(min_coverage * rows_per_group[:, np.newaxis], 2)) & (rows_per_group > 1)[
+        :, np.newaxis
+    ]
+    in_group = is_row[:, :, np.newaxis] & kept[:, np.newaxis]
+    imputed = in_group & ~observed
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(kept, np.nansum(padded, axis=1) / n_observed, 0.0)
+    # the missing values start at the mean of their angle, the padding rows and the angles not kept are 0
+    completed = np.where(in_group, np.where(observed, padded, means[:, np.newaxis]), 0.0)
+
+    def center(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+        group_means = (
+            values.sum(axis=1, keepdims=True) / np.maximum(rows_per_group[groups], 1)[:, np.newaxis, np.newaxis]
+        )
+        return np.where(in_group[groups], values - group_means, 0.0)
+
+    # the rank of the imputation is the number of components the group can have
+    n_group_components = np.minimum(np.minimum(n_components, rows_per_group - 1), kept.sum(axis=1)).clip(min=0)
+    in_rank = np.arange(n_components) < n_group_components[:, np.newaxis]
+    norms = np.sqrt((center(completed, np.arange(n_groups)) ** 2).sum(axis=(1, 2)))
+
+    # only the groups with missing values are imputed, the mean and the components are updated until the imputed
+    # values are stable
+    active = np.flatnonzero(imputed.any(axis=(1, 2)))
+    values_active, missing = completed[active], imputed[active]
+    for _ in range(max_iterations):
+        if not active.size:
+            break
+        centered = center(values_active, active)
+        reconstruction = _low_rank(centered, in_rank[active]) + (values_active - centered)
+        change = np.sqrt((np.where(missing, reconstruction - values_active, 0) ** 2).sum(axis=(1, 2)))
+        np.copyto(values_active, reconstruction, where=missing)
+        converged = change <= tolerance * norms[active]
+        if converged.any():
+            completed[active[converged]] = values_active[converged]
+            active, values_active, missing = active[~converged], values_active[~converged], missing[~converged]
+    completed[active] = values_active
+
+    filled = center(completed, np.arange(n_groups))
+    means = np.where(kept, completed.sum(axis=1) / np.maximum(rows_per_group, 1)[:, np.newaxis], np.nan)
+    u, s, vt = np.linalg.svd(filled, full_matrices=False)
+    u, vt = _svd_flip(u[:, :, :n_components], vt[:, :n_components])
+    s = s[:, :n_components]
+
+    # fewer curves or angles than components
+    n_found = s.shape[1]
+    in_rank = in_rank[:, :n_found]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        explained_variance = np.where(in_rank, s**2 / (rows_per_group[:, np.newaxis] - 1), np.nan)
+        total_variance = (filled**2).sum(axis=(1, 2)) / (rows_per_group - 1)
+        explained_variance_ratio = explained_variance / total_variance[:, np.newaxis]
+    components = np.where(in_rank[:, :, np.newaxis] & kept[:, np.newaxis], vt, np.nan)
+    scores = np.where(in_rank[:, np.newaxis], u * s[:, np.newaxis], np.nan)[codes, positions]
+
+    pad = ((0, 0), (0, n_components - n_found))
+    shape = tensor.values.shape[1:]
+    return FunctionalPCA(
+        groups=groups,
+        grid=tensor.grid,
+        means=means.reshape((n_groups,) + shape),
+        components=np.pad(components, pad + ((0, 0),), constant_values=np.nan).reshape(
+            (n_groups, n_components) + shape
+        ),
+        explained_variance=np.pad(explained_variance, pad, constant_values=np.nan),
+        explained_variance_ratio=np.pad(explained_variance_ratio, pad, constant_values=np.nan),
+        rows=tensor.rows,
+        codes=codes,
+        scores=np.pad(scores, ((0, 0), (0, n_components - n_found)), constant_values=np.nan),
+        coverage=(observed & kept[:, np.newaxis]).sum(axis=2)[codes, positions]
+        / np.maximum(kept.sum(axis=1), 1)[codes],
+    )
@@ -0,0 +1,286 @@
+"""
+This module compares two subgroups of the dataset along the humerothoracic angle, as statistical parametric mapping
+of one-dimensional fields does (SPM1D), e.g. in vivo vs ex vivo, standing vs sitting, or fully_isb vs not.
+
+The curves of each (joint, humeral_motion, unit) are split by a metadata column, and a Welch t statistic is computed
+at every angle of every degree of freedom, for all the groups at once, from sums over the rows.
+The inference is done either:
+    - pointwise with the t distribution ('t' test), without any correction for the multiple angles,
+    - or with permutations of the subgroup labels ('permutation' test): the maximum of |t| over the angles of a dof
+      gives a threshold, and p-values, that control the family-wise error rate over the whole curve.
+The permutations of a batch are a matrix of labels (permutation, row), so the statistics of all the permutations
+are matrix products, and the groups can be permuted in worker processes, each with its own random stream.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import t as t_distribution
+
+from .corridors import group_rows, one_hot
+from .curve_tensor import CurveTensor, DOFS
+from .utils import process_map
+
+TESTS = ("t", "permutation")
+
+
+def welch_t(
+    values: np.ndarray, labels_a: np.ndarray, labels_b: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Welch t statistics of the lines of the subgroup a against the lines of the subgroup b, ignoring the nan values
+
+    Parameters
+    ----------
+    values: np.ndarray
+        The samples, shape (N, M), nan if missing, better centered at each column for the precision
+    labels_a: np.ndarray
+        1 for the lines of the subgroup a, else 0, shape (N,), or one comparison per line, shape (P, N),
+        e.g. the permutations of the labels, or one (joint, humeral_motion, unit) per line
+    labels_b: np.ndarray
+        1 for the lines of the subgroup b, else 0, same shape as labels_a
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        The t statistics, the Welch-Satterthwaite degrees of freedom, the number of samples of a and b,
+        shape (M,) or (P, M), nan where a side has less than two samples
+    """
+    mask = (~np.isnan(values)).astype(np.float64)
+    values = np.nan_to_num(values)
+
+    sides = []
+    for side_labels in (labels_a, labels_b):
+        side_labels = np.asarray(side_labels, dtype=np.float64)
+        n = side_labels @ mask
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = (side_labels @ values) / n
+            variance = (side_labels @ values**2 - n * mean**2) / (n - 1)
+        sides.append((n, mean, np.maximum(variance, 0)))
+    (n_a, mean_a, variance_a), (n_b, mean_b, variance_b) = sides
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance_a, variance_b = np.where(n_a > 1, variance_a / n_a, np.nan), np.where(
+            n_b > 1, variance_b / n_b, np.nan
+        )
+        t = (mean_a - mean_b) / np.sqrt(variance_a + variance_b)
+        df = (variance_a + variance_b) ** 2 / (variance_a**2 / (n_a - 1) + variance_b**2 / (n_b - 1))
+    return t, df, n_a, n_b
+
+
+def _max_null_statistics(task: tuple) -> np.ndarray:
+    """The maximum of |t| over the angles of each dof, for each permutation of the labels of one group"""
+    values, labels, n_dofs, seed, n_permutations, batch_size = task
+    rng = np.random.default_rng(seed)
+
+    maxima = np.empty((n_permutations, n_dofs))
+    for start in range(0, n_permutations, batch_size):
+        stop = min(start + batch_size, n_permutations)
+        permutations = rng.permuted(np.tile(labels, (stop - start, 1)), axis=1)
+        t, *_ = welch_t(values, permutations, 1 - permutations)
+        with np.errstate(invalid="ignore"):
+            absolute_t = np.abs(t).reshape(stop - start, n_dofs, -1)
+        # nan if the dof has no angle with enough samples in both subgroups
+        maxima[start:stop] = np.where(np.isnan(absolute_t).all(axis=2), np.nan, np.nan_to_num(absolute_t).max(axis=2))
+    return maxima
+
+
+class GroupComparison:
+    """
+    The comparison of two subgroups of curves, per (joint, humeral_motion, unit), degree of freedom and angle
+
+    Attributes
+    ----------
+    groups : pd.DataFrame
+        The joint, humeral_motion and unit of each comparison, in the order of the first axis
+    grid : np.ndarray
+        The humerothoracic angles of the last axis
+    t : np.ndarray
+        The Welch t statistics, subgroup a - subgroup b, shape (group, dof, grid)
+    df : np.ndarray
+        The Welch-Satterthwaite degrees of freedom, shape (group, dof, grid)
+    p_values : np.ndarray
+        The two-sided p-values, pointwise for the 't' test, corrected over the angles of a dof for the
+        'permutation' test, shape (group, dof, grid)
+    thresholds : np.ndarray
+        The critical |t| of each dof for the 'permutation' test, nan for the 't' test, shape (group, dof)
+    n_a : np.ndarray
+        The number of curves of the subgroup a at each angle, shape (group, dof, grid)
+    n_b : np.ndarray
+        The number of curves of the subgroup b at each angle, shape (group, dof, grid)
+    alpha : float
+        The significance level
+    test : str
+        't' or 'permutation'
+    """
+
+    def __init__(
+        self,
+        groups: pd.DataFrame,
+        grid: np.ndarray,
+        t: np.ndarray,
+        df: np.ndarray,
+        p_values: np.ndarray,
+        thresholds: np.ndarray,
+        n_a: np.ndarray,
+        n_b: np.ndarray,
+        alpha: float,
+        test: str,
+    ):
+        self.groups = groups.reset_index(drop=True)
+        self.grid = grid
+        self.t = t
+        self.df = df
+        self.p_values = p_values
+        self.thresholds = thresholds
+        self.n_a = n_a
+        self.n_b = n_b
+        self.alpha = alpha
+        self.test = test
+
+    @property
+    def significant(self) -> np.ndarray:
+        """True where the subgroups differ at the significance level, shape (group, dof, grid)"""
+        with np.errstate(invalid="ignore"):
+            return self.p_values < self.alpha
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns the comparison in a long format, one line per group, dof and angle where the t statistic exists"""
+        group, dof, point = np.nonzero(~np.isnan(self.t))
+        df = self.groups.iloc[group].reset_index(drop=True)
+        df["degree_of_freedom"] = np.asarray(DOFS)[dof]
+        df["humerothoracic_angle"] = self.grid[point]
+        df["n_a"] = self.n_a[group, dof, point].astype(np.int64)
+        df["n_b"] = self.n_b[group, dof, point].astype(np.int64)
+        df["t"] = self.t[group, dof, point]
+        df["df"] = self.df[group, dof, point]
+        df["p_value"] = self.p_values[group, dof, point]
+        df["threshold"] = self.thresholds[group, dof]
+        df["significant"] = self.significant[group, dof, point]
+        return df
+
+    def __repr__(self) -> str:
+        return (
+            f"GroupComparison({self.groups.shape[0]} groups, test={self.test}, alpha={self.alpha}, "
+            f"{int(self.significant.any(axis=2).sum())} dofs with a significant difference)"
+        )
+
+
+def _as_list(values) -> list:
+    return list(values) if isinstance(values, (list, tuple, set)) else [values]
+
+
+def compare_groups(
+    tensor: CurveTensor,
+    column: str,
+    a,
+    b=None,
+    test: str = "permutation",
+    n_permutations: int = 1000,
+    alpha: float = 0.05,
+    filters: dict = None,
+    seed: int | np.random.SeedSequence = None,
+    n_jobs: int = None,
+    batch_size: int = 1000,
+) -> GroupComparison:
+    """
+    Compare two subgroups of curves, defined by a metadata column, per (joint, humeral_motion, unit) and dof
+
+    Parameters
+    ----------
+    tensor: CurveTensor
+        The resampled curves, see CurveTensor.from_confident_data or import_curve_tensor
+    column: str
+        The metadata column of the subgroups, e.g. 'in_vivo', 'experimental_mean', 'posture', 'total_compliance'
+    a:
+        The value, or the list of values, of the column in the subgroup a, e.g. True, or [5, 6]
+    b:
+        The value, or the list of values, of the column in the subgroup b, all the other values by default
+    test: str
+        'permutation' (default), max-statistic permutation test corrected over the angles of each dof,
+        or 't', pointwise Welch t-test
+    n_permutations: int
+        The number of permutations of the subgroup labels, for the permutation test
+    alpha: float
+        The significance level
+    filters: dict
+        Only use the rows whose metadata match the filters, e.g. {"unit": "rad"}
+    seed: int | np.random.SeedSequence
+        The seed of the permutations, the results only depend on it, not on n_jobs
+    n_jobs: int
+        The number of processes, the groups are permuted in parallel, -1 for all the cpus, serial by default
+    batch_size: int
+        The number of permutations computed at once, the memory grows with it
+
+    Returns
+    -------
+    GroupComparison
+        The statistics of the (joint, humeral_motion, unit) with curves in both subgroups
+    """
+    if test not in TESTS:
+        raise ValueError(f"{test} is not a valid test, must be one of {TESTS}.")
+    if filters:
+        tensor = tensor.filter(filters)
+
+    in_a = tensor.rows[column].isin(_as_list(a)).to_numpy()
+    if b is None:
+        in_b = ~in_a & tensor.rows[column].notna().to_numpy()
+    else:
+        in_b = tensor.rows[column].isin(_as_list(b)).to_numpy()
+    if np.any(in_a & in_b):
+        raise ValueError(f"The subgroups a={a} and b={b} of {column} overlap.")
+
+    codes, groups = group_rows(tensor)
+    n_groups = groups.shape[0]
+    compared = ((one_hot(codes, n_groups) @ in_a) > 0) & ((one_hot(codes, n_groups) @ in_b) > 0)
+    tensor = tensor.select((in_a | in_b) & compared[codes])
+    in_a = in_a[(in_a | in_b) & compared[codes]]
+    codes, groups = group_rows(tensor)
+    n_groups = groups.shape[0]
+
+    n_dofs, n_points = tensor.values.shape[1:]
+    values = tensor.values.reshape(len(tensor), -1)
+    # centered at each angle of each group, the variances are then sums of small squares
+    group_matrix = one_hot(codes, n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        centers = np.nan_to_num((group_matrix @ np.nan_to_num(values)) / (group_matrix @ ~np.isnan(values)))
+    values = values - centers[codes]
+
+    # one comparison per group, the rows of the other groups are in neither subgroup
+    t, df, n_a, n_b = welch_t(values, group_matrix * in_a, group_matrix * ~in_a)
+
+    shape = (n_groups, n_dofs, n_points)
+    thresholds = np.full((n_groups, n_dofs), np.nan)
+    if test == "t":
+        p_values = 2 * t_distribution.sf(np.abs(t), df)
+    else:
+        seeds = np.random.SeedSequence(seed).spawn(n_groups)
+        tasks = [
+            (values[codes == group], in_a[codes == group], n_dofs, seeds[group], n_permutations, batch_size)
+            for group in range(n_groups)
+        ]
+        absolute_t = np.abs(t).reshape(shape)
+        p_values = np.full(shape, np.nan)
+        for group, maxima in enumerate(process_map(_max_null_statistics, tasks, n_jobs=n_jobs)):
+            maxima.sort(axis=0)  # nan last
+            for dof in range(n_dofs):
+                n_valid = np.count_nonzero(~np.isnan(maxima[:, dof]))
+                if not n_valid:
+                    continue
+                thresholds[group, dof] = np.quantile(maxima[:n_valid, dof], 1 - alpha)
+                # the number of permutations with a maximum at least as large as the observed |t|
+                exceedances = n_valid - np.searchsorted(maxima[:n_valid, dof], absolute_t[group, dof], side="left")
+                p_values[group, dof] = (1 + exceedances) / (1 + n_valid)
+        p_values[np.isnan(absolute_t)] = np.nan
+
+    return GroupComparison(
+        groups=groups,
+        grid=tensor.grid,
+        t=t.reshape(shape),
+        df=df.reshape(shape),
+        p_values=np.asarray(p_values).reshape(shape),
+        thresholds=thresholds,
+        n_a=n_a.reshape(shape),
+        n_b=n_b.reshape(shape),
+        alpha=alpha,
+        test=test,
+    )
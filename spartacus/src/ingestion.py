@@ -0,0 +1,356 @@
+"""
+This module ingests new articles in spartacus, and gives feedback on the data in seconds, without loading them.
+
+Adding an article means:
+    - converting its workbooks into csv files, one curve per file, see convert_workbooks,
+    - referencing these files in dataset_clean_of_joint_data.csv,
+    - checking that every referenced file exists and parses, that the abscissas of the dofs of a row are aligned
+      and monotonic, see validate_joint_data,
+    - packing the curves in the curve store, see build_curve_store.
+ingest runs these steps in a row, it is also available from the command line:
+
+    python -m spartacus.src.ingestion "spartacus/data/#21_New_et_al" --n-jobs -1
+
+The files are converted and checked in parallel, each file is parsed once as in load_csv.
+The problems are reported in a dataframe, one line per problem, errors break the loading while warnings only
+point out data that will be modified, e.g. interpolated, or that should be double-checked.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..enums import DatasetCSV, DataFolder
+from .curve_store import CURVE_DOFS, CURVE_STORE, build_curve_store
+from .dataset_schema import read_dataset_csv
+from .utils import process_map
+
+WORKBOOK_EXTENSIONS = (".xls", ".xlsx")
+REPORT_COLUMNS = [
+    "severity",
+    "check",
+    "dataset_authors",
+    "joint",
+    "humeral_motion",
+    "shoulder_id",
+    "dof",
+    "file",
+    "message",
+]
+# the dofs loaded together by load_euler_csv, their abscissas are expected to be aligned
+DOF_GROUPS = (CURVE_DOFS[:3], CURVE_DOFS[3:])
+# a digitized curve often goes back and forth once at its ends, more direction changes are worth a look
+MAX_DIRECTION_CHANGES = 1
+
+
+def workbook_to_csv(input_file: str | Path, output_file: str | Path = None) -> Path:
+    """
+    Convert the first sheet of a workbook (.xls, .xlsx) into a csv file, cell by cell, without header nor index
+
+    Parameters
+    ----------
+    input_file: str | Path
+        The workbook
+    output_file: str | Path
+        The csv file, the workbook with a .csv extension by default
+
+    Returns
+    -------
+    Path
+        The csv file
+    """
+    input_file = Path(input_file)
+    output_file = input_file.with_suffix(".csv") if output_file is None else Path(output_file)
+    pd.read_excel(input_file, header=None).to_csv(output_file, header=False, index=False)
+    return output_file
+
+
+def convert_workbooks(
+    folders: list[str | Path] | str | Path, n_jobs: int = None, overwrite: bool = False
+) -> list[Path]:
+    """
+    Convert all the workbooks of the folders into csv files, next to them, in parallel.
+    Reading workbooks needs xlrd for .xls files and openpyxl for .xlsx files.
+
+    Parameters
+    ----------
+    folders: list[str | Path] | str | Path
+        The folders to convert, their sub-folders are not converted
+    n_jobs: int
+        The number of processes, -1 for all the cpus, serial by default
+    overwrite: bool
+        If False, the workbooks already converted, i.e. with a csv file more recent than them, are skipped
+
+    Returns
+    -------
+    list[Path]
+        The csv files written
+    """
+    folders = [folders] if isinstance(folders, (str, Path)) else folders
+    workbooks = [
+        path
+        for folder in folders
+        for path in sorted(Path(folder).iterdir())
+        if path.suffix.lower() in WORKBOOK_EXTENSIONS
+        and (
+            overwrite
+            or not path.with_suffix(".csv").exists()
+            or path.with_suffix(".csv").stat().st_mtime_ns < path.stat().st_mtime_ns
+        )
+    ]
+    return process_map(workbook_to_csv, workbooks, n_jobs=n_jobs)
+
+
+def inspect_curve_file(path: str | Path) -> tuple[list[tuple[str, str, str]], np.ndarray | None]:
+    """
+    Parse a curve file as in load_csv and check it
+
+    Parameters
+    ----------
+    path: str | Path
+        The csv file, two columns without header: the humerothoracic angle and the dof value
+
+    Returns
+    -------
+    tuple[list[tuple[str, str, str]], np.ndarray | None]
+        The problems found (severity, check, message), and the abscissa of the curve if it could be parsed.
+        Repeated angles and up to MAX_DIRECTION_CHANGES direction changes are reported at the info level.
+    """
+    path = Path(path)
+    if not path.exists():
+        return [("error", "missing", "the file does not exist")], None
+
+    try:
+        df = pd.read_csv(path, sep=",", header=None)
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as error:
+        return [("error", "parse", f"the file can not be parsed: {error}")], None
+
+    if df.shape[1] != 2 or df.shape[0] < 1:
+        return [("error", "parse", f"expected two columns and at least one row, got shape {df.shape}")], None
+
+    try:
+        curve = df.to_numpy(dtype=np.float64)
+    except ValueError:
+        return [("error", "numeric", "the file contains values that are not numbers")], None
+
+    issues = []
+    missing = np.isnan(curve).any(axis=1)
+    if missing.all():
+        return [("error", "numeric", "the file has no complete row")], None
+    if missing.any():
+        # e.g. an empty last line, the row is loaded with nan values and dropped later
+        issues.append(("warning", "numeric", f"{missing.sum()} rows have missing values"))
+
+    abscissa = curve[~missing, 0]
+    steps = np.diff(abscissa)
+    if (steps == 0).any():
+        issues.append(("info", "monotonic", f"{(steps == 0).sum()} repeated humerothoracic angles"))
+    if (steps > 0).any() and (steps < 0).any():
+        direction_changes = np.count_nonzero(np.diff(np.sign(steps[steps != 0])))
+        severity = "warning" if direction_changes > MAX_DIRECTION_CHANGES else "info"
+        issues.append((severity, "monotonic", f"the humerothoracic angle changes direction {direction_changes} times"))
+
+    return issues, abscissa
+
+
+def _row_folder(folder: str, data_folder: Path | None) -> Path:
+    if data_folder is not None:
+        return Path(data_folder) / folder
+    # only the registered folders can be loaded
+    return Path(DataFolder.from_string(folder).value)
+
+
+def validate_joint_data(
+    joint_data: pd.DataFrame = None, data_folder: str | Path = None, n_jobs: int = None
+) -> pd.DataFrame:
+    """
+    Check that every file referenced in the joint data exists and parses, that its humerothoracic angles are monotonic,
+    and that the abscissas of the dofs of each row are aligned.
+
+    Parameters
+    ----------
+    joint_data: pd.DataFrame
+        The joint data, dataset_clean_of_joint_data.csv by default
+    data_folder: str | Path
+        The folder of the article folders, by default the folders must be registered in DataFolder
+    n_jobs: int
+        The number of processes parsing the files, -1 for all the cpus, serial by default
+
+    Returns
+    -------
+    pd.DataFrame
+        The report, one line per problem, see REPORT_COLUMNS, empty if everything is fine.
+        The monotonicity problems of the dofs loaded together are reported in one line.
+    """
+    joint_data = read_dataset_csv(DatasetCSV.JOINT) if joint_data is None else joint_data
+
+    report = []
+    rows = []  # (row, {dof: path})
+    for _, row in joint_data.iterrows():
+        files = {dof: row[dof] for dof in CURVE_DOFS if isinstance(row[dof], str)}
+        if not files:
+            continue
+        try:
+            folder_path = _row_folder(row["folder"], data_folder)
+        except ValueError as error:
+            report.append(_report_line(row, "error", "folder", str(error)))
+            continue
+        rows.append((row, {dof: folder_path / file for dof, file in files.items()}))
+
+    # each file is parsed once, even if several rows refer to it
+    paths = sorted({path for _, files in rows for path in files.values()})
+    inspections = dict(zip(paths, process_map(inspect_curve_file, paths, n_jobs=n_jobs)))
+
+    for row, files in rows:
+        for dof, path in files.items():
+            issues, _ = inspections[path]
+            report.extend(
+                _report_line(row, severity, check, message, dof, path)
+                for severity, check, message in issues
+                if check != "monotonic"
+            )
+
+        for dof_group in DOF_GROUPS:
+            report.extend(_check_monotonic(row, {dof: inspections[files[dof]][0] for dof in dof_group if dof in files}))
+            abscissas = {
+                dof: inspections[files[dof]][1]
+                for dof in dof_group
+                if dof in files and inspections[files[dof]][1] is not None
+            }
+            report.extend(_check_alignment(row, abscissas))
+
+    return pd.DataFrame(report, columns=REPORT_COLUMNS)
+
+
+def _check_monotonic(row: pd.Series, issues: dict[str, list[tuple[str, str, str]]]) -> list[dict]:
+    """Gather the monotonicity problems of the dofs of a row in one line, a warning if one of them is a warning"""
+    problems = {
+        dof: [(severity, message) for severity, check, message in dof_issues if check == "monotonic"]
+        for dof, dof_issues in issues.items()
+    }
+    problems = {dof: dof_problems for dof, dof_problems in problems.items() if dof_problems}
+    if not problems:
+        return []
+
+    severities = {severity for dof_problems in problems.values() for severity, _ in dof_problems}
+    return [
+        _report_line(
+            row,
+            "warning" if "warning" in severities else "info",
+            "monotonic",
+            "; ".join(
+                f"{dof}: {', '.join(message for _, message in dof_problems)}" for dof, dof_problems in problems.items()
+            ),
+            dof=", ".join(problems),
+        )
+    ]
+
+
+def _check_alignment(row: pd.Series, abscissas: dict[str, np.ndarray]) -> list[dict]:
+    """Check that the dofs of a row share the same abscissa, as expected by load_euler_csv"""
+    if len(abscissas) < 2:
+        return []
+    reference = next(iter(abscissas.values()))
+    if all(np.array_equal(abscissa, reference) for abscissa in abscissas.values()):
+        return []
+
+    dofs = ", ".join(abscissas)
+    # load_euler_csv interpolates the dofs on the range they have in common
+    min_value = max(abscissa.min() for abscissa in abscissas.values())
+    max_value = min(abscissa.max() for abscissa in abscissas.values())
+    if min_value > max_value:
+        return [_report_line(row, "error", "alignment", f"the humerothoracic angles of {dofs} have no common range")]
+    n_points = min(abscissa.shape[0] for abscissa in abscissas.values())
+    return [
+        _report_line(
+            row,
+            "warning",
+            "alignment",
+            f"the humerothoracic angles of {dofs} differ, "
+            f"they will be interpolated on [{min_value:g}, {max_value:g}] with {n_points} points",
+        )
+    ]
+
+
+def _report_line(row: pd.Series, severity: str, check: str, message: str, dof: str = None, path: Path = None) -> dict:
+    return {
+        "severity": severity,
+        "check": check,
+        "dataset_authors": row["dataset_authors"],
+        "joint": row["joint"],
+        "humeral_motion": row["humeral_motion"],
+        "shoulder_id": row["shoulder_id"],
+        "dof": dof,
+        "file": None if path is None else str(path),
+        "message": message,
+    }
+
+
+def ingest(
+    folders: list[str | Path] = None,
+    n_jobs: int = None,
+    build_store: bool = True,
+    store_path: str | Path = None,
+) -> pd.DataFrame:
+    """
+    Convert the workbooks of new article folders, check all the files referenced in the joint data,
+    and pack the curves in the curve store if no error was found.
+
+    Parameters
+    ----------
+    folders: list[str | Path]
+        The article folders whose workbooks are converted, none by default
+    n_jobs: int
+        The number of processes, -1 for all the cpus, serial by default
+    build_store: bool
+        If True, the curve store is built when the report has no error
+    store_path: str | Path
+        The path of the curve store, spartacus/data/curve_store.npz by default
+
+    Returns
+    -------
+    pd.DataFrame
+        The report of validate_joint_data
+    """
+    if folders:
+        convert_workbooks(folders, n_jobs=n_jobs)
+
+    report = validate_joint_data(n_jobs=n_jobs)
+
+    if build_store and not (report["severity"] == "error").any():
+        build_curve_store(store_path)
+
+    return report
+
+
+def main(argv: list[str] = None) -> int:
+    """The command line of ingest, returns 1 if errors were found, 0 otherwise"""
+    parser = argparse.ArgumentParser(
+        description="Convert the workbooks of new article folders, check the files referenced in "
+        f"{DatasetCSV.JOINT.value.name} and build the curve store."
+    )
+    parser.add_argument("folders", nargs="*", help="the article folders whose workbooks are converted to csv")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="number of processes, -1 for all the cpus")
+    parser.add_argument("--no-store", action="store_true", help="do not build the curve store")
+    parser.add_argument("--store", default=None, help=f"path of the curve store, {CURVE_STORE} by default")
+    parser.add_argument("--verbose", action="store_true", help="print every warning, not only their counts")
+    args = parser.parse_args(argv)
+
+    report = ingest(args.folders, n_jobs=args.n_jobs, build_store=not args.no_store, store_path=args.store)
+
+    with pd.option_context("display.max_rows", None, "display.max_colwidth", 120, "display.width", 250):
+        if not report.empty:
+            print(report.groupby(["severity", "check", "dataset_authors"]).size().rename("count").to_string(), "\n")
+        details = report if args.verbose else report[report["severity"] == "error"]
+        if not details.empty:
+            print(details.to_string(index=False), "\n")
+
+    n_errors = (report["severity"] == "error").sum()
+    print(f"{n_errors} errors, {(report['severity'] == 'warning').sum()} warnings.")
+    return 1 if n_errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
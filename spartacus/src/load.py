@@ -1,39 +1,128 @@
+from functools import partial
 from pathlib import Path
+from typing import Literal, Iterator
 
 import pandas as pd
 
+from .cache import (
+    row_cache_keys,
+    load_cached_row,
+    save_cached_row,
+    is_row_cached,
+    dataset_fingerprint,
+    FINGERPRINT_FILE,
+)
 from .checks import check_all_segments_validity
+from .columnar import check_export_format, to_columnar_dataframe, PARQUET_ROW_GROUP_SIZE
+from .dataset_schema import read_dataset_csv, to_python_objects
 from ..enums import DatasetCSV, DataFolder
 from .enums_biomech import Segment, JointType
 from .row_data import RowData
-from .utils import convert_df_to_1dof_per_line
+from .utils import convert_df_to_1dof_per_line, process_imap
 
 from .checks import check_segment_filled_with_nan
-from .compliance import JointCompliance, SegmentCompliance
+from .compliance import JointCompliance
 from .utils import get_segment_columns_direction
 from .utils_setters import (
     set_joint_from_row,
     set_thoracohumeral_angle_from_row,
-    set_parent_segment_from_row,
-    set_child_segment_from_row,
+    compile_parent_segment_from_row,
+    compile_child_segment_from_row,
 )
 
 
-def nan_to_none(df: pd.DataFrame) -> pd.DataFrame:
-    """Replace NaN with None in text columns, leaving numeric/boolean columns untouched.
+def import_row(
+    row: pd.Series, process_rotations: bool = True, process_translations: bool = True
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Import the data of one row of the confident dataframe, and apply the corrections to it.
+    It only returns dataframes, so it can be run in another process.
+
+    Parameters
+    ----------
+    row: pd.Series
+        A row of Spartacus.confident_dataframe
+    process_rotations: bool
+        Choose if the rotations should be processed or not.
+    process_translations: bool
+        Choose if the translations should be processed or not.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, pd.DataFrame]
+        The data of the row without and with corrections
+    """
+    row_data = RowData(row)
+
+    process_translation = row_data.has_translation_data if process_translations else False
+    process_rotation = row_data.has_rotation_data if process_rotations else False
+
+    row_data.set_segments()
+    row_data.check_joint_validity(print_warnings=False)
+    row_data.check_segments_correction_validity(print_warnings=False)
+    row_data.check_thoracohumeral_angle(print_warnings=False)
+    row_data.set_compliance()
+
+    if not (process_translation and row_data.enough_compliant_for_translation):
+        process_translation = False
+    else:
+        row_data.set_translation_correction_callback()
+
+    if process_rotation:
+        row_data.set_rotation_correction_callback()
+
+    row_data.import_data()
+
+    df_series = row_data.to_dataframe(
+        correction=False,
+        translation=process_translation,
+        rotation=process_rotation,
+    )
+    df_corrected_series = row_data.to_dataframe(
+        correction=True, translation=process_translation, rotation=process_rotation
+    )
+
+    return df_series, df_corrected_series
+
 
-    Since pandas 3.0, text columns read from CSV default to the ``str`` dtype, where
-    ``.where(..., None)`` keeps a missing value as a float ``nan`` instead of ``None``.
-    The rest of the codebase relies on missing text cells being ``None`` (e.g. ``axis is None``
-    checks), so we cast the non-numeric columns to ``object`` to make ``None`` stick. Numeric
-    columns keep their native dtype and their missing values stay ``NaN``, as before pandas 3.0.
+def read_dataset_csvs(
+    datasets: DataFolder | str | list[DataFolder | str] = None,
+    shoulder: list[int] | int = None,
+    mvt: list[str] | str = None,
+    joints: list[str] | str = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
-    df = df.copy()
-    for col in df.columns:
-        if pd.api.types.is_numeric_dtype(df[col]):
-            continue
-        df[col] = df[col].astype(object).where(df[col].notna(), None)
-    return df
+    Read the dataset of datasets and the joint data, and only keep the lines matching the filters,
+    see Spartacus.load for the description of the filters.
+
+    Returns
+    -------
+    tuple[pd.DataFrame, pd.DataFrame]
+        The datasets and the joint data
+    """
+    # typed with their schema, see dataset_schema.py
+    df = read_dataset_csv(DatasetCSV.DATASETS)
+    df_joint_data = read_dataset_csv(DatasetCSV.JOINT)
+
+    if datasets is not None:
+        datasets = [datasets] if not isinstance(datasets, list) else datasets
+        datafolder_string = [name if isinstance(name, str) else name.to_dataset_author() for name in datasets]
+        df = df[df["dataset_authors"].isin(datafolder_string)]
+        df_joint_data = df_joint_data[df_joint_data["dataset_authors"].isin(datafolder_string)]
+
+    if shoulder is not None:
+        shoulder = [shoulder] if isinstance(shoulder, int) else shoulder
+        df_joint_data = df_joint_data[df_joint_data["shoulder_id"].isin(shoulder)]
+
+    if mvt is not None:
+        mvt = [mvt] if isinstance(mvt, str) else mvt
+        df_joint_data = df_joint_data[df_joint_data["humeral_motion"].isin(mvt)]
+
+    if joints is not None:
+        joints = [joints] if isinstance(joints, str) else joints
+        df_joint_data = df_joint_data[df_joint_data["joint"].isin(joints)]
+
+    return df, df_joint_data
 
 
 class Spartacus:
@@ -52,6 +141,10 @@ class Spartacus:
         Flag to process rotations.
     process_translations : bool
         Flag to process translations.
+    n_jobs : int | None
+        Number of processes used to import the rows.
+    cache : bool
+        Flag to reuse the rows stored in the on-disk cache.
     dataframe : pd.DataFrame
         Merged DataFrame of datasets and joint data.
     confident_dataframe : pd.DataFrame | None
@@ -69,12 +162,12 @@ class Spartacus:
 
     Methods
     -------
-    clean_df():
-        Replace NaNs with None in the datasets and joint data.
     check_dataset_segments(print_warnings: bool = False) -> pd.DataFrame:
         Check if segments are consistently defined in the dataset.
     import_confident_data() -> pd.DataFrame:
         Import data from the DataFrame using callback functions.
+    iter_rows() -> Iterator[pd.DataFrame]:
+        Yield the data of each row as soon as it is imported and corrected.
     _add_metadata_to_dataframes():
         Add metadata to the dataframes for further analysis.
     export():
@@ -92,6 +185,8 @@ class Spartacus:
         unify: bool = False,
         process_rotations: bool = True,
         process_translations: bool = True,
+        n_jobs: int = None,
+        cache: bool = False,
     ):
         """
         Constructs all the necessary attributes for the Spartacus object.
@@ -108,17 +203,22 @@ class Spartacus:
             Flag to process rotations (default is True).
         process_translations : bool, optional
             Flag to process translations (default is True).
+        n_jobs : int, optional
+            Number of processes used to import the rows, -1 uses all the cpus (default is None, i.e. serial).
+        cache : bool, optional
+            Flag to reuse the rows stored in the on-disk cache, only the rows whose inputs changed are recomputed
+            (default is False).
         """
-        self.datasets = datasets
-        self.joint_data = joint_data
+        # converted once, the text cells are python objects with None when missing, as expected by the row readers
+        self.datasets = to_python_objects(datasets)
+        self.joint_data = to_python_objects(joint_data)
 
         # merge the datasets and the joint data through the column dataset_id, dataset_id, joint_data is the bigger file
         self.dataframe = pd.merge(
-            datasets, joint_data, left_on="dataset_id", right_on="dataset_id", suffixes=("", "useless_string")
+            self.datasets, self.joint_data, left_on="dataset_id", right_on="dataset_id", suffixes=("", "useless_string")
         )
         self.confident_dataframe = None
 
-        self.clean_df()
         self.add_compliances()
         self.rows = []
         self.rows_output = None
@@ -129,17 +229,13 @@ class Spartacus:
 
         self.process_rotations = process_rotations
         self.process_translations = process_translations
+        self.n_jobs = n_jobs
+        self.cache = cache
 
         if unify:
             self.check_dataset_segments(print_warnings=True)
             self.import_confident_data()
 
-    def clean_df(self):
-        """Replace nans with None"""
-        self.datasets = nan_to_none(self.datasets)
-        self.joint_data = nan_to_none(self.joint_data)
-        self.dataframe = nan_to_none(self.dataframe)
-
     def check_dataset_segments(self, print_warnings: bool = False) -> pd.DataFrame:
         """
         This will check if segment are consistently defined in the dataset, with or wihtout nans, direct frames, etc...
@@ -151,11 +247,7 @@ class Spartacus:
         print_warnings: bool
             This displays warning when necessary.
         """
-        # columns
-        columns = self.datasets.columns
-
-        # create an empty dataframe
-        self.confident_dataframe = pd.DataFrame(columns=columns)
+        valid_ids = []
 
         for i, row in self.datasets.iterrows():
 
@@ -164,31 +256,28 @@ class Spartacus:
                 print("")
                 print("row_data.joint", row.dataset_authors)
 
-            if not check_all_segments_validity(row, print_warnings=print_warnings):
-                continue
+            if check_all_segments_validity(row, print_warnings=print_warnings):
+                valid_ids.append(row.dataset_id)
 
-            # add the row to the dataframe
-            self.confident_dataframe = pd.concat([self.confident_dataframe, row.to_frame().T], ignore_index=True)
-
-        self.confident_dataframe = pd.merge(
-            self.confident_dataframe,
-            self.joint_data.drop("dataset_authors", axis=1),
-            left_on="dataset_id",
-            right_on="dataset_id",
-            suffixes=("", "useless_string"),
-        )
+        # the lines of the valid datasets are selected in the merged dataframe, the joint data are not merged again
+        self.confident_dataframe = self.dataframe[self.dataframe["dataset_id"].isin(valid_ids)]
+        self.confident_dataframe = self.confident_dataframe.drop(columns="dataset_authorsuseless_string")
+        self.confident_dataframe = self.confident_dataframe.reset_index(drop=True)
         return self.confident_dataframe
 
-    def import_confident_data(self) -> pd.DataFrame:
+    def import_confident_data(self, n_jobs: int = None, cache: bool = None) -> pd.DataFrame:
         """
         This function will import the data from the dataframe, using the callback functions.
         Only the data corresponding to the rows that are considered good and have a callback function will be imported.
-        """
-        if self.confident_dataframe is None:
-            raise ValueError(
-                "The dataframe has not been checked yet. " "Use check_dataset_segments() before importing the data."
-            )
 
+        Parameters
+        ----------
+        n_jobs: int
+            The number of processes used to import the rows, -1 uses all the cpus, self.n_jobs by default.
+        cache: bool
+            If True, the rows are read from the on-disk cache when their inputs did not change, and stored in it
+            otherwise, self.cache by default.
+        """
         output_dataframe = pd.DataFrame(
             columns=[
                 "article",  # string
@@ -205,49 +294,104 @@ class Spartacus:
                 "shoulder_id",  # int
             ],
         )
-        corrected_output_dataframe = output_dataframe.copy()
-
-        for i, row in self.confident_dataframe.iterrows():
-
-            row_data = RowData(row)
+        # the per-row frames are concatenated once at the end, concatenating in the loop is quadratic
+        series = []
+        corrected_series = []
 
-            process_translation = row_data.has_translation_data if self.process_translations else False
-            process_rotation = row_data.has_rotation_data if self.process_rotations else False
+        for df_series, df_corrected_series in self._iter_imported_rows(n_jobs=n_jobs, cache=cache):
+            # add the row to the dataframe
+            series.append(df_series)
+            corrected_series.append(df_corrected_series)
 
-            row_data.set_segments()
-            row_data.check_joint_validity(print_warnings=False)
-            row_data.check_segments_correction_validity(print_warnings=False)
-            row_data.check_thoracohumeral_angle(print_warnings=False)
-            row_data.set_compliance()
+        # the empty dataframe leads the concatenation to keep the columns and their dtypes when no row is imported
+        corrected_output_dataframe = pd.concat([output_dataframe, *corrected_series], ignore_index=True)
+        output_dataframe = pd.concat([output_dataframe, *series], ignore_index=True)
 
-            if not (process_translation and row_data.enough_compliant_for_translation):
-                process_translation = False
-            else:
-                row_data.set_translation_correction_callback()
+        self.confident_data_values = convert_df_to_1dof_per_line(output_dataframe)
+        self.corrected_confident_data_values = convert_df_to_1dof_per_line(corrected_output_dataframe)
 
-            if process_rotation:
-                row_data.set_rotation_correction_callback()
+        self._add_metadata_to_dataframes()
 
-            row_data.import_data()
+        return self.corrected_confident_data_values
 
-            df_series = row_data.to_dataframe(
-                correction=False,
-                translation=process_translation,
-                rotation=process_rotation,
-            )
-            df_corrected_series = row_data.to_dataframe(
-                correction=True, translation=process_translation, rotation=process_rotation
+    def _iter_imported_rows(
+        self, n_jobs: int = None, cache: bool = None
+    ) -> Iterator[tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Yields the data of each row of the confident dataframe without and with corrections, in the order of the rows,
+        as soon as they are ready. See import_confident_data for the parameters.
+        """
+        if self.confident_dataframe is None:
+            raise ValueError(
+                "The dataframe has not been checked yet. " "Use check_dataset_segments() before importing the data."
             )
-            # add the row to the dataframe
-            output_dataframe = pd.concat([output_dataframe, df_series], ignore_index=True)
-            corrected_output_dataframe = pd.concat([corrected_output_dataframe, df_corrected_series], ignore_index=True)
 
-        self.confident_data_values = convert_df_to_1dof_per_line(output_dataframe)
-        self.corrected_confident_data_values = convert_df_to_1dof_per_line(corrected_output_dataframe)
+        import_one_row = partial(
+            import_row, process_rotations=self.process_rotations, process_translations=self.process_translations
+        )
+        n_jobs = self.n_jobs if n_jobs is None else n_jobs
+        cache = self.cache if cache is None else cache
+
+        # the csv files of all the rows are hashed at once, only the files modified since the last load are read
+        keys = (
+            row_cache_keys(self.confident_dataframe, self.process_rotations, self.process_translations)
+            if cache
+            else [None] * len(self.confident_dataframe)
+        )
+        cached = [cache and is_row_cached(key) for key in keys]
 
-        self._add_metadata_to_dataframes()
+        # the rows that are not cached are imported in the worker processes, a few rows ahead of the consumer
+        rows = self.confident_dataframe.iterrows()
+        imported = process_imap(
+            import_one_row, (row for is_cached, (_, row) in zip(cached, rows) if not is_cached), n_jobs=n_jobs
+        )
+        try:
+            for key, is_cached, (_, row) in zip(keys, cached, self.confident_dataframe.iterrows()):
+                if not is_cached:
+                    result = next(imported)
+                else:
+                    result = load_cached_row(key)
+                    if result is not None:
+                        yield result
+                        continue
+                    # the cached file is corrupt or was removed meanwhile
+                    result = import_one_row(row)
+                if cache:
+                    save_cached_row(key, result)
+                yield result
+        finally:
+            # a consumer that stops early only waits for the rows being imported, the others are cancelled
+            imported.close()
+
+    def iter_rows(
+        self, correction: bool = True, one_dof_per_line: bool = False, n_jobs: int = None, cache: bool = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yields the data of each row of the confident dataframe as soon as it is imported and corrected,
+        with the compliance flags of the row. Unlike import_confident_data, nothing is kept in memory,
+        so the rows can be streamed to a file, a plot, etc.
 
-        return self.corrected_confident_data_values
+        Parameters
+        ----------
+        correction: bool
+            If True, yields the corrected data, otherwise the data as reported in the articles.
+        one_dof_per_line: bool
+            If True, the three dofs are stacked, as in corrected_confident_data_values, otherwise one line has 3 dofs.
+        n_jobs: int
+            The number of processes used to import the rows, -1 uses all the cpus, self.n_jobs by default.
+        cache: bool
+            If True, the rows are read from the on-disk cache when their inputs did not change, self.cache by default.
+
+        Examples
+        --------
+        >>> sp = Spartacus.load(unify=False)
+        >>> sp.check_dataset_segments()
+        >>> for i, df in enumerate(sp.iter_rows(one_dof_per_line=True)):
+        ...     df.to_csv("corrected.csv", mode="a", header=i == 0, index=False)
+        """
+        for df_series, df_corrected_series in self._iter_imported_rows(n_jobs=n_jobs, cache=cache):
+            df = df_corrected_series if correction else df_series
+            yield convert_df_to_1dof_per_line(df) if one_dof_per_line else df
 
     def _add_metadata_to_dataframes(self):
         """For further analysis, add metadata to the dataframes"""
@@ -272,15 +416,33 @@ class Spartacus:
         )
         self.corrected_confident_data_values = self.corrected_confident_data_values.drop(columns="dataset_authors")
 
-    def export(self):
-        """Export the corrected confident data to the same folder as the clean data"""
+    def export(self, format: Literal["csv", "parquet"] = "csv"):
+        """
+        Export the corrected confident data to the same folder as the clean data
+
+        Parameters
+        ----------
+        format: str
+            'csv' (default) or 'parquet', a typed columnar format with categorical text columns, faster to read
+            and lighter in memory, it requires pyarrow.
+        """
+        check_export_format(format)
         path_next_to_clean = Path(DatasetCSV.DATASETS.value).parent
 
-        confident_path = Path.joinpath(path_next_to_clean, "corrected_confident_data.csv")
-        self.corrected_confident_data_values.to_csv(confident_path, index=False)
+        for filename, df in (
+            ("corrected_confident_data", self.corrected_confident_data_values),
+            ("confident_data", self.confident_data_values),
+        ):
+            confident_path = Path.joinpath(path_next_to_clean, f"{filename}.{format}")
+            if format == "parquet":
+                # small row groups, so that the filters on the reading side skip most of the file
+                to_columnar_dataframe(df).to_parquet(confident_path, index=False, row_group_size=PARQUET_ROW_GROUP_SIZE)
+            else:
+                df.to_csv(confident_path, index=False)
 
-        confident_path = Path.joinpath(path_next_to_clean, "confident_data.csv")
-        self.confident_data_values.to_csv(confident_path, index=False)
+        # the inputs the exported data were computed from, to detect when they are outdated
+        fingerprint_path = Path.joinpath(path_next_to_clean, FINGERPRINT_FILE.format(format=format))
+        fingerprint_path.write_text(dataset_fingerprint())
 
     @classmethod
     def load(
@@ -292,6 +454,9 @@ class Spartacus:
         unify: bool = True,
         process_rotations: bool = True,
         process_translations: bool = True,
+        n_jobs: int = None,
+        cache: bool = False,
+        lazy: bool = False,
     ):
         """
         Load the confident subdataset
@@ -315,28 +480,30 @@ class Spartacus:
             Choose if the rotations should be processed or not.
         process_translations: bool
             Choose if the translations should be processed or not.
+        n_jobs: int
+            The number of processes used to import the rows, -1 uses all the cpus, if None the rows are imported
+            one after the other in this process.
+        cache: bool
+            If True, the corrected rows are stored on disk, keyed by the row definition, the content of its csv files
+            and the version of the correction code. Later loads only recompute the rows whose inputs changed.
+        lazy: bool
+            If True, nothing is loaded yet and a SpartacusQuery is returned, it can be filtered further,
+            and the curves are only read and corrected when its values are requested.
         """
-        # open the file only_dataset_raw.csv
-        df = pd.read_csv(DatasetCSV.DATASETS.value)
-        df_joint_data = pd.read_csv(DatasetCSV.JOINT.value)
-
-        if datasets is not None:
-            datasets = [datasets] if not isinstance(datasets, list) else datasets
-            datafolder_string = [name if isinstance(name, str) else name.to_dataset_author() for name in datasets]
-            df = df[df["dataset_authors"].isin(datafolder_string)]
-            df_joint_data = df_joint_data[df_joint_data["dataset_authors"].isin(datafolder_string)]
-
-        if shoulder is not None:
-            shoulder = [shoulder] if isinstance(shoulder, int) else shoulder
-            df_joint_data = df_joint_data[df_joint_data["shoulder_id"].isin(shoulder)]
-
-        if mvt is not None:
-            mvt = [mvt] if isinstance(mvt, str) else mvt
-            df_joint_data = df_joint_data[df_joint_data["humeral_motion"].isin(mvt)]
+        if lazy:
+            return SpartacusQuery(
+                datasets=datasets,
+                shoulder=shoulder,
+                mvt=mvt,
+                joints=joints,
+                unify=unify,
+                process_rotations=process_rotations,
+                process_translations=process_translations,
+                n_jobs=n_jobs,
+                cache=cache,
+            )
 
-        if joints is not None:
-            joints = [joints] if isinstance(joints, str) else joints
-            df_joint_data = df_joint_data[df_joint_data["joint"].isin(joints)]
+        df, df_joint_data = read_dataset_csvs(datasets=datasets, shoulder=shoulder, mvt=mvt, joints=joints)
 
         return cls(
             datasets=df,
@@ -344,6 +511,8 @@ class Spartacus:
             unify=unify,
             process_rotations=process_rotations,
             process_translations=process_translations,
+            n_jobs=n_jobs,
+            cache=cache,
         )
 
     @property
@@ -387,6 +556,8 @@ class Spartacus:
         df_grouped = self.dataframe.groupby("dataset_authors")["joint"].agg(lambda x: list(set(x))).reset_index()
         joints_per_author = df_grouped.set_index("dataset_authors")["joint"].to_dict()
 
+        compliances = []
+
         for i, author in enumerate(authors):
             print(f"Processing {author} ({i + 1}/{len(authors)})")
 
@@ -401,8 +572,7 @@ class Spartacus:
 
                 segment_cols = get_segment_columns_direction(segment)
                 if not check_segment_filled_with_nan(first_row, segment_cols, print_warnings=True):
-                    bsys_segment = set_parent_segment_from_row(first_row, segment)
-                    compliance = SegmentCompliance(bsys=bsys_segment)
+                    compliance = compile_parent_segment_from_row(first_row, segment).compliance
                     dico_d[f"{segment.to_string}_c1"] = compliance.is_c1
                     dico_d[f"{segment.to_string}_c2"] = compliance.is_c2
                     dico_d[f"{segment.to_string}_c3"] = compliance.is_c3
@@ -411,8 +581,7 @@ class Spartacus:
                     and first_row[segment_cols[3]] is not None
                 ):
                     #  for nishinaka for example that only has translational information
-                    bsys_segment = set_child_segment_from_row(first_row, segment)
-                    compliance = SegmentCompliance(bsys=bsys_segment)
+                    compliance = compile_child_segment_from_row(first_row, segment).compliance
                     dico_d[f"{segment.to_string}_c3"] = compliance.is_c3
 
             for joint_type_str in joints_per_author[author]:
@@ -430,7 +599,9 @@ class Spartacus:
                     dico_d[f"{joint_type.to_string}_c5"] = joint_deviation.is_c5
                 dico_d[f"thoracohumeral_c6"] = joint_deviation.is_c6
 
-            df_compliance = pd.concat([df_compliance, pd.DataFrame([dico_d])], ignore_index=True)
+            compliances.append(pd.DataFrame([dico_d]))
+
+        df_compliance = pd.concat([df_compliance, *compliances], ignore_index=True)
 
         return df_compliance
 
@@ -438,6 +609,7 @@ class Spartacus:
         """It adds the compliances to the main dataframe - self.dataframe"""
         df_compliance = self.compliance()
         df_compliance = df_compliance.drop(columns="dataset_authors")
+        dataset_columns = self.datasets.columns
         self.datasets = pd.merge(
             self.datasets,
             df_compliance,
@@ -445,6 +617,132 @@ class Spartacus:
             right_on="id",
         )
         self.datasets = self.datasets.drop(columns="id")
-        self.dataframe = pd.merge(
-            self.datasets, self.joint_data, left_on="dataset_id", right_on="dataset_id", suffixes=("", "useless_string")
+
+        # the compliances are merged by id in the merged dataframe, the joint data are not merged again,
+        # the compliance columns are placed after the columns of the datasets
+        joint_columns = self.dataframe.columns.drop(dataset_columns)
+        self.dataframe = pd.merge(self.dataframe, df_compliance, left_on="dataset_id", right_on="id")
+        self.dataframe = self.dataframe[[*self.datasets.columns, *joint_columns]]
+
+
+class SpartacusQuery:
+    """
+    A lazy selection of the Spartacus dataset, returned by Spartacus.load(lazy=True).
+
+    The filters are only recorded, they can be narrowed with filter(), and they are pushed down to the dataset csv files
+    when the data are materialized: only the compliances of the selected authors are computed, and only the curves
+    of the selected rows are read and corrected.
+
+    Examples
+    --------
+    >>> query = Spartacus.load(lazy=True).filter(joints="glenohumeral").filter(mvt="frontal plane elevation")
+    >>> query.joint_data  # cheap, no curve is read
+    >>> query.corrected_confident_data_values  # reads and corrects the selected curves only
+    """
+
+    def __init__(
+        self,
+        datasets: DataFolder | str | list[DataFolder | str] = None,
+        shoulder: list[int] | int = None,
+        mvt: list[str] | str = None,
+        joints: list[str] | str = None,
+        unify: bool = True,
+        process_rotations: bool = True,
+        process_translations: bool = True,
+        n_jobs: int = None,
+        cache: bool = False,
+    ):
+        self.datasets = self._as_list(datasets)
+        if self.datasets is not None:
+            self.datasets = [name if isinstance(name, str) else name.to_dataset_author() for name in self.datasets]
+        self.shoulder = self._as_list(shoulder)
+        self.mvt = self._as_list(mvt)
+        self.joints = self._as_list(joints)
+
+        self.unify = unify
+        self.process_rotations = process_rotations
+        self.process_translations = process_translations
+        self.n_jobs = n_jobs
+        self.cache = cache
+
+        self._spartacus = None
+
+    @staticmethod
+    def _as_list(values) -> list | None:
+        if values is None:
+            return None
+        return list(values) if isinstance(values, (list, tuple, set)) else [values]
+
+    @staticmethod
+    def _narrow(previous: list | None, new: list | None) -> list | None:
+        """Both filters apply, i.e. only the values in both lists are kept"""
+        if previous is None:
+            return new
+        if new is None:
+            return previous
+        return [value for value in previous if value in new]
+
+    def filter(
+        self,
+        datasets: DataFolder | str | list[DataFolder | str] = None,
+        shoulder: list[int] | int = None,
+        mvt: list[str] | str = None,
+        joints: list[str] | str = None,
+    ) -> "SpartacusQuery":
+        """
+        Returns a new query narrowed by the filters, see Spartacus.load for the description of the filters.
+        Nothing is loaded.
+        """
+        new_query = SpartacusQuery(
+            datasets=datasets,
+            shoulder=shoulder,
+            mvt=mvt,
+            joints=joints,
+            unify=self.unify,
+            process_rotations=self.process_rotations,
+            process_translations=self.process_translations,
+            n_jobs=self.n_jobs,
+            cache=self.cache,
+        )
+        new_query.datasets = self._narrow(self.datasets, new_query.datasets)
+        new_query.shoulder = self._narrow(self.shoulder, new_query.shoulder)
+        new_query.mvt = self._narrow(self.mvt, new_query.mvt)
+        new_query.joints = self._narrow(self.joints, new_query.joints)
+        return new_query
+
+    @property
+    def joint_data(self) -> pd.DataFrame:
+        """The lines of dataset_clean_of_joint_data.csv selected by the query, without reading any curve"""
+        _, df_joint_data = read_dataset_csvs(
+            datasets=self.datasets, shoulder=self.shoulder, mvt=self.mvt, joints=self.joints
         )
+        return df_joint_data
+
+    def collect(self) -> "Spartacus":
+        """Load, check and correct the selected data, only once, and returns the Spartacus object"""
+        if self._spartacus is None:
+            df, df_joint_data = read_dataset_csvs(
+                datasets=self.datasets, shoulder=self.shoulder, mvt=self.mvt, joints=self.joints
+            )
+            # push the joint data filters down to the datasets: the compliances of other authors are not needed
+            df = df[df["dataset_id"].isin(df_joint_data["dataset_id"])]
+            self._spartacus = Spartacus(
+                datasets=df,
+                joint_data=df_joint_data,
+                unify=self.unify,
+                process_rotations=self.process_rotations,
+                process_translations=self.process_translations,
+                n_jobs=self.n_jobs,
+                cache=self.cache,
+            )
+        return self._spartacus
+
+    @property
+    def confident_data_values(self) -> pd.DataFrame:
+        """The confident data of the selection, materialized on first access"""
+        return self.collect().confident_data_values
+
+    @property
+    def corrected_confident_data_values(self) -> pd.DataFrame:
+        """The corrected confident data of the selection, materialized on first access"""
+        return self.collect().corrected_confident_data_values
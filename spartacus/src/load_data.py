@@ -5,6 +5,8 @@ This module is used to load the data from the csv file for individual datasets f
 import numpy as np
 import pandas as pd
 
+from .curve_store import get_curve_store
+
 
 def load_euler_csv(csv_filenames: tuple[str, str, str], drop_humerothoracic_raw_data: bool = True) -> pd.DataFrame:
     """
@@ -87,8 +89,14 @@ def load_euler_csv(csv_filenames: tuple[str, str, str], drop_humerothoracic_raw_
 
 
 def load_csv(csv_filenames, columns):
-    """Load the csv file from the filename and return a pandas dataframe."""
-    if csv_filenames is not None:
+    """
+    Load the csv file from the filename and return a pandas dataframe.
+    The curve is read from the curve store when it has been built and the csv file did not change since.
+    """
+    curve_store = get_curve_store()
+    if csv_filenames is not None and curve_store is not None and csv_filenames in curve_store:
+        csv_file_dof1 = curve_store.get_dataframe(csv_filenames, columns)
+    elif csv_filenames is not None:
         # print(f"Loading {csv_filenames}")
         csv_file_dof1 = pd.read_csv(csv_filenames, sep=",", header=None)
         csv_file_dof1.columns = columns
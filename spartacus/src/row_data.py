@@ -13,20 +13,11 @@ from .checks import (
     check_parent_child_joint,
     check_correction_methods,
 )
-from .compliance import SegmentCompliance, JointCompliance, TotalCompliance
+from .compliance import JointCompliance, TotalCompliance
 from .constants import REPEATED_DATAFRAME_KEYS
-from .corrections.angle_conversion_callbacks import (
-    isb_framed_rotation_matrix_from_euler_angles,
-    set_corrections_on_rotation_matrix,
-    rotation_matrix_2_euler_angles,
-    to_left_handed_frame,
-    quick_fix_x_rot_in_yxy_if_x_positive,
-    quick_fix_x_rot_in_yxy_from_matrix,
-    from_euler_angles_to_rotation_matrix,
-)
+from .corrections.correction_plan import CorrectionPlan, TranslationCorrectionPlan
 from .corrections.kolz_matrices import get_kolz_rotation_matrix
-from .corrections.unwrap_utils import unwrap_for_yxy_glenohumeral_joint
-from .corrections.euler_basis import from_jcs_to_parent_frame
+from .curve_store import get_curve_store
 from .enums_biomech import (
     Segment,
     FrameType,
@@ -43,7 +34,11 @@ from .utils import (
     get_is_isb_column,
     calculate_dof_values,
 )
-from .utils_setters import set_parent_segment_from_row, set_child_segment_from_row, set_thoracohumeral_angle_from_row
+from .utils_setters import (
+    compile_parent_segment_from_row,
+    compile_child_segment_from_row,
+    set_thoracohumeral_angle_from_row,
+)
 
 
 class RowData:
@@ -69,6 +64,8 @@ class RowData:
         self.right_side = row.side_as_right
         self.thoracohumeral_angle = None
 
+        self.parent_frame = None
+        self.child_frame = None
         self.parent_biomech_sys = None
         self.parent_corrections = None
 
@@ -104,9 +101,8 @@ class RowData:
         self.rotation_data_risk = None
         self.translation_data_risk = None
 
-        self.euler_angles_correction_callback = None
-        self.translation_correction_callback = None
-        self.translation_isb_matrix_callback = None
+        self.correction_plan = None
+        self.translation_correction_plan = None
 
         self.csv_filenames = None
         self.csv_translation_filenames = None
@@ -256,12 +252,15 @@ class RowData:
         """
         Set the parent and child segments of the joint.
         """
-        self.parent_biomech_sys = set_parent_segment_from_row(self.row, self.parent_segment)
-        self.child_biomech_sys = set_child_segment_from_row(self.row, self.child_segment)
+        self.parent_frame = compile_parent_segment_from_row(self.row, self.parent_segment)
+        self.child_frame = compile_child_segment_from_row(self.row, self.child_segment)
+        self.parent_biomech_sys = self.parent_frame.biomech_sys
+        self.child_biomech_sys = self.child_frame.biomech_sys
 
     def set_compliance(self):
-        self.parent_compliance = SegmentCompliance(bsys=self.parent_biomech_sys)
-        self.child_compliance = SegmentCompliance(bsys=self.child_biomech_sys)
+        # shared with the other rows using the same frames
+        self.parent_compliance = self.parent_frame.compliance
+        self.child_compliance = self.child_frame.compliance
 
         thoracohumeral_angle = set_thoracohumeral_angle_from_row(self.row)
         self.joint_compliance = JointCompliance(joint=self.joint, thoracohumeral_angle=thoracohumeral_angle)
@@ -436,9 +435,9 @@ class RowData:
 
     def set_rotation_correction_callback(self):
         """
-        The idea is to prepare a function ready to receive 3 Euler Angles (rot1, rot2, rot3) from any Euler Sequence,
+        The idea is to prepare a CorrectionPlan ready to receive a series of Euler Angles (N, 3) from any Euler Sequence,
         and from this sequence:
-        - Rebuild the corresponding rotation matrix R_proximal_distal
+        - Rebuild the corresponding rotation matrices R_proximal_distal, all samples at once
         - Convert into a rotation matrix into x antero-posterior, y infero-superior, z medio-lateral (right)
         - Switch to a left-handed coordinate system
         if the data are on the left side to have the sign as for the right side on Euler angles
@@ -452,46 +451,17 @@ class RowData:
         - 4th : R_proximal_distal = R_parent_correction @ R_proximal_distal @ R_child_correction
         - 5th : rot1, rot2, rot3 = euler_angles(R_proximal_distal, euler_sequence)
 
+        The constant matrices of the 2nd, 3rd and 4th steps are precomposed once in the plan.
         """
-        self.isb_rotation_matrix_callback = lambda rot1, rot2, rot3: isb_framed_rotation_matrix_from_euler_angles(
-            rot1=rot1,
-            rot2=rot2,
-            rot3=rot3,
-            previous_sequence_str=self.joint.euler_sequence.value,
-            bsys_parent=self.parent_biomech_sys,
-            bsys_child=self.child_biomech_sys,
-        )
-
-        if self.left_side:
-            self.mediolateral_matrix = lambda rot1, rot2, rot3: to_left_handed_frame(
-                self.isb_rotation_matrix_callback(rot1=rot1, rot2=rot2, rot3=rot3)
-            )
-        else:
-            self.mediolateral_matrix = self.isb_rotation_matrix_callback
-
         parent_matrix_correction = (
-            np.eye(3)
-            if self.parent_corrections is None
-            else get_kolz_rotation_matrix(correction=self.parent_corrections[0])
+            None if self.parent_corrections is None else get_kolz_rotation_matrix(correction=self.parent_corrections[0])
         )
         child_matrix_correction = (
-            np.eye(3)
-            if self.child_corrections is None
-            else get_kolz_rotation_matrix(correction=self.child_corrections[0])
-        )
-
-        self.correct_isb_rotation_matrix_callback = lambda rot1, rot2, rot3: set_corrections_on_rotation_matrix(
-            matrix=self.mediolateral_matrix(rot1, rot2, rot3),
-            child_matrix_correction=child_matrix_correction,
-            parent_matrix_correction=parent_matrix_correction,
-        )
-
-        self.euler_angles_correction_callback = lambda rot1, rot2, rot3: rotation_matrix_2_euler_angles(
-            rotation_matrix=self.correct_isb_rotation_matrix_callback(rot1, rot2, rot3),
-            euler_sequence=self.joint.isb_euler_sequence,
+            None if self.child_corrections is None else get_kolz_rotation_matrix(correction=self.child_corrections[0])
         )
 
         # enforce negative elevation
+        post_fixes = ()
         if self.joint.joint_type == JointType.GLENO_HUMERAL and self.row.humeral_motion in (
             "scapular plane elevation",
             "sagittal plane elevation",
@@ -500,12 +470,18 @@ class RowData:
             "internal-external rotation 90 degree-abducted",
             "horizontal flexion",
         ):
-            self.euler_angles_correction_callback = lambda rot1, rot2, rot3: quick_fix_x_rot_in_yxy_if_x_positive(
-                rotation_matrix_2_euler_angles(
-                    rotation_matrix=self.correct_isb_rotation_matrix_callback(rot1, rot2, rot3),
-                    euler_sequence=self.joint.isb_euler_sequence,
-                ),
-            )
+            post_fixes = ("negative_elevation_in_yxy",)
+
+        self.correction_plan = CorrectionPlan.from_segments(
+            source_sequence=self.joint.euler_sequence,
+            target_sequence=self.joint.isb_euler_sequence,
+            bsys_parent=self.parent_biomech_sys,
+            bsys_child=self.child_biomech_sys,
+            left_side=self.left_side,
+            parent_matrix_correction=parent_matrix_correction,
+            child_matrix_correction=child_matrix_correction,
+            post_fixes=post_fixes,
+        )
 
     def set_translation_correction_callback(self):
         """
@@ -521,30 +497,12 @@ class RowData:
         - transport local to distal SCS ?
 
         """
-        if self.joint.translation_frame == FrameType.JCS:
-            self.proximal_translation = lambda trans_x, trans_y, trans_z, rot1, rot2, rot3: from_jcs_to_parent_frame(
-                np.array([trans_x, trans_y, trans_z]), np.array([rot1, rot2, rot3]), self.joint.euler_sequence
-            )
-        else:
-            self.proximal_translation = lambda trans_x, trans_y, trans_z, rot1, rot2, rot3: np.eye(3) @ np.array(
-                [trans_x, trans_y, trans_z]
-            )
-
-        self.translation_isb_matrix_callback = (
-            lambda trans_x, trans_y, trans_z, rot1, rot2, rot3: self.parent_biomech_sys.get_rotation_matrix()
-            @ self.proximal_translation(trans_x, trans_y, trans_z, rot1, rot2, rot3)
+        self.translation_correction_plan = TranslationCorrectionPlan.from_segment(
+            bsys_parent=self.parent_biomech_sys,
+            left_side=self.left_side,
+            jcs_sequence=self.joint.euler_sequence if self.joint.translation_frame == FrameType.JCS else None,
         )
 
-        if self.left_side:
-            self.translation_mediolateral_matrix = (
-                lambda trans_x, trans_y, trans_z, rot1, rot2, rot3: self.translation_isb_matrix_callback(
-                    trans_x, trans_y, trans_z, rot1, rot2, rot3
-                )
-                * np.array([1, 1, -1])
-            )
-        else:
-            self.translation_mediolateral_matrix = self.translation_isb_matrix_callback
-
     @property
     def enough_compliant_for_translation(self) -> bool:
         """Check if the segment is compliant enough for merging translation data"""
@@ -759,7 +717,18 @@ class RowData:
         # check if correction.csv is in the folder
         manual_correction = [1, 1, 1]
         correction_csv = "corrections.csv"
-        if correction_csv in os.listdir(folder_path):
+        curve_store = get_curve_store()
+        if curve_store is not None and curve_store.has_corrections(folder_path):
+            for i, field in enumerate(["dof_1st_euler", "dof_2nd_euler", "dof_3rd_euler"]):
+                coefficient = (
+                    curve_store.get_correction(os.path.join(folder_path, self.row[field]))
+                    if self.row[field] is not None
+                    else None
+                )
+                if coefficient is not None:
+                    manual_correction[i] = coefficient
+
+        elif correction_csv in os.listdir(folder_path):
             correction_csv_path = os.path.join(folder_path, correction_csv)
             correction_df = pd.read_csv(correction_csv_path, sep=",", header=None)
             correction_df.columns = [
@@ -788,43 +757,20 @@ class RowData:
 
         return csv_paths
 
-    def apply_correction_in_radians(self, dof1, dof2, dof3) -> tuple[float, float, float]:
-        """Apply the correction to the angles in radians"""
+    def apply_correction_in_radians(self, dofs: np.ndarray) -> np.ndarray:
+        """Apply the correction to the angles in radians, dofs in degrees of shape (N, 3) are returned in degrees"""
+        return np.rad2deg(self.correction_plan.apply(np.deg2rad(dofs)))
 
-        rad_value_dof1 = np.deg2rad(dof1)
-        rad_value_dof2 = np.deg2rad(dof2)
-        rad_value_dof3 = np.deg2rad(dof3)
-
-        corrected_dof_1, corrected_dof_2, corrected_dof_3 = self.euler_angles_correction_callback(
-            rad_value_dof1, rad_value_dof2, rad_value_dof3
-        )
-
-        deg_corrected_dof_1 = np.rad2deg(corrected_dof_1)
-        deg_corrected_dof_2 = np.rad2deg(corrected_dof_2)
-        deg_corrected_dof_3 = np.rad2deg(corrected_dof_3)
-
-        return deg_corrected_dof_1, deg_corrected_dof_2, deg_corrected_dof_3
-
-    def apply_correction_to_translation(self, dof1, dof2, dof3, rot1, rot2, rot3) -> tuple[float, float, float]:
-        """Apply the correction to the translation in mm, as we use a matrix product, we need nan to be zeros"""
-
-        dof1 = dof1 if not np.isnan(dof1) else 0
-        dof2 = dof2 if not np.isnan(dof2) else 0
-        dof3 = dof3 if not np.isnan(dof3) else 0
-
-        rad_value_dof1 = np.deg2rad(rot1) if rot1 is not None else 0
-        rad_value_dof2 = np.deg2rad(rot2) if rot2 is not None else 0
-        rad_value_dof3 = np.deg2rad(rot3) if rot3 is not None else 0
-
-        corrected_dof_1, corrected_dof_2, corrected_dof_3 = self.translation_mediolateral_matrix(
-            dof1, dof2, dof3, rad_value_dof1, rad_value_dof2, rad_value_dof3
-        )
+    def apply_correction_to_translation(self, translations: np.ndarray, rotations: np.ndarray) -> np.ndarray:
+        """
+        Apply the correction to the translations in mm of shape (N, 3), given the rotations in degrees of shape (N, 3),
+        as we use a matrix product, we need nan to be zeros
+        """
+        translations = np.where(np.isnan(translations), 0, translations)
 
-        deg_corrected_dof_1 = corrected_dof_1 if corrected_dof_1 != 0 else np.nan
-        deg_corrected_dof_2 = corrected_dof_2 if corrected_dof_2 != 0 else np.nan
-        deg_corrected_dof_3 = corrected_dof_3 if corrected_dof_3 != 0 else np.nan
+        corrected_translations = self.translation_correction_plan.apply(translations, np.deg2rad(rotations))
 
-        return deg_corrected_dof_1, deg_corrected_dof_2, deg_corrected_dof_3
+        return np.where(corrected_translations != 0, corrected_translations, np.nan)
 
 
 def get_empty_series_dataframe():
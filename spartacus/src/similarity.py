@@ -0,0 +1,182 @@
+"""
+This module indexes the resampled curves of the database to find the shoulders closest to new curves, e.g. a patient.
+
+The curves are only compared within their (joint, humeral_motion, unit), each group has its own search tree, on:
+    - 'pca': the scores of the curves on the functional principal components of the group, a few numbers per curve,
+    - 'curves': the curves at the angles kept by the functional PCA, the missing values imputed by its reconstruction.
+The components are orthonormal, so both distances are the distances between curves, exact in the 'curves' space and
+between the low-rank reconstructions in the 'pca' space. The distances are root mean squares over the angles and the
+dofs, in the unit of the curves.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from .curve_tensor import CurveTensor
+from .functional_pca import FunctionalPCA, fit_functional_pca
+
+SIMILARITY_KEYS = ("article", "joint", "humeral_motion", "shoulder_id", "unit")
+SPACES = ("pca", "curves")
+
+
+def compliance_columns(rows: pd.DataFrame) -> list[str]:
+    """The compliance flags of the metadata, e.g. parent_compliance_1, total_compliance, fully_isb"""
+    return [column for column in rows.columns if "compliance" in column or column == "fully_isb"]
+
+
+class CurveIndex:
+    """
+    A nearest neighbors index of the curves, per (joint, humeral_motion, unit)
+
+    Attributes
+    ----------
+    fpca : FunctionalPCA
+        The functional PCA of the curves, whose basis the new curves are projected on
+    space : str
+        'pca' or 'curves', the vectors of the trees
+    vectors : list[np.ndarray]
+        The vectors of the curves of each group, shape (row of the group, dimension)
+    rows : list[np.ndarray]
+        The rows of fpca.rows of each group, in the order of the vectors
+    trees : list[cKDTree | None]
+        The search tree of each group, None if the group has no curve
+    """
+
+    def __init__(self, fpca: FunctionalPCA, values: np.ndarray = None, space: str = "pca", leafsize: int = 16):
+        """
+        Parameters
+        ----------
+        fpca: FunctionalPCA
+            The functional PCA of the curves
+        values: np.ndarray
+            The curves the functional PCA was fitted on, shape (row, dof, grid), needed by the 'curves' space
+        space: str
+            'pca' (default), the scores of the curves, or 'curves', the curves at the angles kept by the PCA
+        leafsize: int
+            The number of curves of the leaves of the trees
+        """
+        if space not in SPACES:
+            raise ValueError(f"{space} is not a valid space, must be one of {SPACES}.")
+        if space == "curves" and values is None:
+            raise ValueError("The curves are needed to index the 'curves' space.")
+
+        self.fpca = fpca
+        self.space = space
+        if space == "curves":
+            values = values.reshape(len(fpca), -1)
+            values = np.where(np.isnan(values), fpca.reconstruct().reshape(len(fpca), -1), values)
+
+        self.vectors, self.rows, self.trees = [], [], []
+        for group in range(fpca.groups.shape[0]):
+            rows = np.flatnonzero(fpca.codes == group)
+            if space == "pca":
+                vectors = fpca.scores[rows][:, self._has_component(group)]
+            else:
+                vectors = values[rows][:, self._kept(group)]
+            self.vectors.append(vectors)
+            self.rows.append(rows)
+            self.trees.append(cKDTree(vectors, leafsize=leafsize) if vectors.size else None)
+
+    @classmethod
+    def from_tensor(
+        cls,
+        tensor: CurveTensor,
+        space: str = "pca",
+        n_components: int = 5,
+        min_coverage: float = 0.5,
+        filters: dict = None,
+        leafsize: int = 16,
+    ) -> "CurveIndex":
+        """
+        Fit the functional PCA of the curves and index them
+
+        Parameters
+        ----------
+        tensor: CurveTensor
+            The resampled curves, see CurveTensor.from_confident_data or import_curve_tensor
+        space: str
+            'pca' (default), the scores of the curves, or 'curves', the curves at the angles kept by the PCA
+        n_components: int
+            The number of components of the functional PCA, see fit_functional_pca
+        min_coverage: float
+            The angles of a group where less than this fraction of its curves have values are not compared
+        filters: dict
+            Only index the rows whose metadata match the filters, e.g. {"fully_isb": True}
+        leafsize: int
+            The number of curves of the leaves of the trees
+        """
+        if filters:
+            tensor = tensor.filter(filters)
+        fpca = fit_functional_pca(tensor, n_components=n_components, min_coverage=min_coverage)
+        return cls(fpca, values=tensor.values, space=space, leafsize=leafsize)
+
+    def _kept(self, group: int) -> np.ndarray:
+        return ~np.isnan(self.fpca.means[group].ravel())
+
+    def _has_component(self, group: int) -> np.ndarray:
+        return ~np.isnan(self.fpca.components[group]).all(axis=(1, 2))
+
+    def _query_vectors(self, values: np.ndarray, group: int) -> np.ndarray:
+        scores = self.fpca.project(values, group)
+        if self.space == "pca":
+            return scores[:, self._has_component(group)]
+        kept = self._kept(group)
+        reconstruction = self.fpca.means[group].ravel() + np.nan_to_num(scores) @ np.nan_to_num(
+            self.fpca.components[group].reshape(self.fpca.n_components, -1)
+        )
+        values = values.reshape(values.shape[0], -1)
+        values = np.where(np.isnan(values), reconstruction, values)
+        # nan for the curves that could not be projected, without any value at the kept angles
+        return np.where(np.isnan(scores).all(axis=1)[:, np.newaxis], np.nan, values[:, kept])
+
+    def query(self, values: np.ndarray, joint: str, humeral_motion: str, unit: str = "rad", k: int = 5) -> pd.DataFrame:
+        """
+        Find the curves of the database closest to new curves
+
+        Parameters
+        ----------
+        values: np.ndarray
+            The new curves, resampled on the grid of the index, e.g. with resample_curves, nan where missing,
+            shape (dof, grid) or (curve, dof, grid)
+        joint: str
+            The joint of the new curves, e.g. 'scapulothoracic'
+        humeral_motion: str
+            The humeral motion of the new curves, e.g. 'scapular plane elevation'
+        unit: str
+            'rad' (default) or 'mm'
+        k: int
+            The number of neighbors of each curve
+
+        Returns
+        -------
+        pd.DataFrame
+            One line per new curve and neighbor: the new curve 'query', the 'rank' of the neighbor,
+            its article, joint, humeral_motion, shoulder_id and unit, the root mean square 'distance'
+            in the unit of the curves, and its compliance flags
+        """
+        group = self.fpca.group_index(joint, humeral_motion, unit)
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.newaxis] if values.ndim == 2 else values
+        vectors = self._query_vectors(values, group)
+        # the curves without any value at the angles of the group cannot be placed
+        queries = np.flatnonzero(~np.isnan(vectors).any(axis=1))
+
+        k = min(k, self.rows[group].size)
+        flags = compliance_columns(self.fpca.rows)
+        if self.trees[group] is None or not queries.size or not k:
+            return pd.DataFrame(columns=["query", "rank", *SIMILARITY_KEYS, "distance", *flags])
+
+        distances, neighbors = self.trees[group].query(vectors[queries], k=list(range(1, k + 1)))
+        df = self.fpca.rows.iloc[self.rows[group][neighbors.ravel()]][[*SIMILARITY_KEYS, *flags]]
+        df = df.reset_index(drop=True)
+        df.insert(0, "query", np.repeat(queries, k))
+        df.insert(1, "rank", np.tile(np.arange(1, k + 1), queries.size))
+        df.insert(2 + len(SIMILARITY_KEYS), "distance", distances.ravel() / np.sqrt(self._kept(group).sum()))
+        return df
+
+    def __len__(self) -> int:
+        return len(self.fpca)
+
+    def __repr__(self) -> str:
+        return f"CurveIndex({len(self)} curves, {len(self.trees)} groups, space={self.space})"
@@ -1,4 +1,8 @@
-import biorbd
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+
 import numpy as np
 import pandas as pd
 
@@ -6,8 +10,10 @@ from .enums_biomech import Segment, JointType, EulerSequence
 from .constants import REPEATED_DATAFRAME_KEYS
 
 
-def mat_2_rotation(R: np.ndarray) -> biorbd.Rotation:
+def mat_2_rotation(R: np.ndarray) -> "biorbd.Rotation":
     """Convert a 3x3 matrix to a biorbd.Rotation"""
+    import biorbd
+
     return biorbd.Rotation(R[0, 0], R[0, 1], R[0, 2], R[1, 0], R[1, 1], R[1, 2], R[2, 0], R[2, 1], R[2, 2])
 
 
@@ -19,14 +25,14 @@ def flip_rotations(angles: np.ndarray, seq: str) -> np.ndarray:
     Parameters
     ----------
     angles: np.ndarray
-        The rotation angles
+        The rotation angles in radians, shape (3,), (N, 3) or any stack (..., 3)
     seq: str
         The sequence of the rotation angles
 
     Returns
     -------
     np.ndarray
-        The rotation angles flipped
+        The rotation angles flipped, same shape as angles, angles is left untouched
 
 
     Source
@@ -56,16 +62,15 @@ def flip_rotations(angles: np.ndarray, seq: str) -> np.ndarray:
     - Third angle belongs to [-180, 180] degrees (both inclusive)
     """
     offset = np.pi  # only in radians
+    angles = np.array(angles, dtype=np.float64)
 
+    angles[..., 0] = np.mod(angles[..., 0], 2 * offset) - offset
     if seq[0] == seq[2]:  # Euler angles
-        angles[0] = np.mod(angles[0], 2 * offset) - offset
-        angles[1] = -angles[1]
-        angles[2] = np.mod(angles[2], 2 * offset) - offset
+        angles[..., 1] = -angles[..., 1]
     else:  # Tait-Bryan angles
-        angles[0] = np.mod(angles[0], 2 * offset) - offset
-        angles[1] = offset - angles[1]
-        angles[angles[1] > offset, :] -= 2 * offset
-        angles[2] = np.mod(angles[2], 2 * offset) - offset
+        angles[..., 1] = offset - angles[..., 1]
+        angles[..., 1] -= 2 * offset * (angles[..., 1] > offset)
+    angles[..., 2] = np.mod(angles[..., 2], 2 * offset) - offset
 
     return angles
 
@@ -172,7 +177,9 @@ def convert_df_to_1dof_per_line(df: pd.DataFrame) -> pd.DataFrame:
     stacking dof 1 then dof2 and then dof 3 under each others
     """
 
-    first_dict = {key: df[key].values[:, np.newaxis].repeat(3, axis=1).T.flatten() for key in REPEATED_DATAFRAME_KEYS}
+    first_dict = {
+        key: df[key].to_numpy()[:, np.newaxis].repeat(3, axis=1).T.flatten() for key in REPEATED_DATAFRAME_KEYS
+    }
     second_dict = {
         # cast to float so the numeric columns are float64 and not object: since pandas 3.0,
         # concatenating onto an empty (object-dtype) dataframe keeps the object dtype, which would
@@ -191,11 +198,84 @@ def convert_df_to_1dof_per_line(df: pd.DataFrame) -> pd.DataFrame:
     return df_transformed
 
 
+def align_rotation_samples(
+    humerothoracic_angles: np.ndarray,
+    rotation_data: pd.DataFrame,
+    tolerance: float = 1e-6,
+    interpolate: bool = False,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pair each humerothoracic angle of the translation samples with the rotation sample of the same angle,
+    in one pass over the sorted rotation angles, instead of filtering the rotation data for each sample.
+
+    Parameters
+    ----------
+    humerothoracic_angles: np.ndarray
+        The humerothoracic angles of the translation samples, shape (N,)
+    rotation_data: pd.DataFrame
+        The rotation data, only the lines whose unit is "rad" are used
+    tolerance: float
+        The maximal difference between the humerothoracic angles of a translation sample and its rotation sample.
+        If several rotation samples share the same angle, the first one is used.
+    interpolate: bool
+        If True, the rotation values are linearly interpolated, dof by dof, between the two rotation samples
+        surrounding the angle, when the angle is not within the tolerance of a rotation sample.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The rotation values (value_dof1, value_dof2, value_dof3) of each translation sample, shape (N, 3),
+        and a boolean mask of the translation samples that found a rotation sample, shape (N,)
+    """
+    humerothoracic_angles = np.asarray(humerothoracic_angles, dtype=np.float64)
+    values = np.full((humerothoracic_angles.shape[0], 3), np.nan)
+    matched = np.zeros(humerothoracic_angles.shape[0], dtype=bool)
+
+    if rotation_data is None or rotation_data.empty:
+        return values, matched
+
+    rotation_data = rotation_data[rotation_data["unit"] == "rad"]
+    rotation_angles = rotation_data["humerothoracic_angle"].to_numpy(dtype=np.float64)
+    rotation_values = rotation_data[["value_dof1", "value_dof2", "value_dof3"]].to_numpy(dtype=np.float64)
+    is_valid = ~np.isnan(rotation_angles)
+    rotation_angles, rotation_values = rotation_angles[is_valid], rotation_values[is_valid]
+    if rotation_angles.shape[0] == 0:
+        return values, matched
+
+    # sorted angles, keeping the first rotation sample of each angle
+    sorted_angles, first_index = np.unique(rotation_angles, return_index=True)
+    sorted_values = rotation_values[first_index]
+
+    # nearest rotation sample among the two surrounding each angle
+    right = np.clip(np.searchsorted(sorted_angles, humerothoracic_angles), 0, sorted_angles.shape[0] - 1)
+    left = np.clip(right - 1, 0, sorted_angles.shape[0] - 1)
+    right_distance = np.abs(sorted_angles[right] - humerothoracic_angles)
+    left_distance = np.abs(sorted_angles[left] - humerothoracic_angles)
+    nearest = np.where(left_distance < right_distance, left, right)
+    distance = np.minimum(left_distance, right_distance)
+
+    matched = distance <= tolerance  # False for nan angles
+    values[matched] = sorted_values[nearest[matched]]
+
+    if interpolate and sorted_angles.shape[0] > 1:
+        in_range = (humerothoracic_angles >= sorted_angles[0]) & (humerothoracic_angles <= sorted_angles[-1])
+        to_interpolate = in_range & ~matched
+        for i in range(3):
+            values[to_interpolate, i] = np.interp(
+                humerothoracic_angles[to_interpolate], sorted_angles, sorted_values[:, i]
+            )
+        matched = matched | to_interpolate
+
+    return values, matched
+
+
 def calculate_dof_values(
     data: pd.DataFrame,
     correction_callable: callable = None,
     rotation: bool = None,
     rotation_data: pd.DataFrame = None,
+    tolerance: float = 1e-6,
+    interpolate: bool = False,
 ) -> np.ndarray:
     """
     Calculate the dof values, assign values of correction if needed
@@ -205,22 +285,23 @@ def calculate_dof_values(
     data : pd.DataFrame
         The data to calculate the dof values
     correction_callable : callable, optional
-        The callable to apply the correction, by default None, thus no correction applied
+        The callable to apply the correction, by default None, thus no correction applied.
+        For rotations, it receives all the samples at once as an array of shape (N, 3).
+        For translations, it receives all the translations and their rotations at once, two arrays of shape (N, 3).
     rotation : bool, optional
         If True, apply the correction on rotation data, by default None
     rotation_data : pd.DataFrame, optional
         The rotation data to use for correction, by default None
+    tolerance : float, optional
+        For translations, the maximal difference between the humerothoracic angles of a translation sample
+        and of the rotation sample used to correct it, see align_rotation_samples
+    interpolate : bool, optional
+        For translations, interpolate the rotation data between the humerothoracic angles, see align_rotation_samples
     """
     value_dof = np.zeros((data.shape[0], 3))
 
     if correction_callable is not None and rotation:
-        for i, row in enumerate(data.itertuples()):
-            corrected_dof_1, corrected_dof_2, corrected_dof_3 = correction_callable(
-                row.value_dof1, row.value_dof2, row.value_dof3
-            )
-            value_dof[i, 0] = corrected_dof_1
-            value_dof[i, 1] = corrected_dof_2
-            value_dof[i, 2] = corrected_dof_3
+        value_dof[:, :] = correction_callable(data[["value_dof1", "value_dof2", "value_dof3"]].to_numpy(dtype=float))
 
         mvt = data["humeral_motion"].unique()[0]
         joint = data["joint"].unique()[0]
@@ -231,29 +312,18 @@ def calculate_dof_values(
         return value_dof
 
     elif correction_callable is not None and not rotation:
-
-        for i, row in enumerate(data.itertuples()):
-            # get the rotation data for the corresponding translation values for further correction if needed (jcs to proximal)
-            translation_th_angle = row.humerothoracic_angle
-            subrotation_data = rotation_data[rotation_data["humerothoracic_angle"] == translation_th_angle]
-            subrotation_data = subrotation_data[subrotation_data["unit"] == "rad"]
-            if rotation_data.empty:
-                rot1, rot2, rot3 = None, None, None
-            else:
-                # todo: TO REMOVE !!
-                try:
-                    rot1 = subrotation_data["value_dof1"].values[0]
-                    rot2 = subrotation_data["value_dof2"].values[0]
-                    rot3 = subrotation_data["value_dof3"].values[0]
-                except:
-                    rot1, rot2, rot3, seq = None, None, None, None
-
-            corrected_dof_1, corrected_dof_2, corrected_dof_3 = correction_callable(
-                row.value_dof1, row.value_dof2, row.value_dof3, rot1, rot2, rot3
-            )
-            value_dof[i, 0] = corrected_dof_1
-            value_dof[i, 1] = corrected_dof_2
-            value_dof[i, 2] = corrected_dof_3
+        # get the rotation data for the corresponding translation values for further correction if needed (jcs to proximal)
+        rotation_values, has_rotation = align_rotation_samples(
+            data["humerothoracic_angle"].to_numpy(dtype=float),
+            rotation_data,
+            tolerance=tolerance,
+            interpolate=interpolate,
+        )
+        # the translations without rotation sample are corrected with null angles
+        rotation_values[~has_rotation] = 0
+        value_dof[:, :] = correction_callable(
+            data[["value_dof1", "value_dof2", "value_dof3"]].to_numpy(dtype=float), rotation_values
+        )
 
         mvt = data["humeral_motion"].unique()[0]
         joint = data["joint"].unique()[0]
@@ -269,3 +339,73 @@ def calculate_dof_values(
         value_dof[:, 1] = data["value_dof2"].values
         value_dof[:, 2] = data["value_dof3"].values
         return value_dof
+
+
+def effective_n_jobs(n_jobs: int = None) -> int:
+    """
+    Returns the number of processes of n_jobs, as joblib: None is serial, -1 uses all the cpus,
+    -2 all the cpus but one, etc., at least one process
+
+    Parameters
+    ----------
+    n_jobs: int
+        The number of processes, a negative value counts from the number of cpus
+    """
+    if n_jobs is None:
+        return 1
+    if n_jobs == 0:
+        raise ValueError("n_jobs == 0 has no meaning, use None or 1 to run serially.")
+    if n_jobs < 0:
+        return max(os.cpu_count() + 1 + n_jobs, 1)
+    return n_jobs
+
+
+def process_imap(function: callable, items: Iterable, n_jobs: int = None) -> Iterator:
+    """
+    Apply the function on the items, in worker processes if n_jobs > 1, and yield the results in the order of the items
+    as soon as they are ready. At most 2 * n_jobs items are processed ahead of the consumer, so the memory does not
+    grow with the number of items, and a consumer that stops early only waits for the items being processed.
+
+    Parameters
+    ----------
+    function: callable
+        A function of the module level, so that it can be sent to the worker processes
+    items: Iterable
+        The arguments of the function, one call per item, read lazily
+    n_jobs: int
+        The number of processes, see effective_n_jobs, serial by default
+    """
+    n_workers = effective_n_jobs(n_jobs)
+    if n_workers <= 1:
+        for item in items:
+            yield function(item)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=n_workers)
+    try:
+        futures = deque()
+        for item in items:
+            futures.append(executor.submit(function, item))
+            if len(futures) >= 2 * n_workers:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+    finally:
+        # the items that are not being processed yet are cancelled
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def process_map(function: callable, items: list, n_jobs: int = None) -> list:
+    """
+    Apply the function on the items, in worker processes if n_jobs > 1, the results are in the order of the items
+
+    Parameters
+    ----------
+    function: callable
+        A function of the module level, so that it can be sent to the worker processes
+    items: list
+        The arguments of the function, one call per item
+    n_jobs: int
+        The number of processes, see effective_n_jobs, serial by default
+    """
+    return list(process_imap(function, items, n_jobs=n_jobs if len(items) > 1 else None))
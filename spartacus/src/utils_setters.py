@@ -1,57 +1,46 @@
 from .biomech_system import BiomechCoordinateSystem
 
 from .enums_biomech import Segment, JointType, EulerSequence, AnatomicalLandmark, FrameType
-from .frame_reader import Frame
+from .frame_registry import CompiledFrame, compile_frame
 from .joint import Joint
 from .thoracohumeral_angle import ThoracohumeralAngle
 from .utils import get_segment_columns_direction
 
 
-def set_parent_segment_from_row(row, segment: Segment):
+def compile_parent_segment_from_row(row, segment: Segment) -> CompiledFrame:
     segment_cols_direction = get_segment_columns_direction(segment)
-    method = (
-        Frame.from_global_thorax_strings
-        if segment == Segment.THORAX and row.thorax_is_global
-        else Frame.from_xyz_string
-    )
-    frame_parent = method(
+    return compile_frame(
+        segment=segment,
         x_axis=row[segment_cols_direction[0]],
         y_axis=row[segment_cols_direction[1]],
         z_axis=row[segment_cols_direction[2]],
         origin=row[segment_cols_direction[3]],
-        segment=segment,
         # side="right" if row.side_as_right or segment == Segment.THORAX else row.side,
         side="right" if row.side_as_right or segment == Segment.THORAX else "left",
+        thorax_is_global=bool(segment == Segment.THORAX and row.thorax_is_global),
     )
-    parent_biomech_sys = BiomechCoordinateSystem.from_frame(frame_parent)
-    return parent_biomech_sys
 
 
-def set_child_segment_from_row(row, segment: Segment):
+def compile_child_segment_from_row(row, segment: Segment) -> CompiledFrame:
     segment_cols_direction = get_segment_columns_direction(segment)
-    frame_child = Frame.from_xyz_string(
+    return compile_frame(
+        segment=segment,
         x_axis=row[segment_cols_direction[0]],
         y_axis=row[segment_cols_direction[1]],
         z_axis=row[segment_cols_direction[2]],
         origin=row[segment_cols_direction[3]],
-        segment=segment,
         side="right" if row.side_as_right else row.side,
+        # for Nishinaka for example
+        allow_only_translation=True,
     )
 
-    if frame_child.only_translation:
-        # for Nishinaka for example
-        child_biomech_sys = BiomechCoordinateSystem(
-            antero_posterior_axis=None,
-            infero_superior_axis=None,
-            medio_lateral_axis=None,
-            origin=frame_child.origin,
-            segment=segment,
-            frame=frame_child,
-        )
-    else:
-        child_biomech_sys = BiomechCoordinateSystem.from_frame(frame_child)
-
-    return child_biomech_sys
+
+def set_parent_segment_from_row(row, segment: Segment) -> BiomechCoordinateSystem:
+    return compile_parent_segment_from_row(row, segment).biomech_sys
+
+
+def set_child_segment_from_row(row, segment: Segment) -> BiomechCoordinateSystem:
+    return compile_child_segment_from_row(row, segment).biomech_sys
 
 
 def set_joint_from_row(row, joint: JointType):
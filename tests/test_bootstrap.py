@@ -0,0 +1,86 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from spartacus.src.bootstrap import bootstrap_corridors, resample_counts, sorted_quantiles
+from spartacus.src.corridors import compute_corridors
+
+from .utils import TestUtils
+
+
+def test_resample_counts():
+    rng = np.random.default_rng(0)
+    rows_per_article = np.array([3, 1, 4])
+    articles = np.repeat(np.arange(3), rows_per_article)
+
+    counts = resample_counts(rng, rows_per_article, 500)
+    assert counts.shape == (500, 8)
+    # each drawn article brings as many rows as it has
+    per_article = np.stack([counts[:, articles == article].sum(axis=1) for article in range(3)], axis=1)
+    assert np.all(per_article % rows_per_article == 0)
+    assert np.all((per_article // rows_per_article).sum(axis=1) == 3)
+    assert not np.all(counts[:, articles == 2] == counts[:, [5]])
+
+    articles_only = resample_counts(rng, rows_per_article, 500, levels=("article",))
+    assert np.all(articles_only[:, articles == 2] == articles_only[:, [5]])
+    assert np.all(articles_only[:, articles == 0].sum(axis=1) % 3 == 0)
+
+    shoulders_only = resample_counts(rng, rows_per_article, 500, levels=("shoulder",))
+    np.testing.assert_array_equal(shoulders_only[:, articles == 1], 1)
+    np.testing.assert_array_equal(shoulders_only[:, articles == 2].sum(axis=1), 4)
+
+
+def test_sorted_quantiles_match_numpy():
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=(6, 101))
+    values[rng.random(values.shape) < 0.2] = np.nan
+    values[0] = np.nan
+    values[1, 1:] = np.nan
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        expected = np.nanquantile(values, (0.025, 0.5, 0.975), axis=1)
+    np.testing.assert_allclose(sorted_quantiles(np.sort(values, axis=1), (0.025, 0.5, 0.975)), expected)
+
+
+def test_bootstrap_corridors_are_reproducible_and_consistent():
+    tensor = TestUtils.random_curve_tensor()
+    bootstrap = bootstrap_corridors(tensor, n_resamples=400, seed=3)
+
+    assert list(bootstrap.statistics) == ["mean", "se", "ci_lower", "ci_upper"]
+    np.testing.assert_allclose(bootstrap["mean"], compute_corridors(tensor)["mean"])
+    has_spread = bootstrap.n_rows > 1
+    assert np.all(bootstrap["ci_lower"][has_spread] <= bootstrap["ci_upper"][has_spread])
+    assert np.all(bootstrap["se"][has_spread] > 0)
+    assert np.isnan(bootstrap["se"][bootstrap.n_rows == 0]).all()
+
+    again = bootstrap_corridors(tensor, n_resamples=400, seed=3)
+    for statistic in bootstrap.statistics:
+        np.testing.assert_array_equal(again[statistic], bootstrap[statistic])
+    other_seed = bootstrap_corridors(tensor, n_resamples=400, seed=4)
+    assert not np.array_equal(other_seed["ci_lower"], bootstrap["ci_lower"], equal_nan=True)
+
+    with pytest.raises(ValueError, match="not valid bootstrap levels"):
+        bootstrap_corridors(tensor, levels=("subject",))
+
+
+def test_bootstrap_corridors_do_not_depend_on_the_processes():
+    tensor = TestUtils.random_curve_tensor()
+    serial = bootstrap_corridors(tensor, n_resamples=200, seed=7, batch_size=64)
+    parallel = bootstrap_corridors(tensor, n_resamples=200, seed=7, batch_size=64, n_jobs=2)
+    for statistic in serial.statistics:
+        np.testing.assert_array_equal(parallel[statistic], serial[statistic])
+
+
+def test_bootstrap_standard_error_of_the_shoulders():
+    tensor = TestUtils.random_curve_tensor()
+    # without missing values, every resample has as many shoulders as the data at every angle
+    tensor.values = np.nan_to_num(tensor.values, nan=1.0)
+    bootstrap = bootstrap_corridors(tensor, n_resamples=4000, levels=("shoulder",), seed=0)
+
+    # the bootstrap standard error of a mean of n shoulders tends to sd * sqrt((n - 1) / n) / sqrt(n)
+    corridors = compute_corridors(tensor)
+    n_rows = corridors.n_rows
+    expected = corridors["sd"] * np.sqrt((n_rows - 1) / n_rows) / np.sqrt(n_rows)
+    np.testing.assert_allclose(bootstrap["se"], expected, rtol=0.06)
@@ -0,0 +1,108 @@
+import shutil
+
+import pandas as pd
+
+from spartacus import Spartacus, DataFolder
+from spartacus.src import cache
+from spartacus.src.cache import row_cache_key, row_cache_keys, load_cached_row
+
+
+def test_row_cache_key_changes_with_the_row():
+    sp = Spartacus.load(datasets=DataFolder.BOURNE_2003, unify=False)
+    row = sp.check_dataset_segments().iloc[0]
+
+    assert row_cache_key(row) == row_cache_key(row.copy())
+    assert row_cache_key(row) != row_cache_key(row, process_translations=False)
+
+    modified_row = row.copy()
+    modified_row["humeral_motion"] = "another motion"
+    assert row_cache_key(row) != row_cache_key(modified_row)
+
+
+def test_cached_load_matches_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_FOLDER", tmp_path)
+
+    expected = Spartacus.load(datasets=DataFolder.BOURNE_2003)
+    first_load = Spartacus.load(datasets=DataFolder.BOURNE_2003, cache=True)
+    keys = [row_cache_key(row) for _, row in first_load.confident_dataframe.iterrows()]
+    assert all(load_cached_row(key) is not None for key in keys)
+
+    second_load = Spartacus.load(datasets=DataFolder.BOURNE_2003, cache=True)
+    for sp in (first_load, second_load):
+        pd.testing.assert_frame_equal(sp.confident_data_values, expected.confident_data_values)
+        pd.testing.assert_frame_equal(sp.corrected_confident_data_values, expected.corrected_confident_data_values)
+
+
+def test_hash_files_only_reads_the_modified_files(tmp_path, monkeypatch):
+    files = [tmp_path / f"{name}.csv" for name in ("a", "b")]
+    for file in files:
+        file.write_text(f"content of {file.name}")
+
+    read_files = []
+    hash_file = cache.hash_file
+    monkeypatch.setattr(cache, "hash_file", lambda path: read_files.append(path) or hash_file(path))
+
+    first_hashes = cache.hash_files(files, cache_folder=tmp_path)
+    assert read_files == files
+    assert first_hashes == [hash_file(file) for file in files]
+
+    read_files.clear()
+    assert cache.hash_files(files, cache_folder=tmp_path) == first_hashes
+    assert read_files == []
+
+    files[1].write_text("new content")
+    second_hashes = cache.hash_files(files, cache_folder=tmp_path)
+    assert read_files == [files[1]]
+    assert second_hashes[0] == first_hashes[0] and second_hashes[1] == hash_file(files[1])
+
+
+def test_parallel_load_saves_the_rows_whose_cache_is_corrupt(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_FOLDER", tmp_path)
+    expected = Spartacus.load(datasets=DataFolder.BOURNE_2003, cache=True)
+    cached_file = sorted(tmp_path.glob("*.pkl"))[0]
+    cached_file.write_bytes(b"corrupt")
+    key = cached_file.stem
+    assert load_cached_row(key) is None
+
+    reloaded = Spartacus.load(datasets=DataFolder.BOURNE_2003, cache=True, n_jobs=2)
+    pd.testing.assert_frame_equal(reloaded.corrected_confident_data_values, expected.corrected_confident_data_values)
+    assert load_cached_row(key) is not None
+
+
+def test_row_cache_keys_read_each_file_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_FOLDER", tmp_path)
+    rows = Spartacus.load(datasets=DataFolder.BOURNE_2003, unify=False).check_dataset_segments()
+
+    read_files = []
+    hash_file = cache.hash_file
+    monkeypatch.setattr(cache, "hash_file", lambda path: read_files.append(path) or hash_file(path))
+
+    keys = row_cache_keys(rows)
+    # the corrections.csv of the folder is shared by the rows, it is read once
+    assert read_files and len(read_files) == len(set(read_files))
+
+    read_files.clear()
+    assert row_cache_keys(rows) == keys
+    assert keys == [row_cache_key(row) for _, row in rows.iterrows()]
+    assert read_files == []
+
+
+def test_correction_code_version_only_hashes_the_correction_code(tmp_path, monkeypatch):
+    for name in cache.CORRECTION_CODE:
+        source = cache.CODE_FOLDER / name
+        if source.is_dir():
+            shutil.copytree(source, tmp_path / name, ignore=shutil.ignore_patterns("__pycache__"))
+        else:
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(source, tmp_path / name)
+    version = cache.correction_code_version.__wrapped__()
+
+    monkeypatch.setattr(cache, "CODE_FOLDER", tmp_path)
+    assert cache.correction_code_version.__wrapped__() == version
+
+    (tmp_path / "src" / "similarity.py").write_text("# not used to correct a row")
+    assert cache.correction_code_version.__wrapped__() == version
+
+    with open(tmp_path / "src" / "corrections" / "correction_plan.py", "a") as f:
+        f.write("# edited")
+    assert cache.correction_code_version.__wrapped__() != version
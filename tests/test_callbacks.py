@@ -3,6 +3,7 @@ from spartacus.src.corrections.angle_conversion_callbacks import (
     get_angle_conversion_callback_from_tuple,
     EulerSequence,
 )
+import numpy as np
 import pytest
 
 
@@ -20,14 +21,26 @@ def test_checks():
         get_angle_conversion_callback_from_sequence(EulerSequence.XYZ, EulerSequence.XYZ)
 
     callack = get_angle_conversion_callback_from_sequence(EulerSequence.XYZ, EulerSequence.XZY)
-    assert tuple(callack(1, 2, 3)) == (-2.2704912057792535, -0.0587604536838258, 1.1453860614822349)
+    np.testing.assert_almost_equal(
+        callack(1, 2, 3), (-2.2704912057792535, -0.0587604536838258, 1.1453860614822349), decimal=14
+    )
     callack = get_angle_conversion_callback_from_sequence(EulerSequence.XYZ, EulerSequence.YXZ)
-    assert tuple(callack(1, 2, 3)) == (1.8132071664631333, -0.3577584477324125, -2.3272248511837774)
+    np.testing.assert_almost_equal(
+        callack(1, 2, 3), (1.8132071664631333, -0.3577584477324125, -2.3272248511837774), decimal=14
+    )
     callack = get_angle_conversion_callback_from_sequence(EulerSequence.XYZ, EulerSequence.YZX)
-    assert tuple(callack(1, 2, 3)) == (-0.9730597100541793, -0.7494588683753458, -2.6428244606568714)
+    np.testing.assert_almost_equal(
+        callack(1, 2, 3), (-0.9730597100541793, -0.7494588683753458, -2.6428244606568714), decimal=14
+    )
     callack = get_angle_conversion_callback_from_sequence(EulerSequence.XYZ, EulerSequence.ZXY)
-    assert tuple(callack(1, 2, 3)) == (-3.050495162685674, -0.8690536087868346, -1.926553531745191)
+    np.testing.assert_almost_equal(
+        callack(1, 2, 3), (-3.050495162685674, -0.8690536087868346, -1.926553531745191), decimal=14
+    )
     callack = get_angle_conversion_callback_from_sequence(EulerSequence.XYZ, EulerSequence.ZYX)
-    assert tuple(callack(1, 2, 3)) == (-1.0268907336660056, -0.6499256902050641, -1.857115353462594)
+    np.testing.assert_almost_equal(
+        callack(1, 2, 3), (-1.0268907336660056, -0.6499256902050641, -1.857115353462594), decimal=14
+    )
     callack = get_angle_conversion_callback_from_sequence(EulerSequence.XYZ, EulerSequence.YXY)
-    assert tuple(callack(1, 2, 3)) == (3.064847992801699, 2.2690392880128885, -2.045600530404556)
+    np.testing.assert_almost_equal(
+        callack(1, 2, 3), (3.064847992801699, 2.2690392880128885, -2.045600530404556), decimal=14
+    )
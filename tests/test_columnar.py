@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from spartacus import Spartacus, DataFolder
+from spartacus.src.columnar import to_columnar_dataframe, read_confident_data, check_export_format
+
+
+@pytest.fixture(scope="module")
+def df() -> pd.DataFrame:
+    return Spartacus.load(datasets=DataFolder.BOURNE_2003).corrected_confident_data_values
+
+
+def test_to_columnar_dataframe(df):
+    columnar_df = to_columnar_dataframe(df)
+
+    for column in ("article", "joint", "humeral_motion", "legend", "unit"):
+        assert isinstance(columnar_df[column].dtype, pd.CategoricalDtype)
+    assert columnar_df["parent_compliance_1"].dtype == "boolean"
+    assert columnar_df["shoulder_id"].dtype == np.float64
+    np.testing.assert_array_equal(columnar_df["value"].to_numpy(), df["value"].to_numpy())
+
+
+@pytest.mark.parametrize("format", ["csv", "parquet"])
+def test_read_confident_data(tmp_path, format, df):
+    if format == "parquet":
+        pytest.importorskip("pyarrow")
+        path = tmp_path / "corrected_confident_data.parquet"
+        to_columnar_dataframe(df).to_parquet(path, index=False, row_group_size=1000)
+    else:
+        path = tmp_path / "corrected_confident_data.csv"
+        df.to_csv(path, index=False)
+
+    filters = {"unit": "rad", "degree_of_freedom": [1, 2]}
+    subdf = read_confident_data(path, format=format, columns=["joint", "value"], filters=filters)
+    expected = df[(df["unit"] == "rad") & df["degree_of_freedom"].isin([1, 2])]
+
+    assert subdf.columns.tolist() == ["joint", "value"]
+    # the csv text round trip may lose the last digit
+    np.testing.assert_allclose(subdf["value"].to_numpy(), expected["value"].to_numpy(), rtol=1e-14)
+    assert subdf["joint"].astype(str).tolist() == expected["joint"].tolist()
+
+
+def test_check_export_format():
+    with pytest.raises(ValueError, match="is not a valid export format"):
+        check_export_format("xlsx")
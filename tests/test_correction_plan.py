@@ -0,0 +1,148 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from spartacus.src.biomech_system import BiomechCoordinateSystem
+from spartacus.src.corrections.angle_conversion_callbacks import (
+    isb_framed_rotation_matrix_from_euler_angles,
+    quick_fix_x_rot_in_yxy_if_x_positive,
+    rotation_matrix_2_euler_angles,
+    set_corrections_on_rotation_matrix,
+    to_left_handed_frame,
+)
+from spartacus.src.corrections.correction_plan import CorrectionPlan, TranslationCorrectionPlan
+from spartacus.src.corrections.euler_basis import from_jcs_to_parent_frame_batch
+from spartacus.src.corrections.euler_sequences import euler_angles_to_rotation_matrices
+from spartacus.src.corrections.kolz_matrices import get_kolz_rotation_matrix
+from spartacus.src.enums_biomech import CartesianAxis, AnatomicalLandmark, Segment, EulerSequence, Correction
+
+PARENT = BiomechCoordinateSystem(
+    segment=Segment.THORAX,
+    antero_posterior_axis=CartesianAxis.plusZ,
+    infero_superior_axis=CartesianAxis.plusY,
+    medio_lateral_axis=CartesianAxis.minusX,
+    origin=AnatomicalLandmark.Thorax.IJ,
+)
+CHILD = BiomechCoordinateSystem(
+    segment=Segment.SCAPULA,
+    antero_posterior_axis=CartesianAxis.minusY,
+    infero_superior_axis=CartesianAxis.plusX,
+    medio_lateral_axis=CartesianAxis.plusZ,
+    origin=AnatomicalLandmark.Scapula.ANGULAR_ACROMIALIS,
+)
+ANGLES = np.random.default_rng(42).uniform(-1.2, 1.2, size=(50, 3))
+
+
+@pytest.mark.parametrize("left_side", [False, True])
+@pytest.mark.parametrize("kolz", [False, True])
+@pytest.mark.parametrize(
+    "source_sequence, target_sequence",
+    [
+        (EulerSequence.XYZ, EulerSequence.YXZ),
+        (EulerSequence.ZXY, EulerSequence.YXY),
+        (EulerSequence.YXZ, EulerSequence.YXZ),
+    ],
+)
+def test_correction_plan_matches_per_sample(left_side, kolz, source_sequence, target_sequence):
+    kolz_matrix = get_kolz_rotation_matrix(Correction.SCAPULA_KOLZ_AC_TO_PA_ROTATION) if kolz else np.eye(3)
+    plan = CorrectionPlan.from_segments(
+        source_sequence=source_sequence,
+        target_sequence=target_sequence,
+        bsys_parent=PARENT,
+        bsys_child=CHILD,
+        left_side=left_side,
+        child_matrix_correction=kolz_matrix,
+    )
+    corrected_angles = plan.apply(ANGLES)
+
+    assert corrected_angles.shape == (50, 3)
+    for sample, corrected_sample in zip(ANGLES, corrected_angles):
+        matrix = isb_framed_rotation_matrix_from_euler_angles(
+            source_sequence.value, sample[0], sample[1], sample[2], bsys_parent=PARENT, bsys_child=CHILD
+        )
+        if left_side:
+            matrix = to_left_handed_frame(matrix)
+        matrix = set_corrections_on_rotation_matrix(
+            matrix, child_matrix_correction=kolz_matrix, parent_matrix_correction=np.eye(3)
+        )
+        expected = rotation_matrix_2_euler_angles(matrix, target_sequence)
+
+        np.testing.assert_allclose(corrected_sample, expected, atol=1e-10)
+
+
+def test_correction_plan_keeps_nans():
+    plan = CorrectionPlan.from_segments(EulerSequence.XYZ, EulerSequence.YXZ, bsys_parent=PARENT, bsys_child=CHILD)
+    corrected_angles = plan.apply(np.array([[0.1, 0.2, 0.3], [np.nan, 0.2, 0.3]]))
+
+    assert np.all(np.isfinite(corrected_angles[0]))
+    assert np.all(np.isnan(corrected_angles[1]))
+
+
+def test_correction_plan_post_fixes():
+    plan = CorrectionPlan.from_segments(
+        source_sequence=EulerSequence.ZXY,
+        target_sequence=EulerSequence.YXY,
+        bsys_parent=PARENT,
+        bsys_child=CHILD,
+        post_fixes=("negative_elevation_in_yxy",),
+    )
+    without_fix = CorrectionPlan(
+        plan.source_sequence, plan.target_sequence, plan.left_matrix, plan.right_matrix, post_fixes=()
+    )
+    expected = np.array([quick_fix_x_rot_in_yxy_if_x_positive(angles) for angles in without_fix.apply(ANGLES)])
+
+    np.testing.assert_allclose(plan.apply(ANGLES), expected)
+    assert np.all(plan.apply(ANGLES)[:, 1] <= 0)
+
+    with pytest.raises(ValueError, match="not valid post fixes"):
+        CorrectionPlan("xyz", "yxy", np.eye(3), np.eye(3), post_fixes=("unknown_fix",))
+
+
+def test_correction_plans_can_be_pickled():
+    plan = CorrectionPlan.from_segments(
+        source_sequence=EulerSequence.XYZ,
+        target_sequence=EulerSequence.YXY,
+        bsys_parent=PARENT,
+        bsys_child=CHILD,
+        left_side=True,
+        post_fixes=("negative_elevation_in_yxy",),
+    )
+    translation_plan = TranslationCorrectionPlan.from_segment(PARENT, left_side=True, jcs_sequence=EulerSequence.XYZ)
+
+    restored_plan, restored_translation_plan = pickle.loads(pickle.dumps((plan, translation_plan)))
+
+    assert restored_plan == plan
+    assert restored_plan.source_sequence == "xyz"
+    np.testing.assert_array_equal(restored_plan.apply(ANGLES), plan.apply(ANGLES))
+    assert restored_translation_plan == translation_plan
+    assert restored_translation_plan != TranslationCorrectionPlan.from_segment(PARENT, jcs_sequence=EulerSequence.XYZ)
+
+
+@pytest.mark.parametrize("left_side", [False, True])
+@pytest.mark.parametrize("jcs_sequence", [None, EulerSequence.XYZ])
+def test_translation_correction_plan(left_side, jcs_sequence):
+    translations = np.random.default_rng(0).uniform(-10, 10, size=(50, 3))
+    plan = TranslationCorrectionPlan.from_segment(PARENT, left_side=left_side, jcs_sequence=jcs_sequence)
+
+    expected = translations
+    if jcs_sequence is not None:
+        expected = from_jcs_to_parent_frame_batch(translations, ANGLES, jcs_sequence)
+    expected = expected @ PARENT.get_rotation_matrix().T
+    if left_side:
+        expected = expected * np.array([1, 1, -1])
+
+    np.testing.assert_allclose(plan.apply(translations, ANGLES), expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("sequence", EulerSequence)
+def test_folded_rotation_matrices_match_the_product(sequence):
+    rng = np.random.default_rng(1)
+    left_matrix = np.linalg.qr(rng.normal(size=(3, 3)))[0]
+    right_matrix = np.linalg.qr(rng.normal(size=(3, 3)))[0]
+    plan = CorrectionPlan(sequence, EulerSequence.YXY, left_matrix, right_matrix)
+
+    angles = rng.uniform(-np.pi, np.pi, size=(100, 3))
+    expected = left_matrix @ euler_angles_to_rotation_matrices(angles, sequence) @ right_matrix
+
+    np.testing.assert_allclose(plan.rotation_matrices(angles), expected, atol=1e-14)
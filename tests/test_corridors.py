@@ -0,0 +1,102 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spartacus.src.corridors import compute_corridors, curve_weights, weighted_mean_and_sd, weighted_percentiles
+from .utils import TestUtils
+
+
+def test_weighted_percentiles_match_numpy_with_equal_weights():
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=(30, 8))
+    values[rng.random(values.shape) < 0.3] = np.nan
+    values[:, 0] = np.nan
+    values[1:, 1] = np.nan
+    codes = rng.integers(0, 3, size=30)
+
+    percentiles = (0, 5, 33.3, 50, 95, 100)
+    results = weighted_percentiles(values, np.ones_like(values), percentiles, codes=codes, n_groups=3)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for group in range(3):
+            expected = np.nanpercentile(values[codes == group], percentiles, axis=0, method="hazen")
+            np.testing.assert_allclose(results[:, group], expected)
+
+
+def test_weighted_percentiles_and_mean_with_weights():
+    values = np.array([[1.0], [2.0], [3.0], [np.nan]])
+    weights = np.array([[3.0], [1.0], [1.0], [0.0]])
+    # the samples are at (1.5, 3.5, 4.5) / 5
+    np.testing.assert_allclose(weighted_percentiles(values, weights, (30, 50, 80, 99))[:, 0, 0], [1.0, 1.5, 2.5, 3.0])
+
+    mean, sd = weighted_mean_and_sd(values, weights, np.ones((1, 4)))
+    np.testing.assert_allclose(mean, [[1.6]])
+    np.testing.assert_allclose(sd, [[np.sqrt(np.sum(weights[:3, 0] * (values[:3, 0] - 1.6) ** 2) / (5 - 11 / 5))]])
+
+    # the samples drawn several times, e.g. a bootstrap resample, are counted in the group matrix
+    mean, sd = weighted_mean_and_sd(values, (weights > 0).astype(float), weights.T)
+    np.testing.assert_allclose(mean, [[1.6]])
+    np.testing.assert_allclose(sd, [[np.std([1, 1, 1, 2, 3], ddof=1)]])
+
+
+@pytest.mark.parametrize("weighting", ["shoulder", "article"])
+def test_corridors_match_a_loop_over_the_groups(weighting):
+    tensor = TestUtils.random_curve_tensor()
+    corridors = compute_corridors(tensor, weighting=weighting, percentiles=(10, 90))
+
+    assert corridors.groups["joint"].tolist() == ["glenohumeral", "scapulothoracic"]
+    assert list(corridors.statistics) == ["mean", "sd", "median", "p10", "p90"]
+
+    for group, joint in enumerate(corridors.groups["joint"]):
+        selected = tensor.filter({"joint": joint})
+        values = selected.values
+        if weighting == "shoulder":
+            weights = ~np.isnan(values)
+        else:
+            weights = np.zeros(values.shape)
+            for article in selected.rows["article"].unique():
+                rows = (selected.rows["article"] == article).to_numpy()
+                weights[rows] = ~np.isnan(values[rows]) / np.maximum((~np.isnan(values[rows])).sum(axis=0), 1)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean = np.nansum(weights * values, axis=0) / weights.sum(axis=0)
+        np.testing.assert_allclose(corridors["mean"][group], mean)
+        np.testing.assert_array_equal(corridors.n_rows[group], (~np.isnan(values)).sum(axis=0))
+        assert corridors.n_articles[group].max() == selected.rows["article"].nunique()
+
+        if weighting == "shoulder":
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                np.testing.assert_allclose(corridors["sd"][group], np.nanstd(values, axis=0, ddof=1))
+                np.testing.assert_allclose(corridors["median"][group], np.nanmedian(values, axis=0))
+
+
+def test_article_weights_sum_to_the_number_of_articles():
+    tensor = TestUtils.random_curve_tensor()
+    weights = curve_weights(tensor, "article").reshape(tensor.values.shape)
+    glenohumeral = (tensor.rows["joint"] == "glenohumeral").to_numpy()
+    n_articles = (
+        pd.DataFrame(~np.isnan(tensor.values[glenohumeral, 0, 0]))
+        .groupby(tensor.rows["article"][glenohumeral].to_numpy())
+        .any()
+    )
+
+    assert weights[glenohumeral, 0, 0].sum() == pytest.approx(n_articles.to_numpy().sum())
+    with pytest.raises(ValueError, match="not a valid weighting"):
+        curve_weights(tensor, "subject")
+
+
+def test_corridors_with_filters_and_long_format():
+    tensor = TestUtils.random_curve_tensor()
+    corridors = compute_corridors(tensor, filters={"in_vivo": True})
+    in_vivo = compute_corridors(tensor.filter({"in_vivo": True}))
+    np.testing.assert_array_equal(corridors["p95"], in_vivo["p95"])
+
+    df = corridors.to_dataframe()
+    assert df.shape[0] == (corridors.n_rows > 0).sum()
+    assert {"joint", "degree_of_freedom", "humerothoracic_angle", "n_rows", "mean", "p5"} <= set(df.columns)
+    assert (df["p5"] <= df["median"]).all() and (df["median"] <= df["p95"]).all()
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spartacus import DataFolder
+from spartacus.src.curve_store import build_curve_store, CurveStore, CurveRepository
+from spartacus.src.load_data import load_csv
+
+
+def test_curve_store_matches_csv(tmp_path):
+    path = build_curve_store(tmp_path / "curve_store.npz")
+    curve_store = CurveStore(path)
+
+    assert not curve_store.stale
+    folder = DataFolder.BEGON_2014.value
+    csv_files = sorted(f for f in os.listdir(folder) if f.endswith(".csv") and f != "corrections.csv")
+    for csv_file in csv_files[:20]:
+        csv_path = os.path.join(folder, csv_file)
+        assert csv_path in curve_store
+
+        expected = pd.read_csv(csv_path, sep=",", header=None)
+        expected.columns = ["humerothoracic_angle", "value"]
+        pd.testing.assert_frame_equal(curve_store.get_dataframe(csv_path, ["humerothoracic_angle", "value"]), expected)
+        np.testing.assert_array_equal(curve_store.get_curve(csv_path), expected.to_numpy())
+
+    assert os.path.join(folder, "not_a_curve.csv") not in curve_store
+
+
+def test_curve_store_corrections(tmp_path):
+    curve_store = CurveStore(build_curve_store(tmp_path / "curve_store.npz"))
+    folder = DataFolder.BEGON_2014.value
+
+    assert curve_store.has_corrections(folder)
+    corrections = pd.read_csv(os.path.join(folder, "corrections.csv"), header=None)
+    for csv, coefficient in zip(corrections[0], corrections[1]):
+        assert curve_store.get_correction(os.path.join(folder, csv)) == coefficient
+    assert curve_store.get_correction(os.path.join(folder, "not_a_curve.csv")) is None
+
+
+def test_load_csv_without_file():
+    df = load_csv(None, ["humerothoracic_angle", "value"])
+    assert df.empty
+    assert df.columns.tolist() == ["humerothoracic_angle", "value"]
+
+
+def test_memory_mapped_curve_repository(tmp_path):
+    curve_store = CurveStore(build_curve_store(tmp_path / "curve_store.npz"), mmap_mode="r")
+    repository = CurveRepository(curve_store=curve_store)
+
+    key = ("Begon et al.", "glenohumeral", "frontal plane elevation", 1, "dof_1st_euler")
+    assert key in repository
+    curve = repository[key]
+    expected = pd.read_csv(
+        os.path.join(DataFolder.BEGON_2014.value, "GH_planeElevation_elevationFrontal_1_closest_to_mean.csv"),
+        header=None,
+    ).to_numpy()
+    np.testing.assert_array_equal(curve, expected)
+
+    # a view of the memory-mapped file, not a copy, and read-only
+    assert isinstance(curve.base, np.memmap) or isinstance(curve, np.memmap)
+    assert not curve.flags.writeable
+    with pytest.raises(ValueError):
+        curve[0, 0] = 0
+
+    assert len(repository) == len(repository.keys())
+    with pytest.raises(KeyError, match="use get_all"):
+        repository["Sugi et al.", "scapulothoracic", "scapular plane elevation", None, "dof_1st_euler"]
+    assert (
+        len(repository.get_all(("Sugi et al.", "scapulothoracic", "scapular plane elevation", None, "dof_1st_euler")))
+        == 2
+    )
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.interpolate import CubicSpline, PchipInterpolator
+
+from spartacus.src.curve_tensor import CurveTensor, default_grid, resample_curves
+
+
+def long_dataframe() -> pd.DataFrame:
+    """Three rows of confident data, one dof per line, with unsorted angles, a repeated angle and no shoulder_id"""
+    rng = np.random.default_rng(3)
+    lines = []
+    for article, shoulder_id, angles, in_vivo in (
+        ("A et al.", 1.0, np.linspace(10, 120, 12), True),
+        ("A et al.", 2.0, rng.permutation(np.linspace(30.5, 150.5, 9)), True),
+        ("B et al.", np.nan, np.array([20.0, 20.0, 45.0, 90.0, 60.0]), False),
+    ):
+        for dof in (1, 2, 3):
+            for angle in angles:
+                lines.append(
+                    {
+                        "article": article,
+                        "unit": "rad",
+                        "joint": "glenohumeral",
+                        "humeral_motion": "frontal plane elevation",
+                        "shoulder_id": shoulder_id,
+                        "total_compliance": 4,
+                        "humerothoracic_angle": angle,
+                        "value": dof * np.sin(np.deg2rad(angle)) + rng.normal(),
+                        "legend": f"dof {dof}",
+                        "degree_of_freedom": dof,
+                        "in_vivo": in_vivo,
+                    }
+                )
+    return pd.DataFrame(lines)
+
+
+def expected_curve(curve: pd.DataFrame, grid: np.ndarray) -> np.ndarray:
+    curve = curve.drop_duplicates("humerothoracic_angle").sort_values("humerothoracic_angle")
+    x, y = curve["humerothoracic_angle"].to_numpy(), curve["value"].to_numpy()
+    expected = np.interp(grid, x, y)
+    expected[(grid < x.min()) | (grid > x.max())] = np.nan
+    return expected
+
+
+def test_curve_tensor_matches_the_interpolation_of_each_curve():
+    df = long_dataframe()
+    tensor = CurveTensor.from_confident_data(df, step=5.0)
+
+    np.testing.assert_array_equal(tensor.grid, np.arange(10.0, 160.0, 5.0))
+    assert tensor.values.shape == (3, 3, tensor.grid.shape[0])
+    assert tensor.rows["article"].tolist() == ["A et al.", "A et al.", "B et al."]
+    assert tensor.rows["in_vivo"].tolist() == [True, True, False]
+    assert "value" not in tensor.rows.columns
+    assert np.isnan(tensor.rows["shoulder_id"].iloc[2])
+    assert tensor.legends[2].tolist() == ["dof 1", "dof 2", "dof 3"]
+
+    for row, (_, row_metadata) in enumerate(tensor.rows.iterrows()):
+        same_shoulder = df["shoulder_id"].isna() if row == 2 else df["shoulder_id"] == row_metadata["shoulder_id"]
+        same_row = (df["article"] == row_metadata["article"]) & same_shoulder
+        for dof in (1, 2, 3):
+            curve = df[same_row & (df["degree_of_freedom"] == dof)]
+            np.testing.assert_allclose(tensor.values[row, dof - 1], expected_curve(curve, tensor.grid), atol=1e-10)
+
+
+@pytest.mark.parametrize("method", ["pchip", "spline"])
+def test_curve_tensor_with_scipy_interpolations(method):
+    df = long_dataframe()
+    grid = np.linspace(0, 160, 50)
+    tensor = CurveTensor.from_confident_data(df, grid=grid, method=method)
+    linear = CurveTensor.from_confident_data(df, grid=grid)
+
+    np.testing.assert_array_equal(tensor.mask, linear.mask)
+    curve = df[(df["article"] == "A et al.") & (df["shoulder_id"] == 1.0) & (df["degree_of_freedom"] == 2)]
+    interpolator = PchipInterpolator if method == "pchip" else CubicSpline
+    expected = interpolator(curve["humerothoracic_angle"], curve["value"])(grid[tensor.mask[0, 1]])
+    np.testing.assert_allclose(tensor.values[0, 1, tensor.mask[0, 1]], expected)
+
+
+def test_resample_curves_edge_cases():
+    grid = np.array([0.0, 1.0, 2.0, 3.0])
+    resampled = resample_curves(
+        curve_index=np.array([0, 0, 2, 2, 2]),
+        abscissas=np.array([1.0, 2.0, 3.0, 0.0, np.nan]),
+        values=np.array([5.0, 7.0, 3.0, 0.0, 1.0]),
+        n_curves=3,
+        grid=grid,
+    )
+    np.testing.assert_array_equal(resampled[0], [np.nan, 5.0, 7.0, np.nan])
+    assert np.isnan(resampled[1]).all()  # no sample
+    np.testing.assert_allclose(resampled[2], [0.0, 1.0, 2.0, 3.0])
+
+    with pytest.raises(ValueError, match="not a valid interpolation method"):
+        resample_curves(np.zeros(1), np.zeros(1), np.zeros(1), 1, grid, method="nearest")
+
+    np.testing.assert_array_equal(default_grid(np.array([-3.2, 7.5]), step=2.5), [-5.0, -2.5, 0.0, 2.5, 5.0, 7.5])
+
+
+def test_curve_tensor_filter_and_long_format():
+    tensor = CurveTensor.from_confident_data(long_dataframe(), step=5.0)
+
+    in_vivo = tensor.filter({"in_vivo": True})
+    assert len(in_vivo) == 2
+    np.testing.assert_array_equal(in_vivo.values, tensor.values[:2])
+    assert in_vivo.index.get_level_values("shoulder_id").tolist() == [1.0, 2.0]
+
+    df = tensor.to_dataframe()
+    assert df.shape[0] == tensor.mask.sum()
+    assert set(df.columns) >= {"article", "humerothoracic_angle", "value", "legend", "degree_of_freedom"}
+    np.testing.assert_array_equal(CurveTensor.from_confident_data(df, grid=tensor.grid).values, tensor.values)
+
+    with pytest.raises(ValueError, match="expected \\(row, dof, grid\\)"):
+        CurveTensor(tensor.values[:, :2], tensor.rows, tensor.grid)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from spartacus import DatasetCSV
+from spartacus.src.dataset_schema import SCHEMAS, read_dataset_csv, to_python_objects
+
+
+@pytest.mark.parametrize("dataset_csv", DatasetCSV)
+def test_read_dataset_csv_matches_its_schema(dataset_csv):
+    df = read_dataset_csv(dataset_csv)
+    raw = pd.read_csv(dataset_csv.value)
+
+    assert df.columns.tolist() == list(SCHEMAS[dataset_csv])
+    assert df.shape == raw.shape
+    for column, dtype in SCHEMAS[dataset_csv].items():
+        assert df[column].dtype == dtype, column
+
+
+def test_read_dataset_csv_rejects_an_outdated_schema(monkeypatch):
+    schema = dict(SCHEMAS[DatasetCSV.DATASETS])
+    schema["new_column"] = "string"
+    monkeypatch.setitem(SCHEMAS, DatasetCSV.DATASETS, schema)
+
+    with pytest.raises(ValueError, match="missing: \\['new_column'\\]"):
+        read_dataset_csv(DatasetCSV.DATASETS)
+
+
+def test_to_python_objects():
+    df = pd.DataFrame(
+        {
+            "text": pd.Series(["a", None], dtype="string"),
+            "category": pd.Series(["b", None], dtype="category"),
+            "flag": pd.Series([True, None], dtype="boolean"),
+            "number": [1.0, np.nan],
+            "count": [1, 2],
+        }
+    )
+    converted = to_python_objects(df)
+
+    for column in ("text", "category", "flag"):
+        assert converted[column].dtype == object
+        assert converted[column].iloc[1] is None
+    assert converted["text"].iloc[0] == "a"
+    assert converted["category"].iloc[0] == "b"
+    assert converted["flag"].iloc[0] is True
+    assert converted["number"].dtype == np.float64
+    assert np.isnan(converted["number"].iloc[1])
+    assert converted["count"].dtype == np.int64
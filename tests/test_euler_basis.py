@@ -6,7 +6,9 @@ from spartacus import (
     euler_axes_from_rotation_matrices,
     EulerSequence,
     from_jcs_to_parent_frame,
+    from_jcs_to_parent_frame_batch,
 )
+from spartacus.src.corrections.euler_sequences import euler_angles_to_rotation_matrices
 
 
 def test_euler_basis():
@@ -40,3 +42,29 @@ def test_euler_basis_translation_correction():
 
     expected_tt = np.array([1.0, 1.38951922, 3.21226559])
     np.testing.assert_almost_equal(tt, expected_tt, decimal=8)
+
+
+def test_euler_basis_translation_correction_batch():
+    rng = np.random.default_rng(0)
+    translations = rng.uniform(-10, 10, size=(50, 3))
+    angles = rng.uniform(-1.2, 1.2, size=(50, 3))
+    # away from the gimbal lock of yxy, where the decomposition of the non-batched version loses precision
+    angles[:, 1] = rng.uniform(0.2, 1.2, size=50)
+
+    for seq in (EulerSequence.XYZ, EulerSequence.YXZ, EulerSequence.ZXY, EulerSequence.YXY):
+        batch = from_jcs_to_parent_frame_batch(translations, angles, seq)
+
+        assert batch.shape == (50, 3)
+        for translation, angle, parent_translation in zip(translations, angles, batch):
+            euler_axes = euler_axes_from_rotation_matrices(
+                R_0_parent=np.eye(3),
+                R_0_child=euler_angles_to_rotation_matrices(angle, seq),
+                sequence=seq,
+                axes_source_frame="mixed",
+            )
+            np.testing.assert_almost_equal(np.vstack(euler_axes) @ parent_translation, translation, decimal=10)
+
+    angles[3, 1] = np.nan
+    batch = from_jcs_to_parent_frame_batch(translations, angles, EulerSequence.XYZ)
+    assert np.isnan(batch[3]).all()
+    assert not np.isnan(np.delete(batch, 3, axis=0)).any()
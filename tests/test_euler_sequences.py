@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from spartacus import EulerSequence, rotation_x, rotation_y, rotation_z
+from spartacus.src.corrections.euler_sequences import (
+    euler_angles_to_rotation_matrices,
+    rotation_matrices_to_euler_angles,
+    set_euler_backend,
+    get_euler_backend,
+)
+
+ANGLES = np.random.default_rng(0).uniform(-np.pi, np.pi, size=(200, 3))
+ELEMENTARY_ROTATIONS = {"x": rotation_x, "y": rotation_y, "z": rotation_z}
+
+
+@pytest.mark.parametrize("sequence", EulerSequence)
+def test_compose_matches_elementary_rotations(sequence):
+    matrices = euler_angles_to_rotation_matrices(ANGLES, sequence)
+
+    assert matrices.shape == (200, 3, 3)
+    for angles, matrix in zip(ANGLES[:10], matrices[:10]):
+        expected = (
+            ELEMENTARY_ROTATIONS[sequence.value[0]](angles[0])
+            @ ELEMENTARY_ROTATIONS[sequence.value[1]](angles[1])
+            @ ELEMENTARY_ROTATIONS[sequence.value[2]](angles[2])
+        )
+        np.testing.assert_almost_equal(matrix, expected, decimal=14)
+
+
+@pytest.mark.parametrize("sequence", EulerSequence)
+def test_decompose_round_trip_and_ranges(sequence):
+    matrices = euler_angles_to_rotation_matrices(ANGLES, sequence)
+    angles = rotation_matrices_to_euler_angles(matrices, sequence)
+
+    np.testing.assert_almost_equal(euler_angles_to_rotation_matrices(angles, sequence), matrices, decimal=10)
+    assert np.all(np.abs(angles[:, [0, 2]]) <= np.pi)
+    if sequence.value[0] == sequence.value[2]:
+        assert np.all((angles[:, 1] >= 0) & (angles[:, 1] <= np.pi))
+    else:
+        assert np.all(np.abs(angles[:, 1]) <= np.pi / 2)
+
+
+def test_single_sample_shapes():
+    matrix = euler_angles_to_rotation_matrices(np.array([0.1, 0.2, 0.3]), "xyz")
+    assert matrix.shape == (3, 3)
+    angles = rotation_matrices_to_euler_angles(matrix, EulerSequence.XYZ)
+    assert angles.shape == (3,)
+    np.testing.assert_almost_equal(angles, [0.1, 0.2, 0.3])
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError, match="is not a valid euler sequence"):
+        euler_angles_to_rotation_matrices(ANGLES, "xxy")
+    with pytest.raises(ValueError, match="The last dimension of angles must be 3"):
+        euler_angles_to_rotation_matrices(ANGLES[:, :2], "xyz")
+    with pytest.raises(ValueError, match="is not a valid backend"):
+        set_euler_backend("scipy")
+
+
+@pytest.mark.parametrize("sequence", EulerSequence)
+def test_numpy_backend_matches_biorbd(sequence):
+    pytest.importorskip("biorbd")
+
+    matrices = euler_angles_to_rotation_matrices(ANGLES, sequence, backend="numpy")
+    np.testing.assert_almost_equal(
+        matrices, euler_angles_to_rotation_matrices(ANGLES, sequence, backend="biorbd"), decimal=12
+    )
+    np.testing.assert_almost_equal(
+        rotation_matrices_to_euler_angles(matrices, sequence, backend="numpy"),
+        rotation_matrices_to_euler_angles(matrices, sequence, backend="biorbd"),
+        decimal=10,
+    )
+
+
+def test_backend_toggle():
+    pytest.importorskip("biorbd")
+
+    assert get_euler_backend() == "numpy"
+    set_euler_backend("biorbd")
+    try:
+        assert get_euler_backend() == "biorbd"
+        biorbd_angles = rotation_matrices_to_euler_angles(euler_angles_to_rotation_matrices(ANGLES, "yxy"), "yxz")
+    finally:
+        set_euler_backend("numpy")
+
+    numpy_angles = rotation_matrices_to_euler_angles(euler_angles_to_rotation_matrices(ANGLES, "yxy"), "yxz")
+    np.testing.assert_almost_equal(numpy_angles, biorbd_angles, decimal=10)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from spartacus import Spartacus, DataFolder, Segment
+from spartacus.src.biomech_system import BiomechCoordinateSystem
+from spartacus.src.compliance import SegmentCompliance
+from spartacus.src.frame_reader import Frame
+from spartacus.src.frame_registry import compile_frame, clear_frame_registry
+from spartacus.src.utils_setters import set_parent_segment_from_row, compile_parent_segment_from_row
+
+THORAX_DEFINITION = dict(
+    segment=Segment.THORAX,
+    x_axis="y^z",
+    y_axis="vec((T8+PX)/2>(C7+IJ)/2)",
+    z_axis="vec((PX+T8)/2>IJ)^vec((PX+T8)/2>C7)",
+    origin="IJ",
+    side="right",
+)
+
+
+def test_compile_frame_is_shared():
+    clear_frame_registry()
+    compiled = compile_frame(**THORAX_DEFINITION)
+
+    assert compile_frame(**THORAX_DEFINITION) is compiled
+    assert compile_frame.cache_info().hits == 1
+
+    expected = BiomechCoordinateSystem.from_frame(Frame.from_xyz_string(**THORAX_DEFINITION))
+    np.testing.assert_array_equal(compiled.rotation_matrix, expected.get_rotation_matrix())
+    with pytest.raises(ValueError):
+        compiled.rotation_matrix[0, 0] = 2
+
+    expected_compliance = SegmentCompliance(bsys=expected)
+    assert compiled.compliance.is_c1 == expected_compliance.is_c1
+    assert compiled.compliance.is_c2 == expected_compliance.is_c2
+    assert compiled.compliance.is_c3 == expected_compliance.is_c3
+
+
+def test_rows_share_compiled_frames():
+    sp = Spartacus.load(datasets=DataFolder.BOURNE_2003, unify=False)
+    first_row, second_row = sp.dataframe.iloc[0], sp.dataframe.iloc[1]
+
+    assert set_parent_segment_from_row(first_row, Segment.THORAX) is set_parent_segment_from_row(
+        second_row, Segment.THORAX
+    )
+    compiled = compile_parent_segment_from_row(first_row, Segment.THORAX)
+    assert compiled.biomech_sys is set_parent_segment_from_row(first_row, Segment.THORAX)
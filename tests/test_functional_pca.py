@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from spartacus.src.curve_tensor import CurveTensor
+from spartacus.src.functional_pca import fit_functional_pca
+
+from .utils import TestUtils
+
+
+def test_functional_pca_without_missing_values_is_the_pca_of_each_group():
+    tensor = TestUtils.random_curve_tensor()
+    tensor.values = np.nan_to_num(tensor.values, nan=1.0)
+    fpca = fit_functional_pca(tensor, n_components=3)
+
+    assert fpca.groups["joint"].tolist() == ["glenohumeral", "scapulothoracic"]
+    np.testing.assert_array_equal(fpca.coverage, 1)
+    for group, joint in enumerate(fpca.groups["joint"]):
+        rows = (tensor.rows["joint"] == joint).to_numpy()
+        values = tensor.values[rows].reshape(rows.sum(), -1)
+        centered = values - values.mean(axis=0)
+        _, s, vt = np.linalg.svd(centered, full_matrices=False)
+
+        np.testing.assert_allclose(fpca.means[group].ravel(), values.mean(axis=0))
+        components = fpca.components[group].reshape(3, -1)
+        # the same subspace, up to the signs of the components
+        np.testing.assert_allclose(np.abs(components @ vt[:3].T), np.eye(3), atol=1e-8)
+        np.testing.assert_allclose(fpca.explained_variance[group], s[:3] ** 2 / (rows.sum() - 1))
+        np.testing.assert_allclose(fpca.explained_variance_ratio[group], s[:3] ** 2 / (s**2).sum())
+        np.testing.assert_allclose(fpca.scores[rows], centered @ components.T, atol=1e-8)
+
+        # projecting a curve of the database is a dot product that gives its scores back
+        np.testing.assert_allclose(fpca.project(tensor.values[rows], group), fpca.scores[rows], atol=1e-8)
+        np.testing.assert_allclose(fpca.project(tensor.values[rows][0], group), fpca.scores[rows][0], atol=1e-8)
+
+    # with all the components, the reconstruction is exact
+    full = fit_functional_pca(tensor, n_components=10)
+    np.testing.assert_allclose(full.reconstruct(), tensor.values, atol=1e-8)
+    assert np.isnan(full.components[1, 4:]).all() and not np.isnan(full.components[0, :5]).any()
+
+
+def test_functional_pca_imputes_low_rank_curves():
+    rng = np.random.default_rng(3)
+    rows = pd.DataFrame(
+        {
+            "article": "A et al.",
+            "joint": "scapulothoracic",
+            "humeral_motion": "scapular plane elevation",
+            "shoulder_id": np.arange(30.0),
+            "unit": "rad",
+        }
+    )
+    angles = np.linspace(0, 1, 20)
+    basis = np.stack([np.sin(np.pi * angles), angles**2])[:, np.newaxis] * np.array([1.0, 2.0, -1.0])[:, np.newaxis]
+    complete = 5 + np.einsum("rk,kdg->rdg", rng.normal(size=(30, 2)) * 3, basis)
+    values = complete.copy()
+    values[rng.random(values.shape) < 0.15] = np.nan
+    values[3, :, 15:] = np.nan
+    tensor = CurveTensor(values, rows, np.linspace(0, 120, 20))
+
+    fpca = fit_functional_pca(tensor, n_components=2, max_iterations=1000, tolerance=1e-10)
+    np.testing.assert_allclose(fpca.reconstruct(), complete, atol=1e-5)
+    np.testing.assert_allclose(fpca.explained_variance_ratio.sum(), 1)
+    assert fpca.coverage[3] < 1
+
+    # a partial curve is fitted by least squares on the angles it has
+    partial = complete[0].copy()
+    partial[:, 10:] = np.nan
+    np.testing.assert_allclose(fpca.project(partial, 0), fpca.scores[0], atol=1e-5)
+
+
+def test_functional_pca_groups_and_long_format():
+    tensor = TestUtils.random_curve_tensor()
+    fpca = fit_functional_pca(tensor, n_components=2, filters={"in_vivo": True})
+    assert len(fpca) == 7
+
+    df = fpca.to_dataframe()
+    assert {"article", "joint", "humeral_motion", "shoulder_id", "in_vivo", "coverage", "pc1", "pc2"} <= set(df.columns)
+    assert df.shape[0] == 7
+
+    assert fpca.group_index("scapulothoracic", "frontal plane elevation") == 1
+    with pytest.raises(ValueError, match="no decomposition"):
+        fpca.group_index("sternoclavicular", "frontal plane elevation")
+    with pytest.raises(ValueError, match="minimum coverage"):
+        fit_functional_pca(tensor, min_coverage=0)
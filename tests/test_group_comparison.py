@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from spartacus.src.curve_tensor import CurveTensor
+from spartacus.src import group_comparison
+from spartacus.src.group_comparison import compare_groups, welch_t
+
+from .utils import TestUtils
+
+
+def test_welch_t_matches_the_formula():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(12, 4))
+    values[0, 0] = np.nan
+    values[:10, 3] = np.nan
+    labels = np.array([1.0] * 5 + [0.0] * 7)
+
+    t, df, n_a, n_b = welch_t(values, labels, 1 - labels)
+    np.testing.assert_array_equal(n_a, [4, 5, 5, 0])
+    np.testing.assert_array_equal(n_b, [7, 7, 7, 2])
+    assert np.isnan(t[3]) and np.isnan(df[3])
+
+    for column in range(3):
+        a = values[labels == 1, column]
+        b = values[labels == 0, column]
+        a, b = a[~np.isnan(a)], b[~np.isnan(b)]
+        variance_a, variance_b = a.var(ddof=1) / a.size, b.var(ddof=1) / b.size
+        assert t[column] == pytest.approx((a.mean() - b.mean()) / np.sqrt(variance_a + variance_b))
+        assert df[column] == pytest.approx(
+            (variance_a + variance_b) ** 2 / (variance_a**2 / (a.size - 1) + variance_b**2 / (b.size - 1))
+        )
+
+    # a batch of labels gives a line per batch
+    batch = np.stack([labels, labels[::-1]])
+    t_batch, *_ = welch_t(values, batch, 1 - batch)
+    np.testing.assert_allclose(t_batch[0], t, equal_nan=True)
+
+
+def test_t_test_matches_scipy():
+    tensor = TestUtils.random_curve_tensor()
+    comparison = compare_groups(tensor, "in_vivo", True, test="t")
+
+    assert comparison.groups["joint"].tolist() == ["glenohumeral", "scapulothoracic"]
+    assert np.isnan(comparison.thresholds).all()
+    for group, joint in enumerate(comparison.groups["joint"]):
+        selected = tensor.filter({"joint": joint})
+        in_vivo = selected.rows["in_vivo"].to_numpy(dtype=bool)
+        for dof in range(3):
+            for point in range(tensor.grid.size):
+                a, b = selected.values[in_vivo, dof, point], selected.values[~in_vivo, dof, point]
+                a, b = a[~np.isnan(a)], b[~np.isnan(b)]
+                if a.size < 2 or b.size < 2:
+                    assert np.isnan(comparison.t[group, dof, point])
+                    continue
+                expected = stats.ttest_ind(a, b, equal_var=False)
+                assert comparison.t[group, dof, point] == pytest.approx(expected.statistic)
+                assert comparison.p_values[group, dof, point] == pytest.approx(expected.pvalue)
+
+
+def test_permutation_test_is_reproducible_and_corrected():
+    tensor = TestUtils.random_curve_tensor()
+    comparison = compare_groups(tensor, "in_vivo", True, n_permutations=300, seed=2)
+    assert comparison.p_values.shape == comparison.t.shape == (2, 3, tensor.grid.size)
+
+    exists = ~np.isnan(comparison.t)
+    np.testing.assert_array_equal(~np.isnan(comparison.p_values), exists)
+    assert np.all(comparison.p_values[exists] >= 1 / 301) and np.all(comparison.p_values[exists] <= 1)
+    # the corrected p-value decreases with |t| along the angles of a dof
+    for group in range(2):
+        for dof in range(3):
+            order = np.argsort(np.abs(comparison.t[group, dof][exists[group, dof]]))
+            assert np.all(np.diff(comparison.p_values[group, dof][exists[group, dof]][order]) <= 0)
+
+    again = compare_groups(tensor, "in_vivo", True, n_permutations=300, seed=2, batch_size=64)
+    np.testing.assert_array_equal(again.p_values, comparison.p_values)
+    np.testing.assert_array_equal(again.thresholds, comparison.thresholds)
+    parallel = compare_groups(tensor, "in_vivo", True, n_permutations=300, seed=2, n_jobs=2)
+    np.testing.assert_array_equal(parallel.p_values, comparison.p_values)
+
+
+def test_permutation_p_values_only_count_the_valid_permutations(monkeypatch):
+    tensor = TestUtils.random_curve_tensor()
+    max_null_statistics = group_comparison._max_null_statistics
+    null_statistics = []
+
+    def max_null_statistics_with_invalid_permutations(task):
+        # the permutations without enough samples in both subgroups at any angle have a nan maximum
+        maxima = max_null_statistics(task)
+        maxima[::3] = np.nan
+        null_statistics.append(maxima.copy())
+        return maxima
+
+    monkeypatch.setattr(group_comparison, "_max_null_statistics", max_null_statistics_with_invalid_permutations)
+    comparison = compare_groups(tensor, "in_vivo", True, n_permutations=30, seed=2)
+
+    for group, maxima in enumerate(null_statistics):
+        for dof in range(3):
+            valid_maxima = maxima[~np.isnan(maxima[:, dof]), dof]
+            absolute_t = np.abs(comparison.t[group, dof])
+            exists = ~np.isnan(absolute_t)
+            exceedances = (valid_maxima[:, np.newaxis] >= absolute_t[exists]).sum(axis=0)
+            np.testing.assert_allclose(
+                comparison.p_values[group, dof][exists], (1 + exceedances) / (1 + valid_maxima.size)
+            )
+
+
+def test_permutation_test_detects_a_shift():
+    # the subgroups of the random tensor are too small for a permutation p-value below 0.05, 20 shoulders are drawn
+    rng = np.random.default_rng(0)
+    rows = pd.DataFrame(
+        {
+            "article": ["A et al."] * 10 + ["B et al."] * 10,
+            "joint": "glenohumeral",
+            "humeral_motion": "sagittal plane elevation",
+            "shoulder_id": np.arange(20.0),
+            "unit": "rad",
+            "posture": ["standing"] * 8 + ["sitting"] * 12,
+        }
+    )
+    values = rng.normal(size=(20, 3, 15))
+    values[:8, 1, 5:] += 5
+    tensor = CurveTensor(values, rows, np.linspace(0, 140, 15))
+
+    comparison = compare_groups(tensor, "posture", ["standing"], b=["sitting"], n_permutations=500, seed=0)
+    assert comparison.significant[0, 1, 5:].all()
+    assert not comparison.significant[0, 1, :5].any()
+    assert np.all(np.abs(comparison.t[0, 1, 5:]) > comparison.thresholds[0, 1])
+
+    df = comparison.to_dataframe()
+    assert df.shape[0] == np.count_nonzero(~np.isnan(comparison.t))
+    assert {"joint", "degree_of_freedom", "humerothoracic_angle", "n_a", "n_b", "t", "p_value"} <= set(df.columns)
+
+
+def test_compare_groups_errors_and_missing_subgroups():
+    tensor = TestUtils.random_curve_tensor()
+    with pytest.raises(ValueError, match="not a valid test"):
+        compare_groups(tensor, "in_vivo", True, test="anova")
+    with pytest.raises(ValueError, match="overlap"):
+        compare_groups(tensor, "article", ["A et al.", "B et al."], b="B et al.")
+
+    # the shoulders 0 and 2 are glenohumeral, the scapulothoracic joint has no curve in the subgroup a
+    comparison = compare_groups(tensor, "shoulder_id", [0.0, 2.0], test="t")
+    assert comparison.groups["joint"].tolist() == ["glenohumeral"]
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from spartacus.src.ingestion import convert_workbooks, inspect_curve_file, main, validate_joint_data
+
+FOLDER = "#21_New_et_al"
+
+
+def _write_curve(path, abscissa, values=None):
+    values = np.zeros_like(abscissa) if values is None else values
+    pd.DataFrame({0: abscissa, 1: values}).to_csv(path, header=False, index=False)
+
+
+def _joint_data(rows: list[dict]) -> pd.DataFrame:
+    columns = {
+        "dataset_authors": "New et al.",
+        "joint": "glenohumeral",
+        "humeral_motion": "frontal plane elevation",
+        "shoulder_id": 1.0,
+        "folder": FOLDER,
+    }
+    return pd.DataFrame([{**columns, **row} for row in rows])
+
+
+def test_inspect_curve_file(tmp_path):
+    _write_curve(tmp_path / "fine.csv", np.linspace(0, 120, 10))
+    _write_curve(tmp_path / "back_and_forth.csv", np.concatenate([np.linspace(0, 120, 10), np.linspace(110, 0, 5)]))
+    _write_curve(tmp_path / "zigzag.csv", np.array([0.0, 10.0, 5.0, 20.0, 30.0, 30.0]))
+    (tmp_path / "text.csv").write_text("0,1\n10,abc\n")
+    (tmp_path / "three_columns.csv").write_text("0,1,2\n10,1,2\n")
+    (tmp_path / "empty_last_line.csv").write_text("0,1\n10,2\n,\n")
+
+    issues, abscissa = inspect_curve_file(tmp_path / "fine.csv")
+    assert issues == []
+    np.testing.assert_allclose(abscissa, np.linspace(0, 120, 10))
+
+    issues, _ = inspect_curve_file(tmp_path / "back_and_forth.csv")
+    assert issues == [("info", "monotonic", "the humerothoracic angle changes direction 1 times")]
+    issues, _ = inspect_curve_file(tmp_path / "zigzag.csv")
+    assert issues == [
+        ("info", "monotonic", "1 repeated humerothoracic angles"),
+        ("warning", "monotonic", "the humerothoracic angle changes direction 2 times"),
+    ]
+
+    assert inspect_curve_file(tmp_path / "missing.csv")[0][0][:2] == ("error", "missing")
+    assert inspect_curve_file(tmp_path / "text.csv")[0][0][:2] == ("error", "numeric")
+    assert inspect_curve_file(tmp_path / "three_columns.csv")[0][0][:2] == ("error", "parse")
+    issues, abscissa = inspect_curve_file(tmp_path / "empty_last_line.csv")
+    assert issues == [("warning", "numeric", "1 rows have missing values")]
+    np.testing.assert_array_equal(abscissa, [0, 10])
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_validate_joint_data(tmp_path, n_jobs):
+    folder = tmp_path / FOLDER
+    folder.mkdir()
+    _write_curve(folder / "dof1.csv", np.linspace(0, 120, 10))
+    _write_curve(folder / "dof2.csv", np.linspace(0, 120, 10))
+    _write_curve(folder / "dof3.csv", np.linspace(10, 130, 12))
+    _write_curve(folder / "far_away.csv", np.linspace(200, 300, 12))
+    _write_curve(folder / "zigzag.csv", np.array([0.0, 10.0, 5.0, 20.0, 15.0, 30.0]))
+    joint_data = _joint_data(
+        [
+            # aligned
+            {"dof_1st_euler": "dof1.csv", "dof_2nd_euler": "dof2.csv", "shoulder_id": 1.0},
+            # interpolated by load_euler_csv
+            {"dof_1st_euler": "dof1.csv", "dof_3rd_euler": "dof3.csv", "shoulder_id": 2.0},
+            # no common range
+            {"dof_1st_euler": "dof1.csv", "dof_2nd_euler": "far_away.csv", "shoulder_id": 3.0},
+            # broken reference, the translations are not aligned with the rotations
+            {"dof_1st_euler": "dof1.csv", "dof_translation_x": "typo.csv", "shoulder_id": 4.0},
+            # no data
+            {"shoulder_id": 5.0},
+            # the monotonicity of the dofs loaded together is reported once
+            {"dof_1st_euler": "zigzag.csv", "dof_2nd_euler": "zigzag.csv", "shoulder_id": 6.0},
+        ]
+    )
+    for dof in ("dof_1st_euler", "dof_2nd_euler", "dof_3rd_euler", "dof_translation_x", "dof_translation_y"):
+        joint_data[dof] = joint_data.get(dof)
+    joint_data["dof_translation_z"] = None
+
+    report = validate_joint_data(joint_data, data_folder=tmp_path, n_jobs=n_jobs)
+
+    lines = report[["severity", "check", "shoulder_id"]].to_records(index=False).tolist()
+    assert lines == [
+        ("warning", "alignment", 2.0),
+        ("error", "alignment", 3.0),
+        ("error", "missing", 4.0),
+        ("warning", "monotonic", 6.0),
+    ]
+    assert report["dof"].iloc[2] == "dof_translation_x"
+    assert report["file"].iloc[2] == str(folder / "typo.csv")
+    assert report["dof"].iloc[3] == "dof_1st_euler, dof_2nd_euler"
+    assert report["message"].iloc[3] == (
+        "dof_1st_euler: the humerothoracic angle changes direction 4 times; "
+        "dof_2nd_euler: the humerothoracic angle changes direction 4 times"
+    )
+
+    # the folders must be registered to be loaded
+    report = validate_joint_data(joint_data.iloc[:1])
+    assert report[["severity", "check"]].to_records(index=False).tolist() == [("error", "folder")]
+
+
+def test_validate_the_datasets():
+    report = validate_joint_data(n_jobs=2)
+    assert not (report["severity"] == "error").any()
+
+
+def test_ingestion_command_line(capsys):
+    assert main(["--no-store"]) == 0
+    assert "0 errors" in capsys.readouterr().out
+
+
+def test_convert_workbooks(tmp_path):
+    pytest.importorskip("openpyxl")
+    curve = pd.DataFrame({0: [0.0, 10.0, 20.0], 1: [1.5, 2.5, 3.5]})
+    curve.to_excel(tmp_path / "curve.xlsx", header=False, index=False)
+    (tmp_path / "notes.txt").write_text("not a workbook")
+
+    converted = convert_workbooks(tmp_path, n_jobs=2)
+
+    assert converted == [tmp_path / "curve.csv"]
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "curve.csv", header=None), curve)
+    assert convert_workbooks(tmp_path) == []
@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+
+from spartacus import Spartacus, SpartacusQuery, DataFolder
+from spartacus.src import load, utils
+from spartacus.src.utils import convert_df_to_1dof_per_line
+
+
+def test_parallel_load_matches_serial_load():
+    serial = Spartacus.load(datasets=DataFolder.BOURNE_2003)
+    parallel = Spartacus.load(datasets=DataFolder.BOURNE_2003, n_jobs=2)
+
+    assert not serial.corrected_confident_data_values.empty
+    pd.testing.assert_frame_equal(parallel.confident_data_values, serial.confident_data_values)
+    pd.testing.assert_frame_equal(parallel.corrected_confident_data_values, serial.corrected_confident_data_values)
+
+
+def test_lazy_load_matches_load():
+    query = Spartacus.load(lazy=True).filter(datasets=[DataFolder.BOURNE_2003, DataFolder.CHU_2012])
+    query = query.filter(datasets=DataFolder.BOURNE_2003, mvt="frontal plane elevation")
+
+    assert isinstance(query, SpartacusQuery)
+    assert query._spartacus is None
+    assert query.joint_data["dataset_authors"].unique().tolist() == ["Bourne et al."]
+    assert query.joint_data["humeral_motion"].unique().tolist() == ["frontal plane elevation"]
+
+    expected = Spartacus.load(datasets=DataFolder.BOURNE_2003, mvt="frontal plane elevation")
+    pd.testing.assert_frame_equal(query.confident_data_values, expected.confident_data_values)
+    pd.testing.assert_frame_equal(query.corrected_confident_data_values, expected.corrected_confident_data_values)
+    assert query.collect() is query.collect()
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_iter_rows_streams_the_imported_rows(n_jobs):
+    expected = Spartacus.load(datasets=DataFolder.BOURNE_2003)
+
+    rows = expected.iter_rows(n_jobs=n_jobs, cache=False)
+    first_row = next(rows)
+    assert {"article", "joint", "value_dof1", "value_dof2", "value_dof3", "total_compliance"} <= set(first_row.columns)
+    corrected = convert_df_to_1dof_per_line(pd.concat([first_row, *rows], ignore_index=True))
+    # the loaded frames are concatenated with an empty frame of object columns, only the values are compared
+    pd.testing.assert_frame_equal(
+        corrected, expected.corrected_confident_data_values[corrected.columns], check_dtype=False
+    )
+
+    rows = list(expected.iter_rows(correction=False, n_jobs=n_jobs, cache=False))
+    not_corrected = convert_df_to_1dof_per_line(pd.concat(rows, ignore_index=True))
+    pd.testing.assert_frame_equal(
+        not_corrected, expected.confident_data_values[not_corrected.columns], check_dtype=False
+    )
+
+    one_dof_per_line = list(expected.iter_rows(correction=False, one_dof_per_line=True, n_jobs=n_jobs, cache=False))
+    for row, stacked_row in zip(rows, one_dof_per_line):
+        pd.testing.assert_frame_equal(stacked_row, convert_df_to_1dof_per_line(row))
+
+
+def test_iter_rows_stops_early(monkeypatch):
+    submitted = []
+
+    class CountingExecutor(utils.ProcessPoolExecutor):
+        def submit(self, *args, **kwargs):
+            submitted.append(args)
+            return super().submit(*args, **kwargs)
+
+    monkeypatch.setattr(utils, "ProcessPoolExecutor", CountingExecutor)
+    sp = Spartacus.load(datasets=DataFolder.BOURNE_2003, unify=False)
+    sp.check_dataset_segments()
+    assert len(sp.confident_dataframe) > 4
+
+    rows = sp.iter_rows(n_jobs=2, cache=False)
+    first_row = next(rows)
+    # only a window of 2 * n_jobs rows is imported ahead of the consumer
+    assert len(submitted) == 4
+    rows.close()
+    assert len(submitted) == 4
+
+    expected = next(sp.iter_rows(cache=False))
+    pd.testing.assert_frame_equal(first_row, expected)
+
+
+def test_spartacus_merges_the_compliances_by_id():
+    datasets, joint_data = load.read_dataset_csvs(datasets=DataFolder.BOURNE_2003)
+    # a second dataset of the same authors has no compliance, compliance() keeps one dataset per author
+    copy = datasets.assign(dataset_id="copy of " + datasets["dataset_id"])
+    joint_copy = joint_data.assign(dataset_id="copy of " + joint_data["dataset_id"])
+    sp = Spartacus(datasets=pd.concat([datasets, copy]), joint_data=pd.concat([joint_data, joint_copy]))
+
+    assert sp.dataframe["dataset_id"].unique().tolist() == datasets["dataset_id"].tolist()
+    assert sp.dataframe.shape[0] == joint_data.shape[0]
+    assert sp.dataframe.columns.tolist() == [
+        *sp.datasets.columns,
+        *[f"{column}useless_string" if column == "dataset_authors" else column for column in joint_data.columns[1:]],
+    ]
+    # the text columns are python objects, None when missing, as expected by the row readers
+    assert sp.dataframe["joint"].dtype == object
+    assert all(value is None for value in sp.dataframe["dof_translation_x"])
+    assert all(value is None for value in sp.check_dataset_segments()["clavicle_origin"])
@@ -1,6 +1,14 @@
 import numpy as np
-from spartacus.src.corrections.robust_unwrap import unwrap_rotation_matrix_from_euler_angles
-import biorbd
+import pytest
+
+from spartacus.src.corrections.robust_unwrap import (
+    unwrap_rotation_matrix_from_euler_angles,
+    unwrap_angles_from_euler_angles,
+)
+from spartacus.src.corrections.euler_sequences import (
+    euler_angles_to_rotation_matrices,
+    rotation_matrices_to_euler_angles,
+)
 
 
 def test_robust_unwrap():
@@ -12,12 +20,12 @@ def test_robust_unwrap():
 
     new_angles = unwrap_rotation_matrix_from_euler_angles(angles=angles, seq="yxy", angles_init=angles_init)
 
-    print("Expected Rotation Matrix: \n", biorbd.Rotation.fromEulerAngles(rot=angles, seq="yxy").to_array())
-    print("New Rotation Matrix: \n", biorbd.Rotation.fromEulerAngles(rot=new_angles, seq="yxy").to_array())
+    print("Expected Rotation Matrix: \n", euler_angles_to_rotation_matrices(angles, "yxy"))
+    print("New Rotation Matrix: \n", euler_angles_to_rotation_matrices(new_angles, "yxy"))
 
     np.testing.assert_almost_equal(
-        biorbd.Rotation.fromEulerAngles(rot=new_angles, seq="yxy").to_array(),
-        biorbd.Rotation.fromEulerAngles(rot=angles, seq="yxy").to_array(),
+        euler_angles_to_rotation_matrices(new_angles, "yxy"),
+        euler_angles_to_rotation_matrices(angles, "yxy"),
     )
 
 
@@ -31,10 +39,63 @@ def test_robust_unwrap2():
     new_angles = unwrap_rotation_matrix_from_euler_angles(angles=angles, seq="yxy", angles_init=angles_init)
 
     print(new_angles * 180 / np.pi)
-    print("Expected Rotation Matrix: \n", biorbd.Rotation.fromEulerAngles(rot=angles, seq="yxy").to_array())
-    print("New Rotation Matrix: \n", biorbd.Rotation.fromEulerAngles(rot=new_angles, seq="yxy").to_array())
+    print("Expected Rotation Matrix: \n", euler_angles_to_rotation_matrices(angles, "yxy"))
+    print("New Rotation Matrix: \n", euler_angles_to_rotation_matrices(new_angles, "yxy"))
 
     # np.testing.assert_almost_equal(
-    #     biorbd.Rotation.fromEulerAngles(rot=new_angles, seq="yxy").to_array(),
-    #     biorbd.Rotation.fromEulerAngles(rot=angles, seq="yxy").to_array(),
+    #     euler_angles_to_rotation_matrices(new_angles, "yxy"),
+    #     euler_angles_to_rotation_matrices(angles, "yxy"),
     # )
+
+
+def wrap_euler_angles(angles: np.ndarray, seq: str) -> np.ndarray:
+    """The identification wraps the angles and flips them when they leave the ranges of the sequence"""
+    return rotation_matrices_to_euler_angles(euler_angles_to_rotation_matrices(angles, seq), seq)
+
+
+@pytest.mark.parametrize("seq", ["yxy", "zxz", "xyz", "yxz"])
+def test_unwrap_angles_from_euler_angles(seq):
+    time = np.linspace(0, 1, 100)
+    # the second angle crosses the bounds of its range, 0 for yxy, pi/2 for xyz
+    second_angle = 1 - 1.6 * time if seq[0] == seq[2] else -0.8 + 2.6 * time
+    smooth_angles = np.stack([2 + 3 * time, second_angle, 1 + 3 * np.sin(4 * time)], axis=1)
+    wrapped_angles = wrap_euler_angles(smooth_angles, seq)
+    assert np.abs(wrapped_angles - smooth_angles).max() > 1
+
+    unwrapped = unwrap_angles_from_euler_angles(wrapped_angles, seq, angles_init=smooth_angles[0])
+    np.testing.assert_almost_equal(unwrapped, smooth_angles, decimal=12)
+
+    fixed = unwrap_angles_from_euler_angles(
+        wrapped_angles[:5], seq, angles_init=smooth_angles[0], init_strategy="fixed"
+    )
+    np.testing.assert_almost_equal(fixed, smooth_angles[:5], decimal=12)
+
+    wrapped_angles[3, :] = np.nan
+    unwrapped = unwrap_angles_from_euler_angles(wrapped_angles, seq, angles_init=smooth_angles[0])
+    assert np.isnan(unwrapped[3]).all()
+    np.testing.assert_almost_equal(np.delete(unwrapped, 3, axis=0), np.delete(smooth_angles, 3, axis=0), decimal=12)
+
+
+@pytest.mark.parametrize("seq", ["yxy", "xyz"])
+def test_unwrap_angles_from_euler_angles_matches_optimizer(seq):
+    time = np.linspace(0, 1, 20)
+    smooth_angles = np.stack([2 + 3 * time, 0.8 + 0.3 * time, 1 + 3 * np.sin(4 * time)], axis=1)
+    wrapped_angles = wrap_euler_angles(smooth_angles, seq)
+
+    np.testing.assert_almost_equal(
+        unwrap_angles_from_euler_angles(wrapped_angles, seq, angles_init=smooth_angles[0]),
+        unwrap_angles_from_euler_angles(wrapped_angles, seq, angles_init=smooth_angles[0], method="optimizer"),
+        decimal=5,
+    )
+
+
+def test_unwrap_angles_from_euler_angles_with_a_leading_nan():
+    time = np.linspace(0, 1, 6)
+    smooth_angles = np.stack([2 + 0.3 * time, -1 + 0.2 * time, 1 + 0.3 * time], axis=1)
+    wrapped_angles = wrap_euler_angles(smooth_angles, "yxy")
+    wrapped_angles[0, :] = np.nan
+
+    unwrapped = unwrap_angles_from_euler_angles(wrapped_angles, "yxy")
+    assert np.isnan(unwrapped[0]).all()
+    assert np.isfinite(unwrapped[1:]).all()
+    np.testing.assert_almost_equal(unwrapped[1:], unwrap_angles_from_euler_angles(wrapped_angles[1:], "yxy"))
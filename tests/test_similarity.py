@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from spartacus.src.similarity import CurveIndex
+
+from .utils import TestUtils
+
+
+def complete_tensor():
+    tensor = TestUtils.random_curve_tensor()
+    tensor.values = np.nan_to_num(tensor.values, nan=1.0)
+    tensor.rows["total_compliance"] = np.arange(11) % 7
+    tensor.rows["fully_isb"] = np.arange(11) % 2 == 0
+    return tensor
+
+
+@pytest.mark.parametrize("space", ["pca", "curves"])
+def test_query_finds_the_closest_shoulders(space):
+    tensor = complete_tensor()
+    index = CurveIndex.from_tensor(tensor, space=space, n_components=10)
+    glenohumeral = tensor.filter({"joint": "glenohumeral"})
+
+    df = index.query(glenohumeral.values, "glenohumeral", "frontal plane elevation", k=3)
+    assert df.columns.tolist() == [
+        "query",
+        "rank",
+        "article",
+        "joint",
+        "humeral_motion",
+        "shoulder_id",
+        "unit",
+        "distance",
+        "total_compliance",
+        "fully_isb",
+    ]
+    assert df.shape[0] == 6 * 3
+    assert (df["joint"] == "glenohumeral").all()
+
+    # each curve of the database is its own nearest neighbor, the other are sorted by distance
+    first = df[df["rank"] == 1]
+    np.testing.assert_array_equal(first["shoulder_id"], glenohumeral.rows["shoulder_id"])
+    np.testing.assert_allclose(first["distance"], 0, atol=1e-8)
+    np.testing.assert_array_equal(first["fully_isb"], glenohumeral.rows["fully_isb"])
+
+    values = glenohumeral.values.reshape(6, -1)
+    distances = np.sqrt(((values[:, np.newaxis] - values[np.newaxis]) ** 2).mean(axis=2))
+    np.testing.assert_allclose(df["distance"].to_numpy().reshape(6, 3), np.sort(distances, axis=1)[:, :3], atol=1e-8)
+
+
+def test_query_of_partial_and_empty_curves():
+    tensor = complete_tensor()
+    index = CurveIndex.from_tensor(tensor, space="curves", n_components=2)
+    scapulothoracic = tensor.filter({"joint": "scapulothoracic"})
+
+    patient = scapulothoracic.values[[2, 0]].copy()
+    patient[0, :, 12:] = np.nan
+    patient[1] = np.nan
+    df = index.query(patient, "scapulothoracic", "frontal plane elevation", k=10)
+    # the empty curve is not placed, k is at most the number of curves of the group
+    assert df["query"].tolist() == [0] * 5
+    assert df["shoulder_id"].iloc[0] == scapulothoracic.rows["shoulder_id"].iloc[2]
+
+    assert index.query(patient[1], "scapulothoracic", "frontal plane elevation").empty
+    with pytest.raises(ValueError, match="no decomposition"):
+        index.query(patient, "sternoclavicular", "frontal plane elevation")
+    with pytest.raises(ValueError, match="not a valid space"):
+        CurveIndex.from_tensor(tensor, space="wavelets")
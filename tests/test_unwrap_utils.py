@@ -0,0 +1,65 @@
+import numpy as np
+
+from spartacus.src.corrections.angle_conversion_callbacks import (
+    quick_fix_x_rot_in_yxy_if_x_positive,
+    quick_fix_x_rot_in_yxy_from_matrix,
+)
+from spartacus.src.corrections.euler_sequences import euler_angles_to_rotation_matrices
+from spartacus.src.corrections.unwrap_utils import unwrap_for_yxy_glenohumeral_joint
+
+
+def test_quick_fix_x_rot_in_yxy_on_arrays():
+    angles = np.random.default_rng(4).uniform(-3, 3, size=(5, 40, 3))
+
+    fixed = quick_fix_x_rot_in_yxy_if_x_positive(angles)
+
+    assert fixed.shape == angles.shape
+    assert np.all(fixed[..., 1] <= 0)
+    np.testing.assert_array_equal(fixed[angles[..., 1] <= 0], angles[angles[..., 1] <= 0])
+    np.testing.assert_allclose(
+        euler_angles_to_rotation_matrices(fixed, "yxy"), euler_angles_to_rotation_matrices(angles, "yxy"), atol=1e-12
+    )
+    np.testing.assert_array_equal(quick_fix_x_rot_in_yxy_if_x_positive(angles[0, 0]), fixed[0, 0])
+
+    matrices = euler_angles_to_rotation_matrices(angles[0], "yxy")
+    fixed_from_matrix = quick_fix_x_rot_in_yxy_from_matrix(angles[0], matrices)
+    to_flip = (matrices[:, 1, 0] < 0) | (matrices[:, 1, 2] > 0)
+    np.testing.assert_array_equal(fixed_from_matrix[~to_flip], angles[0][~to_flip])
+    assert np.all(fixed_from_matrix[to_flip, 1] == -angles[0][to_flip, 1])
+
+
+def _yxy_curve(first_half: np.ndarray, second_half: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """A yxy curve in degrees, with its plane of elevation and axial rotation wrapped in [-180, 180]"""
+    elevation = np.concatenate([first_half, second_half])
+    plane = np.linspace(100, 260, elevation.shape[0]) + rng.uniform(-1, 1)
+    rotation = np.linspace(-250, -100, elevation.shape[0]) + rng.uniform(-1, 1)
+    curve = np.stack([plane, elevation, rotation], axis=1)
+    curve[:, [0, 2]] = (curve[:, [0, 2]] + 180) % 360 - 180
+    return curve
+
+
+def test_unwrap_for_yxy_glenohumeral_joint():
+    rng = np.random.default_rng(5)
+    curves = np.array(
+        [
+            # the elevation decreases through zero, then increases again
+            _yxy_curve(np.linspace(40, -20, 12), np.linspace(-15, 60, 18), rng),
+            _yxy_curve(np.linspace(-10, 50, 10), np.linspace(45, -30, 20), rng),
+            # the elevation never decreases, the curve is kept as it is
+            _yxy_curve(np.linspace(-50, -30, 10), np.linspace(-25, -10, 20), rng),
+        ]
+    )
+    curves_copy = curves.copy()
+
+    unwrapped = unwrap_for_yxy_glenohumeral_joint(curves)
+
+    np.testing.assert_array_equal(curves, curves_copy)
+    assert unwrapped.shape == curves.shape
+    # continuous, a single sign of elevation, and the same orientations modulo 360 degrees
+    assert np.all(np.abs(np.diff(unwrapped[:2, :, [0, 2]], axis=1)) < 90)
+    assert np.all(np.abs(np.diff(np.sign(unwrapped[:2, :, 1]), axis=1)) == 0)
+    np.testing.assert_allclose(np.cos(np.deg2rad(unwrapped[:, :, [0, 2]] - curves[:, :, [0, 2]])) ** 2, 1)
+    np.testing.assert_array_equal(unwrapped[2], curves[2])
+    # a stack of curves is unwrapped as each of its curves
+    for curve, unwrapped_curve in zip(curves, unwrapped):
+        np.testing.assert_array_equal(unwrap_for_yxy_glenohumeral_joint(curve), unwrapped_curve)
@@ -0,0 +1,112 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spartacus.src.corrections.euler_sequences import euler_angles_to_rotation_matrices
+from spartacus.src.utils import (
+    align_rotation_samples,
+    calculate_dof_values,
+    effective_n_jobs,
+    flip_rotations,
+    process_imap,
+    process_map,
+)
+
+ROTATION_DATA = pd.DataFrame(
+    {
+        "humerothoracic_angle": [30.0, 10.0, 20.0, 20.0, 10.0],
+        "value_dof1": [3.0, 1.0, 2.0, -2.0, 0.0],
+        "value_dof2": [30.0, 10.0, 20.0, -20.0, 0.0],
+        "value_dof3": [300.0, 100.0, 200.0, -200.0, 0.0],
+        "unit": ["rad", "rad", "rad", "rad", "mm"],
+    }
+)
+
+
+def test_align_rotation_samples():
+    angles = np.array([20.0, 10.0 + 1e-9, 15.0, np.nan, 40.0])
+    values, matched = align_rotation_samples(angles, ROTATION_DATA)
+
+    np.testing.assert_array_equal(matched, [True, True, False, False, False])
+    # the first rotation sample of an angle is used, and the lines in mm are ignored
+    np.testing.assert_array_equal(values[0], [2.0, 20.0, 200.0])
+    np.testing.assert_array_equal(values[1], [1.0, 10.0, 100.0])
+    assert np.isnan(values[2:]).all()
+
+    _, matched = align_rotation_samples(angles, ROTATION_DATA, tolerance=0)
+    np.testing.assert_array_equal(matched, [True, False, False, False, False])
+
+    values, matched = align_rotation_samples(angles, ROTATION_DATA, interpolate=True)
+    np.testing.assert_array_equal(matched, [True, True, True, False, False])
+    np.testing.assert_almost_equal(values[2], [1.5, 15.0, 150.0])
+
+    values, matched = align_rotation_samples(angles, ROTATION_DATA.iloc[:0])
+    assert not matched.any() and np.isnan(values).all()
+
+
+def test_calculate_dof_values_translation():
+    data = pd.DataFrame(
+        {
+            "humerothoracic_angle": [10.0, 15.0, 30.0],
+            "value_dof1": [1.0, 2.0, 3.0],
+            "value_dof2": [4.0, 5.0, 6.0],
+            "value_dof3": [7.0, 8.0, 9.0],
+            "joint": "sternoclavicular",
+            "humeral_motion": "frontal plane elevation",
+        }
+    )
+    received = []
+
+    def correction_callable(translations, rotations):
+        received.append(rotations)
+        return translations + 1
+
+    value_dof = calculate_dof_values(
+        data, correction_callable=correction_callable, rotation=False, rotation_data=ROTATION_DATA
+    )
+
+    np.testing.assert_array_equal(value_dof, data[["value_dof1", "value_dof2", "value_dof3"]].to_numpy() + 1)
+    # the translation without rotation sample gets null angles
+    np.testing.assert_array_equal(received[0], [[1.0, 10.0, 100.0], [0.0, 0.0, 0.0], [3.0, 30.0, 300.0]])
+
+
+@pytest.mark.parametrize("sequence", ["yxy", "zxz", "xyz", "zxy"])
+def test_flip_rotations(sequence):
+    angles = np.random.default_rng(3).uniform(-np.pi / 2, np.pi / 2, size=(20, 3))
+    angles_copy = angles.copy()
+
+    flipped = flip_rotations(angles, sequence)
+
+    np.testing.assert_array_equal(angles, angles_copy)
+    np.testing.assert_allclose(
+        euler_angles_to_rotation_matrices(flipped, sequence),
+        euler_angles_to_rotation_matrices(angles, sequence),
+        atol=1e-12,
+    )
+    assert np.all(np.abs(flipped) <= np.pi)
+    if sequence[0] == sequence[2]:
+        np.testing.assert_array_equal(flipped[:, 1], -angles[:, 1])
+    # a single triplet is flipped as the rows of a series
+    np.testing.assert_array_equal(flip_rotations(angles[0], sequence), flipped[0])
+
+
+def test_effective_n_jobs():
+    assert effective_n_jobs(None) == 1
+    assert effective_n_jobs(3) == 3
+    assert effective_n_jobs(-1) == os.cpu_count()
+    assert effective_n_jobs(-2) == max(os.cpu_count() - 1, 1)
+    assert effective_n_jobs(-10 * os.cpu_count()) == 1
+    with pytest.raises(ValueError):
+        effective_n_jobs(0)
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_process_imap_keeps_the_order_of_the_items(n_jobs):
+    items = list(range(10))
+
+    assert list(process_imap(math.factorial, iter(items), n_jobs=n_jobs)) == [math.factorial(i) for i in items]
+    assert process_map(math.factorial, items, n_jobs=n_jobs) == [math.factorial(i) for i in items]
+    assert process_map(math.factorial, [], n_jobs=n_jobs) == []
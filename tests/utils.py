@@ -2,6 +2,11 @@ from typing import Any
 from pathlib import Path
 import importlib.util
 
+import numpy as np
+import pandas as pd
+
+from spartacus.src.curve_tensor import CurveTensor
+
 
 class TestUtils:
     @staticmethod
@@ -18,3 +23,22 @@ class TestUtils:
         module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(module)
         return module
+
+    @staticmethod
+    def random_curve_tensor(seed: int = 0) -> CurveTensor:
+        """Curves of two joints, three articles, several shoulders, with missing values"""
+        rng = np.random.default_rng(seed)
+        rows = pd.DataFrame(
+            {
+                "article": ["A et al."] * 5 + ["B et al."] * 2 + ["C et al."] * 4,
+                "joint": ["glenohumeral", "scapulothoracic"] * 5 + ["glenohumeral"],
+                "humeral_motion": "frontal plane elevation",
+                "shoulder_id": np.arange(11.0),
+                "unit": "rad",
+                "in_vivo": [True] * 7 + [False] * 4,
+            }
+        )
+        values = rng.normal(size=(11, 3, 20)) * 10 + rng.normal(size=(11, 1, 1)) * 30
+        values[rng.random(values.shape) < 0.25] = np.nan
+        values[3, :, 10:] = np.nan
+        return CurveTensor(values, rows, np.linspace(0, 120, 20))